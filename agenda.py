@@ -0,0 +1,29 @@
+import pandas as pd
+
+# Semáforo de resultados como columna de texto (sin Styler ni callbacks por celda)
+SEMAFORO = {'Ganó': '🟢', 'Empató': '🟡', 'Perdió': '🔴'}
+
+COLUMNAS = ['FECHA', 'LOCAL', 'VISITANTE', 'GOLES DE RIVER', 'GOLES DEL RIVAL', 'RESULTADO']
+
+
+def preparar_agenda(df):
+    """
+    Builds the agenda tables in a single pass: one sort by date, vectorized
+    date formatting and result icons, and one groupby by competition.
+    Returns a list of (competicion, DataFrame) in order of first appearance.
+    """
+    orden = df['competicion'].dropna().unique()
+    partidos = df.sort_values('fecha', kind='stable')
+
+    resultado = partidos['resultado_final'].astype(object)
+    vista = pd.DataFrame({
+        'FECHA': partidos['fecha'].dt.strftime('%d/%m/%Y %H:%M'),
+        'LOCAL': partidos['local'],
+        'VISITANTE': partidos['visitante'],
+        'GOLES DE RIVER': partidos['g_river'],
+        'GOLES DEL RIVAL': partidos['g_rival'],
+        'RESULTADO': (resultado.map(SEMAFORO).fillna('') + ' ' + resultado).str.strip(),
+    }, columns=COLUMNAS)
+
+    grupos = dict(tuple(vista.groupby(partidos['competicion'], sort=False, observed=True)))
+    return [(comp, grupos[comp]) for comp in orden if comp in grupos]
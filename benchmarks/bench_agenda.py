@@ -0,0 +1,102 @@
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+from streamlit.elements.arrow import marshall
+from streamlit.proto.Arrow_pb2 import Arrow as ArrowProto
+
+# Add parent directory to path to allow importing 'agenda', 'schema' and 'benchmarks'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agenda import COLUMNAS, SEMAFORO, preparar_agenda
+from benchmarks.bench_memory import partidos_legacy
+from schema import compact_partidos
+
+
+def color_semaforo(val):
+    if val == 'Ganó': return 'background-color: #d4edda; color: #155724; font-weight: bold;'
+    if val == 'Empató': return 'background-color: #fff3cd; color: #856404; font-weight: bold;'
+    if val == 'Perdió': return 'background-color: #f8d7da; color: #721c24; font-weight: bold;'
+    return ''
+
+
+def agenda_legacy(df):
+    """
+    Implementación original del tab de agenda (filtro por competición y
+    Styler.applymap), conservada como referencia.
+    """
+    tablas = []
+    for comp in df['competicion'].unique():
+        df_comp = df[df['competicion'] == comp].sort_values('fecha').copy()
+        df_view = df_comp.rename(columns={
+            'fecha': 'FECHA', 'local': 'LOCAL', 'visitante': 'VISITANTE',
+            'g_river': 'GOLES DE RIVER', 'g_rival': 'GOLES DEL RIVAL',
+            'resultado_final': 'RESULTADO'
+        })
+        df_view['FECHA'] = df_view['FECHA'].dt.strftime('%d/%m/%Y %H:%M')
+        cols = ['FECHA', 'LOCAL', 'VISITANTE', 'GOLES DE RIVER', 'GOLES DEL RIVAL', 'RESULTADO']
+        tablas.append((comp, df_view[cols]))
+    return tablas
+
+
+def serializar(data):
+    # Lo mismo que hace st.dataframe con la tabla (Styler -> estilos por celda + Arrow), sin una sesión de Streamlit
+    marshall(ArrowProto(), data, default_uuid='bench')
+
+
+def render_legacy(df):
+    for comp, df_view in agenda_legacy(df):
+        serializar(df_view.style.map(color_semaforo, subset=['RESULTADO']))
+
+
+def render_vectorizado(df):
+    for comp, df_view in preparar_agenda(df):
+        serializar(df_view)
+
+
+def verificar(df):
+    # Mismas filas y valores por competición (salvo el ícono del semáforo). Se ordena por
+    # todas las columnas porque el sort original no es estable entre partidos del mismo horario
+    legacy = agenda_legacy(df)
+    nueva = preparar_agenda(df)
+    assert [c for c, _ in legacy] == [c for c, _ in nueva]
+    iconos = '|'.join(SEMAFORO.values())
+    for (_, esperado), (_, obtenido) in zip(legacy, nueva):
+        obtenido = obtenido.assign(RESULTADO=obtenido['RESULTADO'].str.replace(f"^({iconos}) ", '', regex=True))
+        pd.testing.assert_frame_equal(
+            obtenido.astype(object).sort_values(COLUMNAS).reset_index(drop=True),
+            esperado.astype(object).sort_values(COLUMNAS).reset_index(drop=True),
+        )
+
+
+def _timeit(func, df, repeat):
+    tiempos = []
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        func(df)
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del render de la agenda: Styler vs una pasada vectorizada")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 5_000, 50_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'partidos':>10} {'Styler (s)':>12} {'vectorizado (s)':>16} {'speedup':>9}")
+    for n in args.sizes:
+        df = compact_partidos(partidos_legacy(n))
+        verificar(df)
+
+        t_legacy = _timeit(render_legacy, df, args.repeat)
+        t_vector = _timeit(render_vectorizado, df, args.repeat)
+        print(f"{n:>10} {t_legacy:>12.4f} {t_vector:>16.4f} {t_legacy / t_vector:>8.1f}x")
+
+    print("✅ Mismas tablas que la implementación con Styler.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import argparse
+import contextlib
+import http.server
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Sin pausa entre requests al mismo host: se mide la concurrencia, no el rate limit
+os.environ.setdefault("HTTP_MIN_INTERVAL", "0")
+
+# Add parent directory to path to allow importing 'scripts' and 'benchmarks'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+from sqlalchemy import text
+
+from benchmarks.bench_parse import FIXTURES_DIR
+from database import create_sqlite_engine
+from scripts.extract import parse_links_partidos, parse_partidos
+from scripts.extract_detalles import crawl, leer_checkpoint, load_detalles, parse_detalle
+from scripts.load import NATURAL_KEYS, bulk_insert, upsert_dataframe
+from scripts.migrate import apply_migrations
+from scripts.transform import transform_data
+
+# Crawler del detalle de partidos, offline: un servidor HTTP local con latencia
+# sirve benchmarks/fixtures/detalle/partido.html para N partidos sintéticos.
+# Compara 1 worker contra --workers, verifica que una corrida interrumpida
+# (checkpoint cortado) retome sin volver a pedir los partidos completos y carga
+# el detalle de los partidos de fixtures/partidos.html en un SQLite temporal.
+
+DETALLE_PATH = os.path.join(FIXTURES_DIR, 'detalle', 'partido.html')
+
+
+def servidor(latencia):
+    """
+    Servidor local que responde la página de detalle a cualquier path
+    después de 'latencia' segundos. Devuelve (url base, contador de requests, server).
+    """
+    with open(DETALLE_PATH, 'rb') as f:
+        cuerpo = f.read()
+    pedidos = {'n': 0}
+    lock = threading.Lock()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            time.sleep(latencia)
+            with lock:
+                pedidos['n'] += 1
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}", pedidos, server
+
+
+def links_sinteticos(base, n):
+    # Cada partido aparece dos veces (página de cada equipo): la cola no debe repetirlos
+    links = [{'url': f"{base}/partido/{i}", 'fecha': '24 Ene 26', 'horario': '21:00',
+              'competicion': 'Amistoso', 'local': 'River Plate', 'visitante': f"Rival {i}"}
+             for i in range(n)]
+    return links + links
+
+
+def _silencioso(func, *args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def _cortar_checkpoint(path, dejar):
+    # Simula una corrida interrumpida: 'dejar' líneas completas y la siguiente a medias
+    with open(path, encoding='utf-8') as f:
+        lineas = f.readlines()
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(lineas[:dejar])
+        f.write(lineas[dejar][:len(lineas[dejar]) // 2])
+    return len(lineas)
+
+
+def verificar_parse():
+    detalle = parse_detalle(open(DETALLE_PATH, encoding='utf-8').read(), 'River Plate', 'Boca Juniors')
+    tipos = [e['tipo'] for e in detalle['eventos']]
+    assert tipos == ['gol', 'amarilla', 'gol_penal', 'amarilla', 'gol', 'roja'], tipos
+    assert detalle['eventos'][2]['minuto'] == 45 and detalle['eventos'][2]['adicional'] == 2
+    assert sum(a['titular'] for a in detalle['alineaciones']) == 7
+    assert detalle['alineaciones'][-1]['dorsal'] is None
+    print(f"✅ parse_detalle: {len(detalle['eventos'])} eventos, {len(detalle['alineaciones'])} jugadores.")
+
+
+def verificar_carga(tmp):
+    with open(os.path.join(FIXTURES_DIR, 'partidos.html'), encoding='utf-8') as f:
+        html = f.read()
+    links = parse_links_partidos(html)
+    engine = create_sqlite_engine(os.path.join(tmp, 'carga.db'))
+    try:
+        partidos = _silencioso(transform_data, pd.DataFrame(parse_partidos(html)))
+        with engine.begin() as conn:
+            apply_migrations(conn)
+            upsert_dataframe(partidos, 'partidos_river', NATURAL_KEYS['partidos_river'], conn)
+
+        detalle = parse_detalle(open(DETALLE_PATH, encoding='utf-8').read())
+        registros = [{**link, 'fetched_at': '2026-01-01T00:00:00', **detalle} for link in links]
+        conteos = _silencioso(load_detalles, registros, engine)
+        # Cargar dos veces reemplaza el detalle, no lo duplica
+        conteos = _silencioso(load_detalles, registros, engine)
+        with engine.begin() as conn:
+            # Una carga en modo replace renueva los ids de partidos_river: el detalle sigue enlazado
+            conn.execute(text("DELETE FROM partidos_river"))
+            bulk_insert(partidos, 'partidos_river', conn)
+            eventos = conn.execute(text("SELECT COUNT(*) FROM partidos_eventos")).scalar()
+            enlazados = conn.execute(text(
+                "SELECT COUNT(*) FROM partidos_detalle d JOIN partidos_river p ON DATE(p.fecha) = d.fecha "
+                "AND p.competicion = d.competicion AND p.local = d.local AND p.visitante = d.visitante")).scalar()
+    finally:
+        engine.dispose()
+    assert conteos['partidos'] == len(links) and conteos['sin_enlazar'] == 0, conteos
+    assert eventos == len(links) * len(detalle['eventos']) and enlazados == len(links)
+    print(f"✅ load_detalles: {conteos['partidos']} partidos enlazados a partidos_river, {eventos} eventos.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline del crawler de detalle de partidos")
+    parser.add_argument('--partidos', type=int, default=60, help="Partidos sintéticos a descargar")
+    parser.add_argument('--latencia', type=float, default=0.05, help="Latencia del servidor local (s)")
+    parser.add_argument('--workers', type=int, default=8, help="Workers a comparar contra 1")
+    parser.add_argument('--output', help="Archivo JSON con los resultados")
+    args = parser.parse_args()
+
+    verificar_parse()
+    base, pedidos, server = servidor(args.latencia)
+    links = links_sinteticos(base, args.partidos)
+    resultados = {'partidos': args.partidos, 'latencia': args.latencia, 'segundos': {}}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"\n{'workers':>8} {'segundos':>10} {'partidos/s':>11} {'requests':>9}")
+        for workers in (1, args.workers):
+            path = os.path.join(tmp, f"w{workers}.jsonl")
+            pedidos['n'] = 0
+            inicio = time.perf_counter()
+            ok, errores = _silencioso(crawl, links, workers, path)
+            segundos = time.perf_counter() - inicio
+            assert ok == args.partidos and errores == 0 and pedidos['n'] == args.partidos
+            resultados['segundos'][workers] = round(segundos, 4)
+            print(f"{workers:>8} {segundos:>10.3f} {ok / segundos:>11.1f} {pedidos['n']:>9}")
+
+        # Reanudación: una segunda corrida no pide nada; con el checkpoint cortado, sólo lo que falta
+        pedidos['n'] = 0
+        _silencioso(crawl, links, args.workers, path)
+        assert pedidos['n'] == 0, pedidos
+        dejar = args.partidos // 3
+        _cortar_checkpoint(path, dejar)
+        ok, _ = _silencioso(crawl, links, args.workers, path)
+        assert ok == pedidos['n'] == args.partidos - dejar, (ok, pedidos)
+        assert len(leer_checkpoint(path)) == args.partidos
+        resultados['reanudados'] = pedidos['n']
+        print(f"\n✅ Reanudación: 0 requests con el checkpoint completo; {pedidos['n']} "
+              f"(los que faltaban) con el checkpoint cortado en {dejar}.")
+
+        verificar_carga(tmp)
+    server.shutdown()
+
+    speedup = resultados['segundos'][1] / resultados['segundos'][args.workers]
+    print(f"🚀 {args.workers} workers: {speedup:.1f}x más rápido que 1.")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({**resultados, 'speedup': round(speedup, 2)}, f, indent=2)
+        print(f"✅ Resultados guardados en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
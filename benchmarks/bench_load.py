@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+
+# Add parent directory to path to allow importing 'database' and 'scripts'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import get_db_engine
+from scripts.load import bulk_insert
+
+
+def generar_partidos_limpios(n, seed=0):
+    """
+    DataFrame sintético con las columnas de data/river_cleaned.csv.
+    """
+    rng = np.random.default_rng(seed)
+    equipos = np.array([f"Equipo {i}" for i in range(40)])
+    locales = rng.choice(equipos, n)
+    return pd.DataFrame({
+        'fecha': pd.Timestamp('2010-01-01') + pd.to_timedelta(rng.integers(0, 6000, n), unit='D'),
+        'competicion': rng.choice(['Liga Profesional', 'Copa Argentina', 'Copa Libertadores'], n),
+        'local': locales,
+        'visitante': np.where(locales == 'Equipo 0', 'River Plate', 'Equipo 0'),
+        'g_river': rng.integers(0, 5, n),
+        'g_rival': rng.integers(0, 5, n),
+        'resultado_final': rng.choice(['Ganó', 'Empató', 'Perdió'], n),
+        'horario': rng.choice(['21:00', '19:15', '00:00'], n),
+    })
+
+
+def medir(engine, df, table, metodo):
+    with engine.begin() as conn:
+        conn.execute(text(f'DROP TABLE IF EXISTS "{table}"'))
+    inicio = time.perf_counter()
+    with engine.begin() as conn:
+        if metodo == 'copy':
+            bulk_insert(df, table, conn, if_exists='replace')
+        else:
+            df.to_sql(table, conn, if_exists='replace', index=False)
+    elapsed = time.perf_counter() - inicio
+    with engine.begin() as conn:
+        conn.execute(text(f'DROP TABLE IF EXISTS "{table}"'))
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de carga: to_sql vs COPY FROM STDIN")
+    parser.add_argument('--url', default=os.getenv('BENCH_DATABASE_URL'),
+                        help="URL de PostgreSQL (por defecto, la de database.get_db_engine)")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    engine = create_engine(args.url) if args.url else get_db_engine()
+    if engine.dialect.name != 'postgresql':
+        print(f"⚠️ Dialecto '{engine.dialect.name}': bulk_insert usa to_sql, ambos caminos serán iguales.")
+
+    print(f"{'filas':>10} {'to_sql (filas/s)':>18} {'COPY (filas/s)':>16} {'speedup':>9}")
+    for n in args.sizes:
+        df = generar_partidos_limpios(n)
+        t_to_sql = medir(engine, df, 'bench_load_to_sql', 'to_sql')
+        t_copy = medir(engine, df, 'bench_load_copy', 'copy')
+        print(f"{n:>10} {n / t_to_sql:>18,.0f} {n / t_copy:>16,.0f} {t_to_sql / t_copy:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
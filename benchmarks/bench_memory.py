@@ -0,0 +1,113 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path to allow importing 'schema' and 'benchmarks'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.bench_load import generar_partidos_limpios
+from schema import PARTIDOS_SCHEMA, PLANTILLA_SCHEMA, compact_partidos, compact_plantilla
+
+
+def partidos_legacy(n, seed=0):
+    """
+    Partidos sintéticos (historial multi-temporada / multi-equipo) con la
+    representación anterior: textos como object y goles como float64 con NaN
+    en los partidos pendientes.
+    """
+    rng = np.random.default_rng(seed)
+    df = generar_partidos_limpios(n, seed)
+    # Más equipos rivales que en el fixture de carga, como en un historial de varios torneos
+    rivales = np.array([f"Equipo {i}" for i in range(300)])
+    df['local'] = np.where(rng.random(n) < 0.5, 'River Plate', rng.choice(rivales, n))
+    df['visitante'] = np.where(df['local'] == 'River Plate', rng.choice(rivales, n), 'River Plate')
+
+    pendientes = rng.random(n) < 0.05
+    df['g_river'] = df['g_river'].astype('float64').mask(pendientes)
+    df['g_rival'] = df['g_rival'].astype('float64').mask(pendientes)
+    df['resultado_final'] = df['resultado_final'].mask(pendientes, 'Pendiente')
+    df.insert(0, 'id', np.arange(1, n + 1))
+    return df.astype({c: object for c in ['competicion', 'local', 'visitante', 'resultado_final', 'horario']})
+
+
+def plantilla_legacy(n, seed=0):
+    """
+    Jugadores sintéticos con la representación anterior: todo object y '-'
+    como marcador de dato faltante.
+    """
+    rng = np.random.default_rng(seed)
+    paises = rng.choice(['ar', 'uy', 'co', 'cl', 'py', 'br'], n, p=[0.7, 0.1, 0.05, 0.05, 0.05, 0.05])
+
+    def numeros(bajo, alto, faltantes=0.05):
+        valores = rng.integers(bajo, alto, n).astype(str).astype(object)
+        valores[rng.random(n) < faltantes] = '-'
+        return valores
+
+    return pd.DataFrame({
+        'id': np.arange(1, n + 1),
+        'dorsal': numeros(1, 40),
+        'nombre': [f"Jugador {i}" for i in range(n)],
+        'posicion': rng.choice(['Portero', 'Defensa', 'Centrocampista', 'Delantero'], n),
+        'edad': numeros(17, 40),
+        'nacimiento': (pd.Timestamp('1985-01-01') + pd.to_timedelta(rng.integers(0, 8000, n), unit='D')).strftime('%Y-%m-%d'),
+        'nacionalidad': paises,
+        'bandera': pd.Series(paises).map(lambda p: f"https://cdn.resfu.com/media/img/flags/st3/small/{p}.png"),
+        'altura': numeros(165, 200),
+        'peso': numeros(60, 95),
+        'goles': numeros(0, 20, 0.3),
+        'amarillas': numeros(0, 10, 0.3),
+        'rojas': numeros(0, 3, 0.3),
+        'imagen': [f"https://cdn.resfu.com/img_data/players/small/{i}.jpg?size=60x" for i in range(n)],
+    }).astype(object)
+
+
+def verificar(antes, despues, schema):
+    # Los valores no cambian, solo su representación
+    for col, dtype in schema.items():
+        if dtype == 'category':
+            assert antes[col].astype(object).equals(despues[col].astype(object)), col
+        elif dtype.startswith('datetime64'):
+            assert pd.to_datetime(antes[col]).equals(despues[col]), col
+        else:
+            esperado = pd.to_numeric(antes[col], errors='coerce').astype('Float64')
+            assert esperado.equals(despues[col].astype('Float64')), col
+
+
+def reporte(nombre, antes, despues):
+    mem_antes = antes.memory_usage(deep=True, index=False)
+    mem_despues = despues.memory_usage(deep=True, index=False)
+
+    print(f"\n{nombre} ({len(antes):,} filas)")
+    print(f"{'columna':>16} {'dtype antes':>16} {'dtype después':>16} {'KB antes':>10} {'KB después':>11}")
+    for col in antes.columns:
+        print(f"{col:>16} {str(antes[col].dtype):>16} {str(despues[col].dtype):>16} "
+              f"{mem_antes[col] / 1024:>10,.0f} {mem_despues[col] / 1024:>11,.0f}")
+    total_antes, total_despues = mem_antes.sum(), mem_despues.sum()
+    print(f"{'TOTAL':>16} {'':>16} {'':>16} {total_antes / 1024:>10,.0f} {total_despues / 1024:>11,.0f}"
+          f"  ({total_antes / total_despues:.1f}x menos)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memoria de los DataFrames antes y después de schema.py")
+    parser.add_argument('--partidos', type=int, default=100_000)
+    parser.add_argument('--jugadores', type=int, default=10_000)
+    args = parser.parse_args()
+
+    partidos = partidos_legacy(args.partidos)
+    partidos_compactos = compact_partidos(partidos)
+    verificar(partidos, partidos_compactos, PARTIDOS_SCHEMA)
+    reporte("partidos_river", partidos, partidos_compactos)
+
+    plantilla = plantilla_legacy(args.jugadores)
+    plantilla_compacta = compact_plantilla(plantilla)
+    verificar(plantilla, plantilla_compacta, PLANTILLA_SCHEMA)
+    reporte("plantilla_river", plantilla, plantilla_compacta)
+
+    print("\n✅ Valores idénticos antes y después de compactar.")
+
+
+if __name__ == "__main__":
+    main()
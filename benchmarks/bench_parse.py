@@ -0,0 +1,105 @@
+import argparse
+import glob
+import multiprocessing
+import os
+import re
+import sys
+import time
+
+# Add parent directory to path to allow importing 'scripts'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.extract import parse_partidos
+from scripts.extract_players import parse_plantilla
+from scripts.html_parsing import PARSERS
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+# Las páginas de partidos tienen bloques div.liga; las de plantilla, table.sdata_table
+PARSE_FUNCS = {'partidos': parse_partidos, 'plantilla': parse_plantilla}
+
+
+def tipo_de_pagina(path):
+    return 'plantilla' if 'plantilla' in os.path.basename(path) else 'partidos'
+
+
+def escalar_pagina(html, tipo, factor):
+    """
+    Página sintética 'factor' veces más grande: repite los bloques div.liga
+    (partidos) o las filas del tbody (plantilla) de una página real.
+    """
+    if factor <= 1:
+        return html
+    if tipo == 'partidos':
+        bloques = re.findall(r'<div class="liga">.*?</table>\s*</div>', html, flags=re.S)
+        return html.replace(bloques[-1], bloques[-1] + '\n'.join(bloques) * (factor - 1), 1) if bloques else html
+    inicio = html.index('<tbody>') + len('<tbody>')
+    fin = html.index('</tbody>')
+    return html[:inicio] + html[inicio:fin] * factor + html[fin:]
+
+
+def _rss_kb(campo):
+    # VmRSS / VmHWM del proceso actual (Linux)
+    with open('/proc/self/status') as f:
+        for linea in f:
+            if linea.startswith(campo):
+                return int(linea.split()[1])
+    return 0
+
+
+def _medir(tipo, html, parser, repeticiones, cola):
+    # Corre en un proceso aparte para que el pico de memoria sea solo de este parser
+    func = PARSE_FUNCS[tipo]
+    base = _rss_kb('VmRSS')
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        registros = func(html, parser=parser)
+    elapsed = time.perf_counter() - inicio
+    cola.put((elapsed, _rss_kb('VmHWM') - base, registros))
+
+
+def medir(tipo, html, parser, repeticiones):
+    ctx = multiprocessing.get_context('spawn')
+    cola = ctx.Queue()
+    proceso = ctx.Process(target=_medir, args=(tipo, html, parser, repeticiones, cola))
+    proceso.start()
+    resultado = cola.get()
+    proceso.join()
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de parseo: lxml vs html.parser")
+    parser.add_argument('pages', nargs='*', help="Páginas HTML guardadas (default: benchmarks/fixtures/*.html)")
+    parser.add_argument('--scale', type=int, nargs='+', default=[1, 20, 100],
+                        help="Factores de escala sintética sobre cada página")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    pages = args.pages or sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html')))
+
+    print(f"{'página':<22} {'escala':>6} {'parser':<12} {'páginas/s':>10} {'pico RSS (MB)':>14} {'filas':>7}")
+    for path in pages:
+        tipo = tipo_de_pagina(path)
+        with open(path, encoding='utf-8') as f:
+            original = f.read()
+
+        for factor in args.scale:
+            html = escalar_pagina(original, tipo, factor)
+            repeticiones = max(1, args.repeat // factor)
+            registros_por_parser = {}
+            for nombre in PARSERS:
+                elapsed, pico_kb, registros = medir(tipo, html, nombre, repeticiones)
+                registros_por_parser[nombre] = registros
+                print(f"{os.path.basename(path):<22} {factor:>6} {nombre:<12} "
+                      f"{repeticiones / elapsed:>10.1f} {pico_kb / 1024:>14.1f} {len(registros or []):>7}")
+
+            # Los dos parsers deben producir exactamente los mismos registros
+            assert registros_por_parser['lxml'] == registros_por_parser['html.parser'], \
+                f"Registros distintos entre parsers en {path} (escala {factor})"
+
+    print("✅ lxml y html.parser producen registros idénticos en todas las páginas.")
+
+
+if __name__ == "__main__":
+    main()
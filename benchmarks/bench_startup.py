@@ -0,0 +1,125 @@
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+# Arranque en frío del dashboard: importa en un proceso nuevo los mismos módulos
+# que main.py (leídos de sus imports de nivel superior) con `python -X importtime`
+# y reporta el tiempo por paquete. También verifica que el stack del ETL no se
+# cargue al arrancar: se importa recién cuando se lanza una corrida.
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+MAIN = os.path.join(RAIZ, 'main.py')
+
+# Módulos que no deberían cargarse hasta que se use el ETL o se dibuje un gráfico
+DIFERIDOS = [
+    'bs4', 'lxml', 'requests', 'plotly.express',
+    'scripts.pipeline', 'scripts.extract', 'scripts.extract_players',
+    'scripts.transform', 'scripts.transform_players', 'scripts.load', 'scripts.http_client',
+]
+
+
+def imports_del_dashboard(path=MAIN):
+    """
+    Módulos importados en el nivel superior de main.py, en orden.
+    """
+    with open(path, encoding='utf-8') as f:
+        arbol = ast.parse(f.read())
+    modulos = []
+    for nodo in arbol.body:
+        if isinstance(nodo, ast.Import):
+            modulos += [alias.name for alias in nodo.names]
+        elif isinstance(nodo, ast.ImportFrom) and nodo.module and nodo.level == 0:
+            modulos.append(nodo.module)
+    return list(dict.fromkeys(modulos))
+
+
+def medir(modulos):
+    """
+    Importa 'modulos' en un intérprete nuevo. Devuelve (segundos de pared,
+    filas de -X importtime como (self_us, cumulative_us, nivel, módulo),
+    módulos diferidos que quedaron cargados).
+    """
+    codigo = (
+        "import json, sys\n"
+        + "".join(f"import {m}\n" for m in modulos)
+        + f"print(json.dumps([m for m in {DIFERIDOS!r} if m in sys.modules]))\n"
+    )
+    inicio = time.perf_counter()
+    proceso = subprocess.run([sys.executable, '-X', 'importtime', '-c', codigo], cwd=RAIZ,
+                             capture_output=True, text=True, check=True)
+    segundos = time.perf_counter() - inicio
+
+    filas = []
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith('import time:') or 'self [us]' in linea:
+            continue
+        propio, acumulado, nombre = linea[len('import time:'):].split('|')
+        nivel = (len(nombre) - len(nombre.lstrip())) // 2
+        filas.append((int(propio), int(acumulado), nivel, nombre.strip()))
+    return segundos, filas, json.loads(proceso.stdout.strip().splitlines()[-1])
+
+
+def por_paquete(filas):
+    """
+    Tiempo propio (self) sumado por paquete raíz, de mayor a menor.
+    """
+    totales = defaultdict(int)
+    for propio, _, _, nombre in filas:
+        totales[nombre.split('.')[0]] += propio
+    return sorted(totales.items(), key=lambda kv: kv[1], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de arranque en frío (imports) del dashboard")
+    parser.add_argument('--repeat', type=int, default=3, help="Procesos a medir (se reporta el más rápido)")
+    parser.add_argument('--top', type=int, default=15, help="Paquetes a mostrar en el desglose")
+    parser.add_argument('--output', help="Archivo JSON con los resultados")
+    args = parser.parse_args()
+
+    modulos = imports_del_dashboard()
+    # Un proceso de calentamiento: los .pyc ya compilados y los archivos en la caché del SO
+    medir(modulos)
+    segundos, filas, cargados = min((medir(modulos) for _ in range(args.repeat)), key=lambda r: r[0])
+
+    total_us = sum(acumulado for _, acumulado, nivel, _ in filas if nivel == 0)
+    print(f"🚀 Imports de main.py: {total_us / 1e6:.3f}s ({segundos:.3f}s con el arranque del intérprete)")
+
+    print(f"\n{'módulo importado por main.py':<32} {'ms':>8}")
+    directos = {nombre: acumulado for _, acumulado, nivel, nombre in filas if nivel == 0}
+    for m in modulos:
+        if m in directos:
+            print(f"{m:<32} {directos[m] / 1000:>8.1f}")
+
+    print(f"\n{'paquete (tiempo propio)':<32} {'ms':>8} {'%':>6}")
+    desglose = por_paquete(filas)
+    for paquete, propio in desglose[:args.top]:
+        print(f"{paquete:<32} {propio / 1000:>8.1f} {100 * propio / total_us:>6.1f}")
+
+    if cargados:
+        print(f"\n⚠️ Se cargan al arrancar módulos que deberían ser diferidos: {', '.join(cargados)}")
+    else:
+        print("\n✅ El stack del ETL y plotly.express no se cargan al arrancar.")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'python': sys.version.split()[0],
+                'imports_seconds': round(total_us / 1e6, 4),
+                'process_seconds': round(segundos, 4),
+                'modules': {m: directos.get(m) for m in modulos},
+                'packages_us': dict(desglose),
+                'eager_deferred': cargados,
+            }, f, indent=2)
+        print(f"✅ Resultados guardados en {args.output}")
+
+    if cargados:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
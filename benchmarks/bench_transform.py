@@ -0,0 +1,95 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Add parent directory to path to allow importing 'scripts'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.transform import MESES, procesar_fechas
+
+
+def procesar_fechas_legacy(df):
+    """
+    Implementación original de transform_data (apply fila por fila),
+    conservada como referencia para la comparación de equivalencia.
+    """
+    def procesar_fecha_completa(row):
+        f = str(row['fecha'])
+        h = str(row.get('horario', '00:00'))
+
+        if '-' in h or not ':' in h:
+            h = "00:00"
+
+        for mes_txt, mes_num in MESES.items():
+            if mes_txt in f:
+                f = f.replace(mes_txt, mes_num)
+                break
+
+        try:
+            string_final = f"{f} {h}"
+            return pd.to_datetime(string_final, format='%d %m %y %H:%M', errors='coerce')
+        except:
+            return pd.to_datetime(f, format='%d %m %y', errors='coerce')
+
+    return df.apply(procesar_fecha_completa, axis=1)
+
+
+def generar_partidos(n, seed=0):
+    """
+    Fixture sintético con el formato crudo del scraper: "24 Ene 26" + horario,
+    incluyendo marcadores en 'horario', nulos y fechas sin parsear.
+    """
+    rng = np.random.default_rng(seed)
+    dias = rng.integers(1, 29, n).astype(str)
+    meses = rng.choice(list(MESES), n)
+    anios = rng.integers(10, 27, n).astype(str)
+    fechas = pd.Series(dias) + ' ' + meses + ' ' + anios
+    fechas[rng.random(n) < 0.01] = 'Por definir'
+
+    horarios = rng.choice(['21:00', '19:15', '00:00', '2-1', '', None], n, p=[0.4, 0.3, 0.1, 0.1, 0.05, 0.05])
+    return pd.DataFrame({'fecha': fechas, 'horario': horarios})
+
+
+def verificar_equivalencia(df):
+    """
+    Falla (AssertionError) si procesar_fechas no devuelve lo mismo que la
+    implementación por fila sobre df.
+    """
+    esperado = pd.to_datetime(procesar_fechas_legacy(df))
+    obtenido = procesar_fechas(df)
+    pd.testing.assert_series_equal(obtenido, esperado, check_names=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del parseo de fechas de transform_data")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1_000, 10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'filas':>10} {'legacy (s)':>12} {'vectorizado (s)':>16} {'speedup':>9}")
+    for n in args.sizes:
+        df = generar_partidos(n)
+
+        t_legacy = min(_timeit(procesar_fechas_legacy, df) for _ in range(args.repeat))
+        t_vector = min(_timeit(procesar_fechas, df) for _ in range(args.repeat))
+
+        # Equivalencia contra la salida original
+        verificar_equivalencia(df)
+
+        print(f"{n:>10} {t_legacy:>12.4f} {t_vector:>16.4f} {t_legacy / t_vector:>8.1f}x")
+
+    print("✅ Salida vectorizada idéntica a la implementación por fila.")
+
+
+def _timeit(func, df):
+    inicio = time.perf_counter()
+    func(df)
+    return time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import lxml
+import numpy as np
+import pandas as pd
+import sqlalchemy
+from sqlalchemy import create_engine, text
+
+# Add parent directory to path to allow importing 'scripts' and 'benchmarks'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.bench_parse import FIXTURES_DIR, escalar_pagina
+from benchmarks.bench_transform import generar_partidos, verificar_equivalencia
+from scripts.extract import parse_partidos
+from scripts.extract_players import parse_plantilla
+from scripts.load import DAY_KEYS, NATURAL_KEYS, bulk_insert, upsert_dataframe
+from scripts.transform import transform_data
+from scripts.transform_players import transform_players
+
+# Suite offline: parseo, transformación y carga sobre las páginas guardadas en
+# benchmarks/fixtures/ escaladas sintéticamente. Sin red; la carga va a la base
+# de --url o, si no se pasa, a un SQLite temporal como reemplazo de PostgreSQL.
+
+PAGINAS = {
+    'partidos': ('partidos.html', parse_partidos, transform_data, 'partidos_river'),
+    'plantilla': ('plantilla.html', parse_plantilla, transform_players, 'plantilla_river'),
+}
+
+
+def _silencioso(func, *args, **kwargs):
+    # Los scripts del ETL imprimen su progreso: no ensuciar la salida del benchmark
+    with contextlib.redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
+
+
+def _mejor_tiempo(func, repeat):
+    tiempos = []
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        resultado = func()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos), resultado
+
+
+def claves_unicas(df, tipo):
+    """
+    Las páginas escaladas repiten los mismos partidos/jugadores: se corre la
+    clave natural fila por fila para que la carga inserte todas las filas.
+    """
+    df = df.reset_index(drop=True)
+    if tipo == 'partidos':
+        # Un día por fila: la clave compara 'fecha' por día (ver DAY_KEYS)
+        return df.assign(fecha=df['fecha'] + pd.to_timedelta(np.arange(len(df)), unit='D'))
+    return df.assign(nombre=df['nombre'] + ' #' + pd.Series(np.arange(len(df))).astype(str))
+
+
+def medir_carga(engine, df, tabla, tipo, repeat):
+    """
+    Tiempos de carga sobre una tabla propia del benchmark: inserción en la
+    tabla vacía (COPY en PostgreSQL), upsert sin cambios y upsert con un 10%
+    de filas modificadas.
+    """
+    key_cols = NATURAL_KEYS[tabla]
+    tabla_bench = f"bench_{tabla}"
+    valor = 'g_river' if tipo == 'partidos' else 'goles'
+    modificado = df.copy()
+    filas = modificado.index[::10]
+    modificado.loc[filas, valor] = modificado.loc[filas, valor].fillna(0) + 1
+
+    def _drop():
+        with engine.begin() as conn:
+            conn.execute(text(f'DROP TABLE IF EXISTS "{tabla_bench}"'))
+
+    def insert():
+        _drop()
+        with engine.begin() as conn:
+            bulk_insert(df, tabla_bench, conn)
+
+    def upsert(datos):
+        with engine.begin() as conn:
+            return upsert_dataframe(datos, tabla_bench, key_cols, conn, day_cols=DAY_KEYS.get(tabla, ()))
+
+    tiempos = {}
+    tiempos['insert'], _ = _mejor_tiempo(insert, repeat)
+    tiempos['upsert_sin_cambios'], conteos = _mejor_tiempo(lambda: upsert(df), repeat)
+    assert conteos['unchanged'] == len(df), conteos
+
+    def upsert_cambios():
+        insert()
+        inicio = time.perf_counter()
+        conteos = upsert(modificado)
+        return time.perf_counter() - inicio, conteos
+
+    medidas = [upsert_cambios() for _ in range(repeat)]
+    tiempos['upsert_con_cambios'] = min(t for t, _ in medidas)
+    assert medidas[0][1]['updated'] == len(filas), medidas[0][1]
+
+    _drop()
+    return tiempos
+
+
+def verificar_partido_jugado(engine):
+    """
+    Regresión del upsert: un partido cargado pendiente (con hora de inicio)
+    y recargado ya jugado (la página muestra el marcador, hora 00:00) tiene
+    que quedar en una sola fila, con el resultado.
+    """
+    tabla = 'bench_partido_jugado'
+    fila = {'fecha': '15 Mar 26', 'competicion': 'Liga Profesional', 'local': 'River Plate',
+            'visitante': 'Boca Juniors', 'g_river': None, 'g_rival': None}
+    pendiente = pd.DataFrame([{**fila, 'resultado_final': 'Pendiente', 'horario': '21:30'}])
+    jugado = pd.DataFrame([{**fila, 'g_river': '2', 'g_rival': '1', 'resultado_final': 'Ganó', 'horario': '00:00'}])
+
+    with engine.begin() as conn:
+        conn.execute(text(f'DROP TABLE IF EXISTS "{tabla}"'))
+    for df in (pendiente, jugado):
+        with engine.begin() as conn:
+            upsert_dataframe(_silencioso(transform_data, df), tabla, NATURAL_KEYS['partidos_river'], conn,
+                             day_cols=DAY_KEYS['partidos_river'])
+    with engine.begin() as conn:
+        filas = conn.execute(text(f'SELECT resultado_final FROM "{tabla}"')).scalars().all()
+        conn.execute(text(f'DROP TABLE "{tabla}"'))
+    assert filas == ['Ganó'], filas
+    print("✅ Upsert: el partido pendiente y el mismo ya jugado quedan en una sola fila.")
+
+
+def verificar_fechas():
+    """
+    Equivalencia de procesar_fechas con la implementación original por fila
+    (ver benchmarks/bench_transform.py) sobre el fixture sintético de fechas.
+    """
+    verificar_equivalencia(generar_partidos(10_000))
+    print("✅ Fechas: salida vectorizada idéntica a la implementación por fila.")
+
+
+def correr_suite(scales, repeat, engine):
+    resultados = []
+
+    def registrar(etapa, tipo, escala, filas, segundos):
+        resultados.append({
+            'stage': etapa, 'page': tipo, 'scale': escala, 'rows': int(filas),
+            'seconds': round(segundos, 6), 'rows_per_s': round(filas / segundos, 1) if segundos else None,
+        })
+        print(f"{etapa:<24} {tipo:<10} {escala:>6} {filas:>8} {segundos:>10.4f} {filas / segundos:>12,.0f}")
+
+    print(f"{'etapa':<24} {'página':<10} {'escala':>6} {'filas':>8} {'segundos':>10} {'filas/s':>12}")
+    for tipo, (archivo, parse, transform, tabla) in PAGINAS.items():
+        with open(os.path.join(FIXTURES_DIR, archivo), encoding='utf-8') as f:
+            original = f.read()
+
+        for escala in scales:
+            html = escalar_pagina(original, tipo, escala)
+
+            segundos, registros = _mejor_tiempo(lambda: parse(html), repeat)
+            registrar('parse', tipo, escala, len(registros), segundos)
+
+            crudo = pd.DataFrame(registros)
+            segundos, limpio = _mejor_tiempo(lambda: _silencioso(transform, crudo), repeat)
+            registrar('transform', tipo, escala, len(limpio), segundos)
+
+            limpio = claves_unicas(limpio, tipo)
+            for etapa, segundos in medir_carga(engine, limpio, tabla, tipo, repeat).items():
+                registrar(f'load_{etapa}', tipo, escala, len(limpio), segundos)
+
+    return resultados
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__), check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def comparar(actual, path_base, umbral):
+    """
+    Compara contra un JSON de una corrida anterior. Devuelve la cantidad de
+    mediciones más lentas que 'umbral' veces la base.
+    """
+    with open(path_base, encoding='utf-8') as f:
+        base = json.load(f)
+    previos = {(r['stage'], r['page'], r['scale']): r['seconds'] for r in base['results']}
+
+    print(f"\nComparación contra {path_base} (commit {base.get('commit')}):")
+    regresiones = 0
+    for r in actual['results']:
+        previo = previos.get((r['stage'], r['page'], r['scale']))
+        if not previo:
+            continue
+        ratio = r['seconds'] / previo
+        marca = ''
+        if ratio > umbral:
+            regresiones += 1
+            marca = '  ⚠️ regresión'
+        print(f"{r['stage']:<24} {r['page']:<10} {r['scale']:>6} {ratio:>8.2f}x{marca}")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks offline: parseo, transformación y carga")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 100, 1_000],
+                        help="Factores de escala sobre las páginas de benchmarks/fixtures/")
+    parser.add_argument('--repeat', type=int, default=3, help="Repeticiones por medición (se toma la mejor)")
+    parser.add_argument('--url', default=os.getenv('BENCH_DATABASE_URL'),
+                        help="Base para la carga (default: SQLite temporal)")
+    parser.add_argument('--output', help="Archivo JSON con los resultados")
+    parser.add_argument('--compare', help="JSON de una corrida anterior para comparar")
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help="Con --compare: ratio a partir del cual una medición cuenta como regresión")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine = create_engine(url)
+        verificar_fechas()
+        verificar_partido_jugado(engine)
+        inicio = time.perf_counter()
+        resultados = correr_suite(args.scales, args.repeat, engine)
+        total = time.perf_counter() - inicio
+        dialecto = engine.dialect.name
+        engine.dispose()
+
+    salida = {
+        'commit': _commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'lxml': lxml.__version__,
+            'sqlalchemy': sqlalchemy.__version__,
+            'database': dialecto,
+            'machine': platform.machine(),
+        },
+        'params': {'scales': args.scales, 'repeat': args.repeat},
+        'results': resultados,
+    }
+    print(f"✅ Suite completa en {total:.1f}s ({dialecto}).")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(salida, f, indent=2, ensure_ascii=False)
+        print(f"✅ Resultados guardados en {args.output}")
+
+    if args.compare and comparar(salida, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
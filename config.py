@@ -0,0 +1,8 @@
+"""
+Loads the .env file into the environment, once per process. Every module
+that reads its settings with os.getenv at import time imports this module
+first; variables already defined in the environment take precedence.
+"""
+from dotenv import load_dotenv
+
+load_dotenv()
@@ -0,0 +1,207 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+
+from database import get_db_engine, get_read_engine
+
+# Tabla con el "sello" de versión de los datos: load_to_sql() la incrementa
+# después de cada carga exitosa y el dashboard la usa como parte de la clave de caché.
+VERSION_TABLE = "etl_data_version"
+
+
+class VersionedCache:
+    """
+    LRU cache with TTL whose entries are keyed on (key, data_version).
+    A new data version makes the old entries unreachable; they age out
+    through the TTL or the size bound.
+    """
+
+    def __init__(self, max_entries=16, ttl_seconds=3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        # Guards only the dict operations; builds in progress have their own lock
+        self._lock = threading.RLock()
+        self._building = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key, version):
+        entry = self._entries.get((key, version))
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[(key, version)]
+            return None
+        self._entries.move_to_end((key, version))
+        return value
+
+    def get(self, key, version):
+        with self._lock:
+            value = self._lookup(key, version)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def set(self, key, version, value):
+        with self._lock:
+            self._entries[(key, version)] = (time.monotonic(), value)
+            self._entries.move_to_end((key, version))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_set(self, key, version, build):
+        """
+        Returns the cached value or builds it once; concurrent callers of
+        the same key wait for the first build instead of repeating it. The
+        build runs under a per-key lock, so hits and builds of other keys
+        are never blocked by a slow query.
+        """
+        value = self.get(key, version)
+        if value is not None:
+            return value
+        with self._lock:
+            build_lock = self._building.setdefault((key, version), threading.Lock())
+        with build_lock:
+            with self._lock:
+                value = self._lookup(key, version)
+            if value is not None:
+                return value
+            try:
+                value = build()
+                self.set(key, version, value)
+            finally:
+                with self._lock:
+                    if self._building.get((key, version)) is build_lock:
+                        del self._building[(key, version)]
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+_query_cache = VersionedCache(
+    max_entries=int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "16")),
+    ttl_seconds=int(os.getenv("QUERY_CACHE_TTL", "3600")),
+)
+
+# Figuras de plotly serializadas (JSON): se construyen una vez por versión de datos
+# y se sirven a todas las sesiones
+_figure_cache = VersionedCache(
+    max_entries=int(os.getenv("FIGURE_CACHE_MAX_ENTRIES", "32")),
+    ttl_seconds=int(os.getenv("QUERY_CACHE_TTL", "3600")),
+)
+
+# La versión se consulta como mucho cada DATA_VERSION_CHECK_TTL segundos por proceso
+_version_check_ttl = float(os.getenv("DATA_VERSION_CHECK_TTL", "10"))
+_version_memo = {"version": None, "checked_at": 0.0}
+
+
+def _ensure_version_table(conn):
+    conn.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {VERSION_TABLE} ("
+        "id INTEGER PRIMARY KEY, version BIGINT NOT NULL, updated_at TIMESTAMP)"
+    ))
+
+
+def get_data_version(engine=None):
+    """
+    Returns the current data version stamp (0 if nothing was ever loaded).
+    Connection or permission errors propagate: nothing is cached under a
+    version that could not be read.
+    """
+    now = time.monotonic()
+    if _version_memo["version"] is not None and now - _version_memo["checked_at"] < _version_check_ttl:
+        return _version_memo["version"]
+
+    engine = engine or get_read_engine()
+    try:
+        with engine.connect() as conn:
+            version = conn.execute(text(f"SELECT version FROM {VERSION_TABLE} WHERE id = 1")).scalar()
+    except (ProgrammingError, OperationalError):
+        # Sólo si la tabla todavía no existe (ninguna carga con versionado); cualquier otro
+        # error (base caída, credenciales, timeout) se propaga
+        with engine.connect() as conn:
+            if inspect(conn).has_table(VERSION_TABLE):
+                raise
+        version = None
+
+    _version_memo["version"] = version or 0
+    _version_memo["checked_at"] = now
+    return _version_memo["version"]
+
+
+def bump_data_version(engine=None):
+    """
+    Increments the data version stamp. Called by load_to_sql() after a
+    successful load so every cached read is refreshed on the next access.
+    """
+    engine = engine or get_db_engine()
+    with engine.begin() as conn:
+        _ensure_version_table(conn)
+        updated = conn.execute(text(
+            f"UPDATE {VERSION_TABLE} SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1"
+        ))
+        if updated.rowcount == 0:
+            conn.execute(text(
+                f"INSERT INTO {VERSION_TABLE} (id, version, updated_at) VALUES (1, 1, CURRENT_TIMESTAMP)"
+            ))
+        version = conn.execute(text(f"SELECT version FROM {VERSION_TABLE} WHERE id = 1")).scalar()
+
+    # La próxima lectura vuelve a consultar la versión con el engine de lectura: si es
+    # una réplica, la versión y los datos que se cachean salen de la misma fuente
+    _version_memo["version"] = None
+    _query_cache.clear()
+    _figure_cache.clear()
+    return version
+
+
+def read_sql_cached(query, engine=None, parse_dates=None, compact=None):
+    """
+    pd.read_sql behind the versioned cache. 'compact' is an optional function
+    (see schema.py) applied once before caching, so the cached copy already
+    uses the compact dtypes. The returned DataFrame is shared between
+    sessions: callers must copy it before modifying it.
+    """
+    engine = engine or get_read_engine()
+    version = get_data_version(engine)
+    key = (query, tuple(parse_dates or ()), getattr(compact, '__name__', None))
+
+    def _load():
+        df = pd.read_sql(query, engine, parse_dates=parse_dates)
+        return compact(df) if compact else df
+
+    return _query_cache.get_or_set(key, version, _load)
+
+
+def figure_cached(key, build, engine=None):
+    """
+    Plotly figure spec behind the versioned cache. 'build' returns a
+    plotly Figure; it runs once per data version and the figure is stored
+    serialized as JSON. Returns a fresh dict spec, ready for st.plotly_chart.
+    """
+    engine = engine or get_read_engine()
+    version = get_data_version(engine)
+    spec = _figure_cache.get_or_set(key, version, lambda: build().to_json())
+    return json.loads(spec)
+
+
+def get_cache_stats():
+    stats = _query_cache.stats()
+    stats["data_version"] = _version_memo["version"]
+    stats["figures"] = _figure_cache.stats()
+    return stats
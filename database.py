@@ -1,34 +1,74 @@
 
 import os
-from sqlalchemy import create_engine
-from dotenv import load_dotenv
+import threading
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool
 
-# Load environment variables
-load_dotenv()
+import config
 
-def get_db_engine():
+# One engine (and connection pool) per process and role: "read" for the dashboard
+# (it may point at a replica or a pooler endpoint) and "write" for the ETL.
+ROLES = ("read", "write")
+_engines = {}
+_engine_lock = threading.Lock()
+_engine_stats = {
+    "engines_created": 0,
+    "connections_created": 0,
+    "connections_checked_out": 0,
+}
+
+# Default statement timeouts per role (ms, 0 = no timeout)
+_STATEMENT_TIMEOUTS = {"read": "15000", "write": "300000"}
+# Supabase's transaction-mode pooler (Supavisor) listens on this port
+_TRANSACTION_POOLER_PORT = 6543
+
+
+def _setting(role, name, default):
+    # DB_READ_POOL_SIZE / DB_WRITE_POOL_SIZE override the shared DB_POOL_SIZE, etc.
+    return os.getenv(f"DB_{role.upper()}_{name}", os.getenv(f"DB_{name}", str(default)))
+
+
+def _get_db_url(role="write"):
     """
-    Returns a SQLAlchemy engine based on the 'ENVIRONMENT' variable.
+    Returns (db_url, message) based on the 'ENVIRONMENT' variable.
     - 'dev': Uses local Docker credentials.
     - 'prod': Uses Supabase/Cloud credentials.
+    - 'local': Embedded SQLite file (SQLITE_PATH), no server needed.
+    DATABASE_URL overrides all of them with any SQLAlchemy URL. The read role
+    may use another endpoint (DATABASE_READ_URL, SUPABASE_READ_HOST / _PORT or
+    DB_READ_HOST / _PORT, e.g. a read replica or a local SQLite copy, see
+    scripts/replica.py); by default it shares the write endpoint.
     """
+    read = role == "read"
     env = os.getenv("ENVIRONMENT", "dev").lower()
-    
+
+    url = (read and os.getenv("DATABASE_READ_URL")) or os.getenv("DATABASE_URL")
+    if url:
+        return url, f"🔗 Connecting to {make_url(url).get_backend_name()} (URL from the environment, {role})..."
+
+    if env == "local":
+        path = os.getenv("SQLITE_PATH", "data/river.db")
+        return f"sqlite:///{path}", f"🗃️ Using embedded SQLite database ({path}, {role})..."
+
     if env == "prod":
         # Supabase / Production Credentials
         user = os.getenv("SUPABASE_USER")
         password = os.getenv("SUPABASE_PASSWORD")
         host = os.getenv("SUPABASE_HOST")
         port = os.getenv("SUPABASE_PORT", "5432")
-        message = "🌍 Connecting to Production Database (Supabase)..."
-        
+        if read:
+            host = os.getenv("SUPABASE_READ_HOST", host)
+            port = os.getenv("SUPABASE_READ_PORT", port)
+        message = f"🌍 Connecting to Production Database (Supabase, {role})..."
+
         # Supabase specific: Connection pooling requires 'postgresql' dialect
         db_name = "postgres"  # Supabase default DB is usually 'postgres'
-        
+
         # Construct connection string
         # Note: sqlalchemy < 1.4 uses postgres://, but we use postgresql:// for compatibility
         db_url = f"postgresql://{user}:{password}@{host}:{port}/{db_name}"
-        
+
     else:
         # Local / Development Credentials
         user = os.getenv("DB_USER", "postgres")
@@ -36,18 +76,189 @@ def get_db_engine():
         host = os.getenv("DB_HOST", "localhost") # Default to localhost for running scripts outside docker
         # NB: Inside docker, DB_HOST should be 'db'. Outside, it is 'localhost'.
         # We handle this by letting the .env or docker-compose override DB_HOST.
-        
+
         port = os.getenv("DB_PORT", "5432")
+        if read:
+            host = os.getenv("DB_READ_HOST", host)
+            port = os.getenv("DB_READ_PORT", port)
         db_name = os.getenv("DB_NAME", "river_plate_db")
-        message = "💻 Connecting to Local Database (Docker)..."
-        
+        message = f"💻 Connecting to Local Database (Docker, {role})..."
+
         db_url = f"postgresql://{user}:{password}@{host}:{port}/{db_name}"
 
-    print(message)
-    
-    try:
-        engine = create_engine(db_url)
+    return db_url, message
+
+
+def _flag(value):
+    return str(value).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _transaction_pooler(role, db_url):
+    """
+    Whether the role connects through a transaction-mode pooler (pgbouncer /
+    Supavisor): DB_<ROLE>_TRANSACTION_POOLER or DB_TRANSACTION_POOLER, and
+    by default only when the URL uses Supabase's pooler port (6543).
+    """
+    return _flag(_setting(role, "TRANSACTION_POOLER", make_url(db_url).port == _TRANSACTION_POOLER_PORT))
+
+
+def _pool_options(role="write"):
+    """
+    Pool settings per role, overridable from the environment (DB_<ROLE>_* or
+    the shared DB_*): POOL_SIZE, MAX_OVERFLOW, POOL_RECYCLE (seconds),
+    POOL_PRE_PING and NULL_POOL. With NULL_POOL every checkout opens a new
+    connection and closes it on return: meant for many dashboard replicas
+    behind a pooler, which then owns the real Postgres connections.
+    """
+    if _flag(_setting(role, "NULL_POOL", False)):
+        return {"poolclass": NullPool}
+    return {
+        "pool_size": int(_setting(role, "POOL_SIZE", 5)),
+        "max_overflow": int(_setting(role, "MAX_OVERFLOW", 10)),
+        "pool_recycle": int(_setting(role, "POOL_RECYCLE", 1800)),
+        "pool_pre_ping": _flag(_setting(role, "POOL_PRE_PING", True)),
+    }
+
+
+def _session_settings(role, db_url):
+    """
+    Statement timeout (DB_<ROLE>_STATEMENT_TIMEOUT, ms) and, for the read
+    role, read-only transactions. Directly against Postgres they travel as
+    startup options; a transaction-mode pooler doesn't keep session state,
+    so there they're set with SET LOCAL at the start of every transaction.
+    Returns (connect_args, sql to run on begin or None).
+    """
+    if make_url(db_url).get_backend_name() != "postgresql":
+        return {}, None
+    timeout = int(_setting(role, "STATEMENT_TIMEOUT", _STATEMENT_TIMEOUTS[role]))
+    read_only = role == "read"
+
+    if not _transaction_pooler(role, db_url):
+        options = f"-c statement_timeout={timeout}"
+        if read_only:
+            options += " -c default_transaction_read_only=on"
+        return {"options": options}, None
+
+    sentencias = ["SET TRANSACTION READ ONLY"] if read_only else []
+    sentencias.append(f"SET LOCAL statement_timeout = {timeout}")
+    return {}, "; ".join(sentencias)
+
+
+def _sqlite_settings(engine, role):
+    """
+    SQLite: WAL (the dashboard keeps reading while the ETL writes), a busy
+    timeout (SQLITE_BUSY_TIMEOUT, ms) instead of 'database is locked', and
+    real transactions. pysqlite doesn't emit BEGIN before DDL, so the load's
+    CREATE TABLE and the migrations wouldn't be atomic: BEGIN is emitted
+    explicitly, IMMEDIATE for the write role (takes the write lock up front).
+    The read role is query_only, like the read-only Postgres transactions.
+    """
+    busy_timeout = int(os.getenv("SQLITE_BUSY_TIMEOUT", "30000"))
+    begin = "BEGIN IMMEDIATE" if role == "write" else "BEGIN"
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={busy_timeout}")
+        if role == "read":
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(conn):
+        conn.exec_driver_sql(begin)
+
+
+def _track_pool(engine):
+    # Contadores para confirmar que los reruns reutilizan el pool
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        _engine_stats["connections_created"] += 1
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        _engine_stats["connections_checked_out"] += 1
+
+
+def get_db_engine(role="write"):
+    """
+    Returns the process-wide SQLAlchemy engine for 'role' ("write" for the
+    ETL, "read" for the dashboard), creating it on first use. The connection
+    URL depends on 'ENVIRONMENT' (see _get_db_url) and the pool and timeouts
+    are configured from the DB_* variables (see _pool_options and
+    _session_settings).
+    """
+    engine = _engines.get(role)
+    if engine is not None:
         return engine
-    except Exception as e:
-        print(f"❌ Error creating database engine: {e}")
-        raise e
+    if role not in ROLES:
+        raise ValueError(f"Unknown engine role: {role!r} (expected one of {ROLES})")
+
+    with _engine_lock:
+        if role not in _engines:
+            db_url, message = _get_db_url(role)
+            print(message)
+
+            # psycopg2 never uses server-side prepared statements, so the same
+            # engine works behind a transaction-mode pooler (see _session_settings)
+            connect_args, al_iniciar = _session_settings(role, db_url)
+            url = make_url(db_url)
+            if url.get_backend_name() == "sqlite" and url.database:
+                os.makedirs(os.path.dirname(os.path.abspath(url.database)), exist_ok=True)
+            try:
+                engine = create_engine(db_url, connect_args=connect_args, **_pool_options(role))
+            except Exception as e:
+                print(f"❌ Error creating database engine: {e}")
+                raise e
+
+            if al_iniciar:
+                event.listen(engine, "begin", lambda conn: conn.exec_driver_sql(al_iniciar))
+            if engine.dialect.name == "sqlite":
+                _sqlite_settings(engine, role)
+            _track_pool(engine)
+            _engine_stats["engines_created"] += 1
+            _engines[role] = engine
+
+    return _engines[role]
+
+
+def create_sqlite_engine(path, role="write"):
+    """
+    Standalone engine (not shared) for a SQLite file with the same settings
+    as the embedded backend, e.g. to write a local read replica.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    engine = create_engine(f"sqlite:///{path}")
+    _sqlite_settings(engine, role)
+    return engine
+
+
+def get_read_engine():
+    """
+    Engine for the dashboard's queries (read-only transactions, short
+    statement timeout). Shares the write endpoint unless *_READ_HOST is set.
+    """
+    return get_db_engine("read")
+
+
+def get_engine_stats():
+    """
+    Returns a snapshot of the engine counters plus the pool status per role.
+    """
+    stats = dict(_engine_stats)
+    stats["pool_status"] = {role: engine.pool.status() for role, engine in _engines.items()}
+    return stats
+
+
+def dispose_db_engine():
+    """
+    Closes the pooled connections and forgets the engines, so the next
+    get_db_engine() call builds new ones (e.g. after changing credentials).
+    """
+    with _engine_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
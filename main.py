@@ -1,21 +1,24 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-from sqlalchemy import create_engine
 import os
-from scripts.extract import extract_river_scraping
-from scripts.extract_players import extract_river_players
-from scripts.transform import transform_data
-from scripts.transform_players import transform_players
-from scripts.load import load_to_sql
-from database import get_db_engine
-from datetime import datetime
-
-# DB Connection handled by database.py
+import time
+from database import get_read_engine, get_engine_stats
+from data_cache import read_sql_cached, figure_cached, get_cache_stats
+from schema import compact_partidos, compact_plantilla
+from agenda import preparar_agenda
+# Módulos livianos: el stack del ETL (requests, BeautifulSoup, lxml, carga) se importa
+# recién cuando se lanza una corrida (ver scripts/jobs.py y benchmarks/bench_startup.py)
+from scripts.jobs import start_etl, get_job, is_running
+from scripts.etl_metrics import get_last_run
+from scripts.assets import ESCUDO_URL, asset_uri, local_asset
+
+# DB Connection handled by database.py: el dashboard sólo lee, con el engine de lectura
+# (puede apuntar a una réplica o al pooler); el ETL usa el de escritura
 def get_engine():
-    return get_db_engine()
+    return get_read_engine()
 
 st.set_page_config(page_title="River Plate Analytics", page_icon="⚪🔴", layout="wide")
+inicio_rerun = time.perf_counter()
 
 # --- Estilo CSS Identidad River ---
 st.markdown("""
@@ -33,9 +36,9 @@ st.markdown("""
     /* Títulos secundarios en Rojo */
     h2, h3 { color: #FFFFFF !important; }
 
-    /* Pestañas: Fondo Blanco + Letra Roja (Inactiva) | Fondo Rojo + Letra Blanca (Activa) */
-    .stTabs [data-baseweb="tab-list"] { gap: 12px; }
-    .stTabs [data-baseweb="tab"] {
+    /* Secciones (radio horizontal con aspecto de pestañas): Fondo Blanco + Letra Roja (Inactiva) | Fondo Rojo + Letra Blanca (Activa) */
+    .st-key-seccion [role="radiogroup"] { gap: 12px; }
+    .st-key-seccion label[data-baseweb="radio"] {
         height: 55px;
         background-color: #ffffff; 
         color: #ED1C24; 
@@ -45,11 +48,13 @@ st.markdown("""
         font-weight: bold;
         transition: all 0.3s;
     }
-    .stTabs [aria-selected="true"] {
+    .st-key-seccion label[data-baseweb="radio"] > div:first-child { display: none; }
+    .st-key-seccion label[data-baseweb="radio"]:has(input:checked) {
         background-color: #ED1C24 !important; 
         color: #ffffff !important; 
         border: 2px solid #ED1C24 !important;
     }
+    .st-key-seccion label[data-baseweb="radio"] p { color: inherit; font-weight: bold; }
 
     /* Estilo de métricas */
     [data-testid="stMetric"] {
@@ -67,12 +72,48 @@ st.markdown("""
 
 st.title("⚪🔴 RIVER PLATE - TEMPORADA 2026")
 
+# --- ETL en segundo plano (scripts/jobs.py) ---
+@st.fragment(run_every=2)
+def progreso_etl(job_id):
+    # Se consulta el estado cada 2s; al terminar se vuelve a ejecutar toda la app con los datos nuevos
+    job = get_job(job_id)
+    if job and job['status'] == 'running':
+        st.info(f"⏳ ETL en curso ({job['id']}): {job['stage']} · {job['rows']} filas · {job['elapsed']:.0f}s")
+    else:
+        st.rerun()
+
+def resultado_etl(job):
+    if job['status'] == 'done':
+        st.success(f"¡Datos actualizados! ({job['rows']} filas en {job['elapsed']:.0f}s)")
+    elif job['status'] == 'skipped':
+        st.info('Sin cambios desde la última actualización.')
+    else:
+        st.error(f"❌ Error en el ETL: {job['error']}")
+
+def ultima_corrida_etl():
+    # Desglose por etapa de la última corrida registrada en etl_runs
+    run = get_last_run()
+    if run is None:
+        return
+    iconos = {'ok': '✅', 'skipped': '⏭️', 'failed': '❌'}
+    with st.expander(f"{iconos.get(run['status'], '')} Última corrida del ETL ({run['wall_seconds']:.1f}s)"):
+        st.caption(f"{run['started_at']:%d/%m %H:%M} UTC · {run['rows_loaded'] or 0} filas cargadas · "
+                   f"{(run['bytes_fetched'] or 0) / 1024:.0f} KB descargados")
+        if run.get('error'):
+            st.error(run['error'])
+        if run['stages']:
+            etapas = pd.DataFrame(run['stages']).reindex(
+                columns=['stage', 'wall_seconds', 'cpu_seconds', 'rows_in', 'rows_out', 'bytes', 'peak_rss_mb'])
+            st.dataframe(etapas, hide_index=True, use_container_width=True, column_config={
+                "stage": "Etapa", "wall_seconds": "Tiempo (s)", "cpu_seconds": "CPU (s)",
+                "rows_in": "Filas in", "rows_out": "Filas out", "bytes": "Bytes",
+                "peak_rss_mb": "Pico RSS (MB)",
+            })
+
 with st.sidebar:
-    # URL del escudo oficial (usando la imagen de la web que estamos scrappeando)
-    url_escudo = "https://cdn.resfu.com/img_data/equipos/593.png?size=120x"
-    
-    # Mostramos el escudo centrado
-    st.image(url_escudo, width=150)
+    # Escudo desde la caché local de imágenes (scripts/assets.py); si todavía no
+    # se descargó, desde la web que estamos scrappeando
+    st.image(local_asset(ESCUDO_URL) or ESCUDO_URL, width=150)
     
     st.markdown("---") # Una línea divisora para separar el logo de los botones
     
@@ -82,255 +123,288 @@ with st.sidebar:
     if env == "prod":
         st.info("🔒 Modo Producción")
     else:
-        # Aquí iría tu botón de ETL
-        if st.button('🚀 Actualizar Datos (ETL)'):
-            with st.spinner('Procesando datos...'):
-                # Match Data
-                extract_river_scraping()
-                transform_data()
-                
-                # Feature: Squad/Plantel Data
-                extract_river_players()
-                transform_players()
-                
-                # Load all
-                load_to_sql()
-                st.success('¡Datos actualizados!')
+        # Extract → Transform → Load en un thread de fondo: la sesión no se bloquea y si ya
+        # hay una corrida en curso (de esta u otra sesión) el click se une a esa corrida
+        if st.button('🚀 Actualizar Datos (ETL)', disabled=is_running()):
+            st.session_state['etl_job'] = start_etl()
+
+        if is_running():
+            job = get_job()
+        else:
+            # Resultado de la última corrida lanzada desde esta sesión
+            job = get_job(st.session_state['etl_job']) if 'etl_job' in st.session_state else None
+        if job and job['status'] == 'running':
+            progreso_etl(job['id'])
+        elif job:
+            resultado_etl(job)
+
+        # Estado del pool: permite confirmar que los reruns reutilizan conexiones
+        stats = get_engine_stats()
+        st.caption(f"🔌 Engines: {stats['engines_created']} | Conexiones abiertas: {stats['connections_created']} | Checkouts: {stats['connections_checked_out']}")
+        cache = get_cache_stats()
+        st.caption(f"🗃️ Caché v{cache['data_version']} | Hits: {cache['hits']} | Misses: {cache['misses']}")
+        st.caption(f"📈 Figuras: {cache['figures']['entries']} | Hits: {cache['figures']['hits']} | Misses: {cache['figures']['misses']}")
+
+    # Tiempos por etapa de la última corrida (también la del scheduler)
+    ultima_corrida_etl()
+
+# --- Secciones ---
+# Cada sección es un fragmento: al interactuar dentro de una sección solo se
+# vuelve a ejecutar esa sección, y solo se renderiza la sección elegida
+# (st.tabs ejecuta siempre el contenido de todas las pestañas).
+SECCIONES = ["📅 AGENDA POR COMPETICIÓN", "📊 ANÁLISIS ESTADÍSTICO", "⚽ PLANTEL"]
+
+# --- Figuras ---
+# Se construyen una sola vez por versión de datos (figure_cached) y se
+# comparten entre sesiones como spec JSON. plotly.express se importa recién
+# al construir la primera figura: la agenda (sección inicial) no lo necesita.
+COLORES_RESULTADO = {
+    'Ganó': '#b0d3b4',   # Tu verde pastel
+    'Empató': '#e6d89f', # Tu amarillo pastel
+    'Perdió': '#e0bfc2'  # Tu rojo pastel
+}
+
+def fig_resultados(df_barras):
+    import plotly.express as px
+    fig_bar = px.bar(
+        df_barras, 
+        x='competicion', 
+        y='Cantidad', 
+        color='resultado_final',
+        barmode='group',
+        text_auto=True,
+        color_discrete_map=COLORES_RESULTADO
+    )
+    
+    fig_bar.update_layout(
+        xaxis_title="", 
+        yaxis_title="Cantidad de Partidos",
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return fig_bar
+
+def fig_distribucion(df_barras):
+    import plotly.express as px
+    df_totales = df_barras.groupby('resultado_final', as_index=False)['Cantidad'].sum()
+    return px.pie(
+        df_totales, 
+        names='resultado_final', 
+        values='Cantidad',
+        color='resultado_final',
+        color_discrete_map=COLORES_RESULTADO,
+        hole=0.4
+    )
+
+def fig_histograma(df_stats, columna, titulo, color):
+    import plotly.express as px
+    fig = px.histogram(df_stats, x=columna, title=titulo, 
+                       nbins=10, color_discrete_sequence=[color],
+                       labels={'count':'Cantidad'})
+    fig.update_layout(bargap=0.2, yaxis_title="Cantidad")
+    return fig
+
+def fig_donut(df, columna, titulo, colores):
+    import plotly.express as px
+    return px.pie(df, values=columna, names='nombre', title=titulo,
+                  hole=0.4, color_discrete_sequence=colores)
+
+@st.fragment
+def render_agenda(df):
+    st.header("Calendario River Plate 2026")
+    # Una sola pasada: orden, formato de fecha y semáforo vectorizados (ver agenda.py)
+    for comp, df_view in preparar_agenda(df):
+        with st.expander(f"🏆 {comp.upper()}", expanded=True):
+            st.dataframe(df_view, use_container_width=True, hide_index=True)
+
+@st.fragment
+def render_analisis(engine):
+    st.header("Análisis de Rendimiento")
+    try:
+        # KPIs pre-agregados en la base (refrescados por load_to_sql)
+        puntos_comp = read_sql_cached(
+            "SELECT competicion, puntos FROM kpi_puntos_competicion ORDER BY competicion", engine)
+        df_barras = read_sql_cached(
+            "SELECT competicion, resultado_final, cantidad AS \"Cantidad\" "
+            "FROM kpi_resultados_competicion ORDER BY competicion, resultado_final", engine)
+        eficacia = read_sql_cached("SELECT * FROM kpi_eficacia", engine)
+    except Exception:
+        puntos_comp = df_barras = eficacia = None
+        st.warning("Los KPIs todavía no están generados. Ejecuta el ETL para crearlos.")
+
+    if df_barras is not None and not df_barras.empty:
+        # 1. PUNTOS POR COMPETICIÓN
+        st.subheader("Puntos Obtenidos por Torneo")
+        
+        c_met = st.columns(len(puntos_comp))
+        for i, row in puntos_comp.iterrows():
+            c_met[i].metric(row['competicion'], f"{row['puntos']} Pts")
+
+        st.divider()
+
+        # 2. GRÁFICO DE BARRAS POR COMPETICIÓN (NUEVO - Con tus colores)
+        st.subheader("Resultados Detallados por Competición")
+        
+        fig_bar = figure_cached('resultados_competicion', lambda: fig_resultados(df_barras), engine)
+        st.plotly_chart(fig_bar, use_container_width=True)
+
+        st.divider()
+
+        # 3. DISTRIBUCIÓN TOTAL Y KPIs
+        col_izq, col_der = st.columns(2)
+        
+        with col_izq:
+            st.subheader("Distribución Total de Resultados 2026")
+            fig_pie = figure_cached('distribucion_resultados', lambda: fig_distribucion(df_barras), engine)
+            st.plotly_chart(fig_pie, use_container_width=True)
+        
+        with col_der:
+            st.subheader("Métricas de Eficacia")
+            # Promedio global a partir de los totales por competición
+            partidos_con_goles = eficacia['partidos_con_goles'].sum()
+            prom_g = eficacia['goles_river'].sum() / partidos_con_goles if partidos_con_goles else float('nan')
+            vallas = int(eficacia['vallas_invictas'].sum())
+            
+            st.metric("Promedio Goles de River", f"{prom_g:.2f}")
+            st.metric("Partidos con Valla Invicta", vallas)
+    elif df_barras is not None:
+        st.warning("No hay datos de partidos jugados para generar estadísticas.")
+
+@st.fragment
+def render_fisico(df_stats, engine):
+    # --- Dimensiones Físicas (Histogramas) ---
+    st.subheader("📊 Físico y Edad")
+    
+    histogramas = [
+        ("edad", "Edad", '#ED1C24'),
+        ("altura", "Altura (cm)", '#333333'),
+        ("peso", "Peso (kg)", '#B0B0B0'),
+    ]
+    for col, (columna, titulo, color) in zip(st.columns(3), histogramas):
+        fig = figure_cached(('histograma', columna),
+                            lambda: fig_histograma(df_stats, columna, titulo, color), engine)
+        col.plotly_chart(fig, use_container_width=True)
+
+@st.fragment
+def render_rendimiento(df_stats, engine):
+    # --- Rendimiento (Donut Charts) ---
+    st.subheader("⚽ Rendimiento: Goles y Tarjetas")
+    
+    # Total por equipo
+    total_goles = df_stats['goles'].sum()
+    total_amarillas = df_stats['amarillas'].sum()
+    total_rojas = df_stats['rojas'].sum()
+
+    kpi1, kpi2, kpi3 = st.columns(3)
+    kpi1.metric("Goles Totales", int(total_goles))
+    kpi2.metric("Tarjetas Amarillas", int(total_amarillas))
+    kpi3.metric("Tarjetas Rojas", int(total_rojas))
+
+    # Gráficos de Torta/Anillo - Top Jugadores
+    row_charts = st.columns(3)
+    
+    # Definir paleta River: Rojo, Negro, Gris Oscuro, Gris Claro, Rojo Oscuro
+    palette_river = ['#ED1C24', '#333333', '#808080', '#B0B0B0', '#8B0000']
+
+    # 1. Goles (Top goleadores)
+    df_goles = df_stats[df_stats['goles'] > 0].sort_values('goles', ascending=False)
+    if not df_goles.empty:
+        fig_gol = figure_cached('donut_goles', lambda: fig_donut(
+            df_goles, 'goles', 'Distribución de Goles', palette_river), engine)
+        row_charts[0].plotly_chart(fig_gol, use_container_width=True)
+    else:
+        row_charts[0].info("Sin goles registrados")
+
+    # 2. Amarillas
+    df_am = df_stats[df_stats['amarillas'] > 0]
+    if not df_am.empty:
+        fig_am = figure_cached('donut_amarillas', lambda: fig_donut(
+            df_am, 'amarillas', 'Tarjetas Amarillas', ['#FFD700', '#F0E68C', '#BDB76B']), engine)
+        row_charts[1].plotly_chart(fig_am, use_container_width=True)
+    else:
+        row_charts[1].info("Sin amarillas registradas")
+
+    # 3. Rojas
+    df_rj = df_stats[df_stats['rojas'] > 0]
+    if not df_rj.empty:
+        fig_rj = figure_cached('donut_rojas', lambda: fig_donut(
+            df_rj, 'rojas', 'Tarjetas Rojas', ['#FF0000', '#8B0000']), engine)
+        row_charts[2].plotly_chart(fig_rj, use_container_width=True)
+    else:
+        row_charts[2].info("Sin rojas registradas")
+
+@st.fragment
+def render_plantel(engine):
+    st.header("Plantel 2026")
+    try:
+        df_players = read_sql_cached("SELECT * FROM plantilla_river", engine, compact=compact_plantilla)
+        
+        if not df_players.empty:
+            # Fotos y banderas embebidas desde la caché local (las que falten siguen
+            # apuntando a la URL original). bandera es category: se mapean sólo las categorías
+            df_players = df_players.assign(
+                imagen=df_players['imagen'].map(asset_uri),
+                bandera=df_players['bandera'].map(asset_uri),
+            )
+
+            # Configuración de columnas
+            st.dataframe(
+                df_players[['dorsal', 'imagen', 'nombre', 'posicion', 'edad', 'bandera', 'altura', 'peso', 'goles', 'amarillas', 'rojas']],
+                column_config={
+                    "imagen": st.column_config.ImageColumn("Foto", width="small"),
+                    "dorsal": st.column_config.NumberColumn("N°", width="small", format="%d"),
+                    "nombre": st.column_config.TextColumn("Jugador", width="medium"),
+                    "posicion": "Posición",
+                    "edad": "Edad",
+                    "bandera": st.column_config.ImageColumn("Nacionalidad", width="small"),
+                    "altura": "Altura (cm)",
+                    "peso": "Peso (kg)",
+                    "goles": "⚽ Goles",
+                    "amarillas": "🟨 Amarillas",
+                    "rojas": "🟥 Rojas"
+                },
+                hide_index=True,
+                use_container_width=True,
+                height=600
+            )
+
+            st.divider()
+            # Columnas ya tipadas en la base (enteros con NULL): no hace falta coercionar
+            render_fisico(df_players, engine)
+            st.divider()
+            render_rendimiento(df_players, engine)
+
+        else:
+            st.info("No hay datos de plantilla disponibles.")
+    
+    except Exception as e:
+        # Si la tabla no existe aún
+        st.error(f"Error cargando plantilla: {e}")
 
 # --- Lógica de Datos ---
 try:
     engine = get_engine()
-    df = pd.read_sql("SELECT * FROM partidos_river", engine)
+    # DataFrame compartido entre sesiones (caché por versión de datos): no modificar in-place
+    # (tipos compactos: category / Int16 / datetime, ver schema.py)
+    df = read_sql_cached("SELECT * FROM partidos_river", engine, compact=compact_partidos)
     
     if not df.empty:
-        df['fecha'] = pd.to_datetime(df['fecha'])
-        
-        tab1, tab2, tab3 = st.tabs(["📅 AGENDA POR COMPETICIÓN", "📊 ANÁLISIS ESTADÍSTICO", "⚽ PLANTEL"])
+        # Solo se ejecuta la sección elegida
+        seccion = st.radio("Sección", SECCIONES, horizontal=True, key="seccion", label_visibility="collapsed")
 
-        with tab1:
-            st.header("Calendario River Plate 2026")
-            competencias = df['competicion'].unique()
-            
-            for comp in competencias:
-                with st.expander(f"🏆 {comp.upper()}", expanded=True):
-                    df_comp = df[df['competicion'] == comp].sort_values('fecha').copy()
-                    
-                    # Renombrar columnas
-                    df_view = df_comp.rename(columns={
-                        'fecha': 'FECHA', 'local': 'LOCAL', 'visitante': 'VISITANTE',
-                        'g_river': 'GOLES DE RIVER', 'g_rival': 'GOLES DEL RIVAL',
-                        'resultado_final': 'RESULTADO'
-                    })
-                    df_view['FECHA'] = df_view['FECHA'].dt.strftime('%d/%m/%Y %H:%M')
-
-                    # Función Semáforo
-                    def color_semaforo(val):
-                        if val == 'Ganó': return 'background-color: #d4edda; color: #155724; font-weight: bold;'
-                        if val == 'Empató': return 'background-color: #fff3cd; color: #856404; font-weight: bold;'
-                        if val == 'Perdió': return 'background-color: #f8d7da; color: #721c24; font-weight: bold;'
-                        return ''
-
-                    cols = ['FECHA', 'LOCAL', 'VISITANTE', 'GOLES DE RIVER', 'GOLES DEL RIVAL', 'RESULTADO']
-                    st.dataframe(df_view[cols].style.applymap(color_semaforo, subset=['RESULTADO']), 
-                                 use_container_width=True, hide_index=True)
-
-        with tab2:
-            st.header("Análisis de Rendimiento")
-            df_jugados = df[df['resultado_final'] != 'Pendiente'].copy()
-
-            if not df_jugados.empty:
-                # 1. PUNTOS POR COMPETICIÓN
-                st.subheader("Puntos Obtenidos por Torneo")
-                df_jugados['Puntos'] = df_jugados['resultado_final'].map({'Ganó': 3, 'Empató': 1, 'Perdió': 0})
-                puntos_comp = df_jugados.groupby('competicion')['Puntos'].sum().reset_index()
-                
-                c_met = st.columns(len(puntos_comp))
-                for i, row in puntos_comp.iterrows():
-                    c_met[i].metric(row['competicion'], f"{row['Puntos']} Pts")
-
-                st.divider()
-
-                # 2. GRÁFICO DE BARRAS POR COMPETICIÓN (NUEVO - Con tus colores)
-                st.subheader("Resultados Detallados por Competición")
-                df_barras = df_jugados.groupby(['competicion', 'resultado_final']).size().reset_index(name='Cantidad')
-                
-                fig_bar = px.bar(
-                    df_barras, 
-                    x='competicion', 
-                    y='Cantidad', 
-                    color='resultado_final',
-                    barmode='group',
-                    text_auto=True,
-                    color_discrete_map={
-                        'Ganó': '#b0d3b4',   # Tu verde pastel
-                        'Empató': '#e6d89f', # Tu amarillo pastel
-                        'Perdió': '#e0bfc2'  # Tu rojo pastel
-                    }
-                )
-                
-                fig_bar.update_layout(
-                    xaxis_title="", 
-                    yaxis_title="Cantidad de Partidos",
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)'
-                )
-                st.plotly_chart(fig_bar, use_container_width=True)
-
-                st.divider()
-
-                # 3. DISTRIBUCIÓN TOTAL Y KPIs
-                col_izq, col_der = st.columns(2)
-                
-                with col_izq:
-                    st.subheader("Distribución Total de Resultados 2026")
-                    fig_pie = px.pie(
-                        df_jugados, 
-                        names='resultado_final', 
-                        color='resultado_final',
-                        color_discrete_map={
-                            'Ganó': '#b0d3b4', 
-                            'Empató': '#e6d89f', 
-                            'Perdió': '#e0bfc2'
-                        },
-                        hole=0.4
-                    )
-                    st.plotly_chart(fig_pie, use_container_width=True)
-                
-                with col_der:
-                    st.subheader("Métricas de Eficacia")
-                    # Convertimos a numérico para evitar errores en el promedio
-                    df_jugados['g_river_num'] = pd.to_numeric(df_jugados['g_river'], errors='coerce')
-                    prom_g = df_jugados['g_river_num'].mean()
-                    vallas = len(df_jugados[df_jugados['g_rival'].astype(str) == '0'])
-                    
-                    st.metric("Promedio Goles de River", f"{prom_g:.2f}")
-                    st.metric("Partidos con Valla Invicta", vallas)
-            else:
-                st.warning("No hay datos de partidos jugados para generar estadísticas.")
-
-        with tab3:
-            st.header("Plantel 2026")
-            try:
-                df_players = pd.read_sql("SELECT * FROM plantilla_river", engine)
-                
-                if not df_players.empty:
-                    # Configuración de columnas
-                    st.dataframe(
-                        df_players[['dorsal', 'imagen', 'nombre', 'posicion', 'edad', 'bandera', 'altura', 'peso', 'goles', 'amarillas', 'rojas']],
-                        column_config={
-                            "imagen": st.column_config.ImageColumn("Foto", width="small"),
-                            "dorsal": st.column_config.TextColumn("N°", width="small"),
-                            "nombre": st.column_config.TextColumn("Jugador", width="medium"),
-                            "posicion": "Posición",
-                            "edad": "Edad",
-                            "bandera": st.column_config.ImageColumn("Nacionalidad", width="small"),
-                            "altura": "Altura (cm)",
-                            "peso": "Peso (kg)",
-                            "goles": "⚽ Goles",
-                            "amarillas": "🟨 Amarillas",
-                            "rojas": "🟥 Rojas"
-                        },
-                        hide_index=True,
-                        use_container_width=True,
-                        height=600
-                    )
-
-                    st.divider()
-                    
-                    # --- Dimensiones Físicas (Histogramas) ---
-                    st.subheader("📊 Físico y Edad")
-                    
-                    # Limpieza de datos visuales
-                    df_stats = df_players.copy()
-                    df_stats['edad'] = pd.to_numeric(df_stats['edad'], errors='coerce')
-                    df_stats['altura'] = pd.to_numeric(df_stats['altura'], errors='coerce')
-                    df_stats['peso'] = pd.to_numeric(df_stats['peso'], errors='coerce')
-                    
-                    c1, c2, c3 = st.columns(3)
-                    
-                    with c1:
-                        fig_edad = px.histogram(df_stats, x="edad", title="Edad", 
-                                              nbins=10, color_discrete_sequence=['#ED1C24'],
-                                              labels={'count':'Cantidad'})
-                        fig_edad.update_layout(bargap=0.2, yaxis_title="Cantidad")
-                        st.plotly_chart(fig_edad, use_container_width=True)
-                        
-                    with c2:
-                        fig_alt = px.histogram(df_stats, x="altura", title="Altura (cm)", 
-                                             nbins=10, color_discrete_sequence=['#333333'],
-                                             labels={'count':'Cantidad'})
-                        fig_alt.update_layout(bargap=0.2, yaxis_title="Cantidad")
-                        st.plotly_chart(fig_alt, use_container_width=True)
-
-                    with c3:
-                        fig_peso = px.histogram(df_stats, x="peso", title="Peso (kg)", 
-                                              nbins=10, color_discrete_sequence=['#B0B0B0'],
-                                              labels={'count':'Cantidad'})
-                        fig_peso.update_layout(bargap=0.2, yaxis_title="Cantidad")
-                        st.plotly_chart(fig_peso, use_container_width=True)
-
-                    st.divider()
-
-                    # --- Rendimiento (Donut Charts) ---
-                    st.subheader("⚽ Rendimiento: Goles y Tarjetas")
-                    
-                    # Convertir a numérico por seguridad
-                    df_stats['goles'] = pd.to_numeric(df_stats['goles'], errors='coerce').fillna(0)
-                    df_stats['amarillas'] = pd.to_numeric(df_stats['amarillas'], errors='coerce').fillna(0)
-                    df_stats['rojas'] = pd.to_numeric(df_stats['rojas'], errors='coerce').fillna(0)
-
-                    # Total por equipo
-                    total_goles = df_stats['goles'].sum()
-                    total_amarillas = df_stats['amarillas'].sum()
-                    total_rojas = df_stats['rojas'].sum()
-
-                    kpi1, kpi2, kpi3 = st.columns(3)
-                    kpi1.metric("Goles Totales", int(total_goles))
-                    kpi2.metric("Tarjetas Amarillas", int(total_amarillas))
-                    kpi3.metric("Tarjetas Rojas", int(total_rojas))
-
-                    # Gráficos de Torta/Anillo - Top Jugadores
-                    row_charts = st.columns(3)
-                    
-                    # Definir paleta River: Rojo, Negro, Gris Oscuro, Gris Claro, Rojo Oscuro
-                    palette_river = ['#ED1C24', '#333333', '#808080', '#B0B0B0', '#8B0000']
-
-                    # 1. Goles (Top goleadores)
-                    df_goles = df_stats[df_stats['goles'] > 0].sort_values('goles', ascending=False)
-                    if not df_goles.empty:
-                        fig_gol = px.pie(df_goles, values='goles', names='nombre', title='Distribución de Goles',
-                                         hole=0.4, color_discrete_sequence=palette_river)
-                        row_charts[0].plotly_chart(fig_gol, use_container_width=True)
-                    else:
-                        row_charts[0].info("Sin goles registrados")
-
-                    # 2. Amarillas
-                    df_am = df_stats[df_stats['amarillas'] > 0]
-                    if not df_am.empty:
-                        fig_am = px.pie(df_am, values='amarillas', names='nombre', title='Tarjetas Amarillas',
-                                        hole=0.4, color_discrete_sequence=['#FFD700', '#F0E68C', '#BDB76B'])
-                        row_charts[1].plotly_chart(fig_am, use_container_width=True)
-                    else:
-                        row_charts[1].info("Sin amarillas registradas")
-
-                    # 3. Rojas
-                    df_rj = df_stats[df_stats['rojas'] > 0]
-                    if not df_rj.empty:
-                        fig_rj = px.pie(df_rj, values='rojas', names='nombre', title='Tarjetas Rojas',
-                                        hole=0.4, color_discrete_sequence=['#FF0000', '#8B0000'])
-                        row_charts[2].plotly_chart(fig_rj, use_container_width=True)
-                    else:
-                        row_charts[2].info("Sin rojas registradas")
-
-                else:
-                    st.info("No hay datos de plantilla disponibles.")
-            
-            except Exception as e:
-                # Si la tabla no existe aún
-                st.error(f"Error cargando plantilla: {e}")
+        if seccion == SECCIONES[0]:
+            render_agenda(df)
+        elif seccion == SECCIONES[1]:
+            render_analisis(engine)
+        else:
+            render_plantel(engine)
 
     else:
         st.info("La base de datos está vacía. Ejecuta el ETL en la barra lateral.")
 
 except Exception as e:
-    st.error(f"Error en la aplicación: {e}")
\ No newline at end of file
+    st.error(f"Error en la aplicación: {e}")
+
+if env != "prod":
+    # Tiempo de la ejecución completa del script (los reruns de un fragmento no pasan por acá)
+    st.sidebar.caption(f"⏱️ Rerun: {(time.perf_counter() - inicio_rerun) * 1000:.0f} ms")
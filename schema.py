@@ -0,0 +1,67 @@
+import pandas as pd
+
+# Representación compacta en memoria de las tablas del proyecto. La usan las
+# transformaciones, la carga desde CSV y el dashboard al leer de la base:
+# - textos repetidos (competición, equipos, resultado, posición, banderas) como category,
+# - enteros chicos como Int16 nullable (NULL en lugar de float64 con NaN),
+# - fechas como datetime64.
+# Las columnas de texto casi únicas (nombre, imagen) quedan como object: como
+# category ocuparían más.
+
+PARTIDOS_SCHEMA = {
+    'id': 'Int32',
+    'fecha': 'datetime64[ns]',
+    'competicion': 'category',
+    'local': 'category',
+    'visitante': 'category',
+    'g_river': 'Int16',
+    'g_rival': 'Int16',
+    'resultado_final': 'category',
+    'horario': 'category',
+}
+
+PLANTILLA_SCHEMA = {
+    'id': 'Int32',
+    'dorsal': 'Int16',
+    'posicion': 'category',
+    'edad': 'Int16',
+    'nacimiento': 'datetime64[ns]',
+    'nacionalidad': 'category',
+    'bandera': 'category',
+    'altura': 'Int16',
+    'peso': 'Int16',
+    'goles': 'Int16',
+    'amarillas': 'Int16',
+    'rojas': 'Int16',
+}
+
+
+def _cast(serie, dtype):
+    if dtype == 'category':
+        return serie.astype('category')
+    if dtype.startswith('datetime64'):
+        return pd.to_datetime(serie, errors='coerce').astype(dtype)
+    # Enteros nullable: lo que no es numérico ('-', vacío) queda en NULL
+    return pd.to_numeric(serie, errors='coerce').round().astype(dtype)
+
+
+def apply_schema(df, schema):
+    """
+    Returns a copy of df with the columns in 'schema' cast to their compact
+    dtype. Columns missing from df are ignored; columns already in the
+    target dtype are left as they are.
+    """
+    columnas = {
+        col: _cast(df[col], dtype)
+        for col, dtype in schema.items()
+        if col in df.columns and df[col].dtype != dtype
+    }
+    return df.assign(**columnas) if columnas else df.copy()
+
+
+def compact_partidos(df):
+    return apply_schema(df, PARTIDOS_SCHEMA)
+
+
+def compact_plantilla(df):
+    return apply_schema(df, PLANTILLA_SCHEMA)
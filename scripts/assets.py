@@ -0,0 +1,192 @@
+import base64
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# Add parent directory to path to allow importing 'database' and 'scripts'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config
+
+# Caché local de imágenes (fotos, banderas y escudo): el ETL descarga cada URL
+# una sola vez, la reduce a miniatura y la guarda con el hash de su contenido
+# como nombre (dos URLs con la misma imagen comparten archivo). index.json
+# mapea URL → archivo; el dashboard lo lee para no depender de cdn.resfu.com.
+# El dashboard sólo usa la parte de lectura: http_client y Pillow se importan
+# al descargar.
+
+ASSETS_DIR = os.getenv("ASSETS_DIR", "data/assets")
+INDEX_PATH = os.path.join(ASSETS_DIR, "index.json")
+ASSETS_WORKERS = int(os.getenv("ASSETS_WORKERS", "4"))
+
+ESCUDO_URL = "https://cdn.resfu.com/img_data/equipos/593.png?size=120x"
+
+# Tamaño máximo (px) de la miniatura según la columna de plantilla_river
+TAMANIOS = {
+    'imagen': int(os.getenv("ASSETS_PHOTO_SIZE", "96")),
+    'bandera': int(os.getenv("ASSETS_FLAG_SIZE", "32")),
+}
+TAMANIO_ESCUDO = 150
+
+_index_lock = threading.Lock()
+_index = {"mtime": None, "urls": {}}
+
+
+def miniatura(contenido, tamanio):
+    """
+    Reduce la imagen para que su lado mayor no supere 'tamanio' y la
+    devuelve como PNG. Sin Pillow (o si no se puede decodificar) devuelve
+    los bytes originales.
+    """
+    try:
+        from PIL import Image
+    except ImportError:  # Sin Pillow se guardan las imágenes tal como llegan
+        return contenido
+    try:
+        with Image.open(io.BytesIO(contenido)) as img:
+            img.thumbnail((tamanio, tamanio))
+            if img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGBA')
+            salida = io.BytesIO()
+            img.save(salida, format='PNG', optimize=True)
+            return salida.getvalue()
+    except Exception:
+        return contenido
+
+
+_FORMATOS = {b'\x89PNG': 'png', b'\xff\xd8': 'jpeg', b'GIF8': 'gif', b'RIFF': 'webp'}
+
+
+def _extension(contenido):
+    return next((ext for firma, ext in _FORMATOS.items() if contenido.startswith(firma)), 'png')
+
+
+def _guardar(contenido):
+    # Nombre por contenido: si el archivo ya existe no se vuelve a escribir
+    nombre = f"{hashlib.sha256(contenido).hexdigest()[:24]}.{_extension(contenido)}"
+    path = os.path.join(ASSETS_DIR, nombre)
+    if not os.path.exists(path):
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(contenido)
+        os.replace(tmp, path)
+    return nombre
+
+
+def _leer_index():
+    # Se relee sólo si otro proceso (o el ETL en background) reescribió el archivo
+    try:
+        mtime = os.path.getmtime(INDEX_PATH)
+    except OSError:
+        return {}
+    with _index_lock:
+        if _index["mtime"] != mtime:
+            try:
+                with open(INDEX_PATH, encoding='utf-8') as f:
+                    _index["urls"] = json.load(f)
+            except (OSError, ValueError):
+                _index["urls"] = {}
+            _index["mtime"] = mtime
+        return _index["urls"]
+
+
+def _escribir_index(urls):
+    tmp = f"{INDEX_PATH}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(urls, f, indent=1, sort_keys=True)
+    os.replace(tmp, INDEX_PATH)
+
+
+def _descargar(url, tamanio):
+    from scripts.http_client import fetch
+    try:
+        return url, _guardar(miniatura(fetch(url).content, tamanio))
+    except Exception as e:
+        print(f"⚠️ No se pudo descargar {url}: {e}")
+        return url, None
+
+
+def cache_assets(pedidos, force=False):
+    """
+    Descarga y guarda las imágenes de 'pedidos' ({url: tamaño máximo}) que
+    todavía no están en la caché local (todas con force=True). Las URLs que
+    fallan quedan afuera del índice y se reintentan en la próxima corrida.
+    Devuelve la cantidad de imágenes nuevas.
+    """
+    os.makedirs(ASSETS_DIR, exist_ok=True)
+    urls = dict(_leer_index())
+    faltan = {url: t for url, t in pedidos.items()
+              if force or not (url in urls and os.path.exists(os.path.join(ASSETS_DIR, urls[url])))}
+    if not faltan:
+        return 0
+
+    # El rate limit por host de http_client sigue valiendo entre los workers
+    with ThreadPoolExecutor(max_workers=ASSETS_WORKERS) as pool:
+        nuevas = {url: nombre for url, nombre in pool.map(lambda item: _descargar(*item), faltan.items()) if nombre}
+
+    if nuevas:
+        urls.update(nuevas)
+        _escribir_index(urls)
+    print(f"✅ Imágenes: {len(nuevas)} nuevas de {len(faltan)} pendientes ({len(pedidos)} en total).")
+    return len(nuevas)
+
+
+def pedidos_plantilla(df):
+    """
+    {url: tamaño} sin repetidos para las fotos y banderas de la plantilla
+    (muchos jugadores comparten bandera) más el escudo del sidebar.
+    """
+    pedidos = {ESCUDO_URL: TAMANIO_ESCUDO}
+    for columna, tamanio in TAMANIOS.items():
+        if columna in df:
+            for url in df[columna].dropna().unique():
+                pedidos.setdefault(str(url), tamanio)
+    return pedidos
+
+
+def local_asset(url):
+    """
+    Path local de la imagen de 'url', o None si todavía no se descargó.
+    """
+    if not isinstance(url, str):
+        return None
+    nombre = _leer_index().get(url)
+    if nombre is None:
+        return None
+    path = os.path.join(ASSETS_DIR, nombre)
+    return path if os.path.exists(path) else None
+
+
+@lru_cache(maxsize=1024)
+def _data_uri(path):
+    with open(path, 'rb') as f:
+        contenido = f.read()
+    return f"data:image/{path.rsplit('.', 1)[-1]};base64,{base64.b64encode(contenido).decode('ascii')}"
+
+
+def asset_uri(url):
+    """
+    La imagen como data URI desde la caché local; si no está (o no se puede
+    leer) devuelve la URL original y el navegador la pide por su cuenta.
+    """
+    path = local_asset(url)
+    if path is None:
+        return url
+    try:
+        return _data_uri(path)
+    except OSError:
+        return url
+
+
+if __name__ == "__main__":
+    # Completa la caché con las imágenes de la plantilla que ya está en la base
+    import pandas as pd
+    from database import get_db_engine
+
+    df = pd.read_sql("SELECT imagen, bandera FROM plantilla_river", get_db_engine())
+    cache_assets(pedidos_plantilla(df), force='--force' in sys.argv)
@@ -0,0 +1,95 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+# Add parent directory to path to allow importing 'scripts'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.extract import fetch_partidos_html, parse_partidos, parse_target
+from scripts.extract_players import fetch_plantilla_html, parse_plantilla
+
+BACKFILL_DIR = 'data/backfill'
+
+# Por cada tipo de página: cómo descargarla y cómo parsearla
+FUENTES = {
+    'partidos': (fetch_partidos_html, parse_partidos),
+    'plantilla': (fetch_plantilla_html, parse_plantilla),
+}
+
+def _parse_pagina(tipo, html):
+    # Se ejecuta en el pool de procesos: BeautifulSoup es CPU-bound
+    if tipo == 'partidos':
+        # En equipos que no son River, el equipo de referencia se infiere de la página
+        return parse_partidos(html, equipo_nombre=None)
+    return parse_plantilla(html)
+
+def output_path(equipo, temporada, tipo):
+    return os.path.join(BACKFILL_DIR, equipo, str(temporada), f"{tipo}.json")
+
+def backfill(targets, tipos=('partidos', 'plantilla'), fetch_workers=4, parse_workers=None):
+    """
+    Descarga y parsea en paralelo las páginas de cada (equipo, temporada):
+    las descargas (I/O) van a un pool de threads y el parseo a un pool de
+    procesos, a medida que cada descarga termina. Cada resultado se guarda
+    particionado en data/backfill/<equipo>/<temporada>/<tipo>.json.
+    Devuelve un dict {(equipo, temporada, tipo): filas} (None si falló).
+    """
+    trabajos = [(equipo, temporada, tipo) for equipo, temporada in targets for tipo in tipos]
+    resultados = {}
+    inicio = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=fetch_workers) as io_pool, \
+            ProcessPoolExecutor(max_workers=parse_workers) as cpu_pool:
+        descargas = {
+            io_pool.submit(FUENTES[tipo][0], equipo, temporada): (equipo, temporada, tipo)
+            for equipo, temporada, tipo in trabajos
+        }
+
+        parseos = {}
+        for futuro in as_completed(descargas):
+            trabajo = descargas[futuro]
+            try:
+                html = futuro.result()
+            except Exception as e:
+                print(f"❌ Error descargando {trabajo[0]} {trabajo[1]} ({trabajo[2]}): {e}")
+                resultados[trabajo] = None
+                continue
+            parseos[cpu_pool.submit(_parse_pagina, trabajo[2], html)] = trabajo
+
+        for futuro in as_completed(parseos):
+            equipo, temporada, tipo = trabajo = parseos[futuro]
+            try:
+                registros = futuro.result()
+            except Exception as e:
+                print(f"❌ Error parseando {equipo} {temporada} ({tipo}): {e}")
+                resultados[trabajo] = None
+                continue
+
+            df = pd.DataFrame(registros or [])
+            path = output_path(equipo, temporada, tipo)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            df.to_json(path, orient='records', force_ascii=False)
+            resultados[trabajo] = len(df)
+            print(f"✅ {equipo} {temporada} ({tipo}): {len(df)} filas -> {path}")
+
+    total = sum(n for n in resultados.values() if n)
+    print(f"✅ Backfill finalizado: {len(trabajos)} páginas, {total} filas en {time.perf_counter() - inicio:.1f}s.")
+    return resultados
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill de partidos y plantillas por equipo y temporada")
+    parser.add_argument('targets', nargs='+', type=parse_target,
+                        help="Pares equipo:temporada, ej: ca-river-plate:2025 boca-juniors:2024")
+    parser.add_argument('--tipos', nargs='+', choices=sorted(FUENTES), default=['partidos', 'plantilla'])
+    parser.add_argument('--fetch-workers', type=int, default=4, help="Descargas concurrentes")
+    parser.add_argument('--parse-workers', type=int, default=None, help="Procesos de parseo (default: núcleos)")
+    args = parser.parse_args()
+
+    backfill(args.targets, tuple(args.tipos), args.fetch_workers, args.parse_workers)
+
+if __name__ == "__main__":
+    main()
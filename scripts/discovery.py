@@ -1,16 +1,20 @@
 import os
-import requests
-from dotenv import load_dotenv
+import sys
+
+# Add parent directory to path to allow importing 'scripts'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config
+from scripts.http_client import fetch
 
-load_dotenv()
 API_KEY = os.getenv("SOCCER_API_KEY")
 
 # 1. Primero buscamos el ID de Argentina
 def find_argentina_leagues():
     url = f"https://api.soccerdataapi.com/league/?auth_token={API_KEY}"
-    headers = {'Accept-Encoding': 'gzip', 'Content-Type': 'application/json'}
+    headers = {'Content-Type': 'application/json'}
     
-    response = requests.get(url, headers=headers)
+    response = fetch(url, headers=headers)
     leagues = response.json().get('results', [])
     
     print("--- Ligas en Argentina ---")
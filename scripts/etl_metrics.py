@@ -0,0 +1,234 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from sqlalchemy import text
+
+try:
+    import resource
+except ImportError:  # Windows: sin pico de memoria
+    resource = None
+
+# Add parent directory to path to allow importing 'database' and 'scripts'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import get_db_engine, get_read_engine
+
+# Instrumentación del ETL: run_etl() abre una corrida con etl_run() y cada etapa
+# (fetch, parse, transform, load) se mide con etapa(). Al terminar, la corrida se
+# guarda en la tabla etl_runs y en un archivo de métricas en formato Prometheus.
+# Fuera de una corrida (scripts sueltos, backfill) etapa() no mide nada.
+# El dashboard sólo lee la última corrida: http_client y migrate se importan
+# dentro de las funciones del ETL que los usan.
+
+RUNS_TABLE = "etl_runs"
+# Archivo para el textfile collector de node_exporter (vacío para desactivarlo)
+METRICS_FILE = os.getenv("ETL_METRICS_FILE", "data/etl_metrics.prom")
+# El sidebar consulta la última corrida como mucho cada ETL_RUNS_CHECK_TTL segundos
+_check_ttl = float(os.getenv("ETL_RUNS_CHECK_TTL", "10"))
+
+_local = threading.local()
+_ultima = {"run": None, "checked_at": 0.0}
+_ultima_lock = threading.Lock()
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss: KB en Linux, bytes en macOS
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(pico / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+@contextmanager
+def etapa(nombre, rows_in=None):
+    """
+    Mide una etapa de la corrida en curso: wall time, CPU del thread, filas
+    (rows_in / rows_out, que la etapa puede completar sobre el dict que
+    devuelve), bytes descargados y pico de memoria del proceso.
+    """
+    medida = {'stage': nombre, 'rows_in': rows_in, 'rows_out': None}
+    run = getattr(_local, 'run', None)
+    if run is None:
+        yield medida
+        return
+
+    from scripts.http_client import get_http_totals
+    previos = get_http_totals()
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield medida
+    except Exception as e:
+        medida['error'] = str(e)
+        raise
+    finally:
+        totales = get_http_totals()
+        medida.update({
+            'wall_seconds': round(time.perf_counter() - wall, 4),
+            'cpu_seconds': round(time.thread_time() - cpu, 4),
+            'bytes': totales['bytes'] - previos['bytes'],
+            'wire_bytes': totales['wire_bytes'] - previos['wire_bytes'],
+            'peak_rss_mb': _peak_rss_mb(),
+        })
+        run['stages'].append(medida)
+
+
+@contextmanager
+def etl_run(equipo=None, temporada=None):
+    """
+    Abre una corrida del ETL en el thread actual. El bloque puede marcar
+    run['status'] = 'skipped' y run['rows_loaded']; si lanza una excepción
+    la corrida queda como 'failed'. Al salir se persiste (save_run).
+    """
+    run = {
+        'started_at': datetime.now(timezone.utc).replace(tzinfo=None),
+        'status': 'ok',
+        'equipo': equipo,
+        'temporada': temporada,
+        'rows_loaded': 0,
+        'error': None,
+        'stages': [],
+    }
+    _local.run = run
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield run
+    except Exception as e:
+        run['status'] = 'failed'
+        run['error'] = str(e)
+        raise
+    finally:
+        _local.run = None
+        run['finished_at'] = datetime.now(timezone.utc).replace(tzinfo=None)
+        run['wall_seconds'] = round(time.perf_counter() - wall, 4)
+        run['cpu_seconds'] = round(time.thread_time() - cpu, 4)
+        run['bytes_fetched'] = sum(s.get('bytes', 0) for s in run['stages'])
+        run['peak_rss_mb'] = _peak_rss_mb()
+        with _ultima_lock:
+            _ultima.update(run=run, checked_at=time.monotonic())
+        save_run(run)
+        write_metrics_file(run)
+
+
+def save_run(run, engine=None):
+    """
+    Inserta la corrida en etl_runs. Un error acá no hace fallar el ETL.
+    """
+    from scripts.migrate import apply_migrations
+    engine = engine or get_db_engine()
+    columnas = ['started_at', 'finished_at', 'status', 'equipo', 'temporada', 'wall_seconds',
+                'cpu_seconds', 'rows_loaded', 'bytes_fetched', 'peak_rss_mb', 'error']
+    try:
+        with engine.begin() as conn:
+            apply_migrations(conn)
+            stages = "CAST(:stages AS JSONB)" if conn.dialect.name == 'postgresql' else ":stages"
+            conn.execute(
+                text(f"INSERT INTO {RUNS_TABLE} ({', '.join(columnas)}, stages) "
+                     f"VALUES ({', '.join(':' + c for c in columnas)}, {stages})"),
+                {**{c: run.get(c) for c in columnas}, 'stages': json.dumps(run['stages'])},
+            )
+    except Exception as e:
+        print(f"⚠️ No se pudo guardar la corrida en {RUNS_TABLE}: {e}")
+
+
+def get_last_run(engine=None):
+    """
+    Última corrida registrada (de este proceso o de etl_runs), o None.
+    """
+    now = time.monotonic()
+    with _ultima_lock:
+        if _ultima["run"] is not None and now - _ultima["checked_at"] < _check_ttl:
+            return _ultima["run"]
+
+    engine = engine or get_read_engine()
+    try:
+        with engine.connect() as conn:
+            fila = conn.execute(text(
+                f"SELECT * FROM {RUNS_TABLE} ORDER BY started_at DESC LIMIT 1"
+            )).mappings().first()
+    except Exception:
+        # La tabla todavía no existe (ninguna corrida instrumentada)
+        fila = None
+
+    run = None
+    if fila is not None:
+        run = dict(fila)
+        # SQLite devuelve texto en lugar de JSON / datetime
+        if isinstance(run['stages'], str):
+            run['stages'] = json.loads(run['stages'])
+        for campo in ('started_at', 'finished_at'):
+            if isinstance(run[campo], str):
+                run[campo] = datetime.fromisoformat(run[campo])
+    with _ultima_lock:
+        _ultima.update(run=run, checked_at=now)
+    return run
+
+
+def _etiquetas(**valores):
+    return '{' + ','.join(f'{k}="{v}"' for k, v in valores.items() if v is not None) + '}'
+
+
+def metrics_text(run):
+    """
+    Corrida en formato de texto de Prometheus: un gauge por métrica de
+    etapa (label stage) y los totales de la corrida.
+    """
+    if run is None:
+        return ""
+    lineas = []
+    base = {'equipo': run.get('equipo'), 'temporada': run.get('temporada')}
+
+    por_corrida = [
+        ('etl_run_wall_seconds', 'Wall time of the last ETL run', run.get('wall_seconds')),
+        ('etl_run_cpu_seconds', 'CPU time of the last ETL run', run.get('cpu_seconds')),
+        ('etl_run_rows_loaded', 'Rows loaded by the last ETL run', run.get('rows_loaded')),
+        ('etl_run_bytes_fetched', 'Bytes fetched by the last ETL run', run.get('bytes_fetched')),
+        ('etl_run_peak_rss_megabytes', 'Peak RSS of the ETL process', run.get('peak_rss_mb')),
+        ('etl_run_success', 'Whether the last ETL run did not fail', int(run.get('status') != 'failed')),
+        ('etl_run_skipped', 'Whether the last ETL run was skipped (no changes)', int(run.get('status') == 'skipped')),
+        ('etl_run_finished_timestamp_seconds', 'Unix time when the last ETL run finished',
+         run['finished_at'].replace(tzinfo=timezone.utc).timestamp() if isinstance(run.get('finished_at'), datetime) else None),
+    ]
+    for nombre, ayuda, valor in por_corrida:
+        if valor is None:
+            continue
+        lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} gauge", f"{nombre}{_etiquetas(**base)} {valor}"]
+
+    por_etapa = [
+        ('etl_stage_wall_seconds', 'Wall time per ETL stage', 'wall_seconds'),
+        ('etl_stage_cpu_seconds', 'CPU time per ETL stage', 'cpu_seconds'),
+        ('etl_stage_rows_in', 'Rows into each ETL stage', 'rows_in'),
+        ('etl_stage_rows_out', 'Rows out of each ETL stage', 'rows_out'),
+        ('etl_stage_bytes', 'Bytes fetched per ETL stage', 'bytes'),
+        ('etl_stage_peak_rss_megabytes', 'Process peak RSS at the end of each ETL stage', 'peak_rss_mb'),
+    ]
+    for nombre, ayuda, campo in por_etapa:
+        muestras = [(s['stage'], s.get(campo)) for s in run.get('stages', []) if s.get(campo) is not None]
+        if not muestras:
+            continue
+        lineas += [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} gauge"]
+        lineas += [f"{nombre}{_etiquetas(**base, stage=etapa)} {valor}" for etapa, valor in muestras]
+
+    return '\n'.join(lineas) + '\n'
+
+
+def write_metrics_file(run):
+    if not METRICS_FILE:
+        return
+    try:
+        os.makedirs(os.path.dirname(METRICS_FILE) or '.', exist_ok=True)
+        tmp = f"{METRICS_FILE}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(metrics_text(run))
+        os.replace(tmp, METRICS_FILE)
+    except OSError as e:
+        print(f"⚠️ No se pudo escribir {METRICS_FILE}: {e}")
+
+
+if __name__ == "__main__":
+    # Métricas de la última corrida registrada en la base
+    print(metrics_text(get_last_run()), end='')
@@ -1,101 +1,236 @@
+import argparse
 import pandas as pd
 from bs4 import BeautifulSoup
-import requests
 import os
+import sys
+from collections import Counter
 
-def extract_river_scraping():
-    print("🚀 Iniciando scraping de Resultados-Futbol...")
-    url = "https://www.resultados-futbol.com/equipo/partidos/ca-river-plate/2026"
-    
-    # User-Agent para evitar que la web nos bloquee
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+# Add parent directory to path to allow importing 'scripts'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.http_client import fetch
+from scripts.http_cache import fetch_cached
+from scripts.etl_metrics import etapa
+from scripts.html_parsing import PARSER_DEFAULT, clase, parse_html, primero, texto, validar_parser, xpath
+
+URL_BASE = "https://www.resultados-futbol.com"
+URL_PARTIDOS = URL_BASE + "/equipo/partidos/{equipo}/{temporada}"
+
+def parse_target(valor):
+    # "ca-river-plate:2025" -> ("ca-river-plate", 2025); type= de argparse en backfill.py y extract_detalles.py
+    equipo, _, temporada = valor.partition(':')
+    if not equipo or not temporada.isdigit():
+        raise argparse.ArgumentTypeError(f"Target inválido '{valor}', se espera equipo:temporada")
+    return equipo, int(temporada)
+
+def fetch_partidos_html(equipo="ca-river-plate", temporada=2026):
+    url = URL_PARTIDOS.format(equipo=equipo, temporada=temporada)
+    # Sesión compartida: keep-alive, gzip, timeouts y reintentos con backoff
+    return fetch(url).text
+
+def _inferir_equipo(bloques_liga):
+    # El equipo de la página es el que aparece en todos los partidos (local o visitante)
+    conteo = Counter()
+    for bloque in bloques_liga:
+        for tag in bloque.select('td.team-home, td.team-away'):
+            conteo[tag.get_text(strip=True)] += 1
+    return conteo.most_common(1)[0][0] if conteo else "River Plate"
+
+def parse_partidos(html, equipo_nombre="River Plate", parser=PARSER_DEFAULT):
+    """
+    Parsea la página de partidos de un equipo y devuelve una lista de dicts
+    (un partido por fila). Los goles del equipo de la página van en
+    'g_river' y los del rival en 'g_rival'. Con equipo_nombre=None se
+    infiere el equipo a partir de la propia página.
+    parser: 'lxml' (rápido, XPath solo sobre los bloques div.liga) o
+    'html.parser' (BeautifulSoup puro Python, implementación original).
+    """
+    validar_parser(parser)
+    if parser == 'lxml':
+        return _parse_partidos_lxml(html, equipo_nombre)
+
+    soup = BeautifulSoup(html, 'html.parser')
+
+    partidos = []
+    # Buscamos cada bloque de competición (Apertura, Copa Argentina, etc.)
+    bloques_liga = soup.select('div.liga')
+    if equipo_nombre is None:
+        equipo_nombre = _inferir_equipo(bloques_liga)
+
+    for bloque in bloques_liga:
+        # Extraer nombre de la competición desde el título del bloque
+        titulo_tag = bloque.select_one('div.title a')
+        if not titulo_tag:
+            continue
+        nombre_competicion = titulo_tag.get_text(strip=True)
+
+        # Buscamos todas las filas de partidos dentro de este bloque
+        filas = bloque.select('table.tablemarcador tbody tr')
+
+        for fila in filas:
+            try:
+                # 1. Extraer Fecha (ej: "24 Ene 26")
+                fecha_raw = fila.select_one('td.time').get_text(strip=True)
+                
+                # 2. Extraer Equipos
+                local = fila.select_one('td.team-home').get_text(strip=True)
+                visitante = fila.select_one('td.team-away').get_text(strip=True)
+                
+                # 3. Extraer Marcador / Resultado
+                marcador_tag = fila.select_one('div.marker_box')
+                if not marcador_tag:
+                    continue
+                marcador_raw = marcador_tag.get_text(strip=True)
+
+                partidos.append(_armar_partido(
+                    fecha_raw, nombre_competicion, local, visitante, marcador_raw, equipo_nombre
+                ))
+            except Exception:
+                continue
+
+    return partidos
+
+_XP_BLOQUES = xpath(f"//div[{clase('liga')}]")
+_XP_TITULO = xpath(f".//div[{clase('title')}]//a")
+_XP_FILAS = xpath(f".//table[{clase('tablemarcador')}]//tbody//tr")
+_XP_TIME = xpath(f".//td[{clase('time')}]")
+_XP_HOME = xpath(f".//td[{clase('team-home')}]")
+_XP_AWAY = xpath(f".//td[{clase('team-away')}]")
+_XP_MARCADOR = xpath(f".//div[{clase('marker_box')}]")
+_XP_EQUIPOS = xpath(f".//td[{clase('team-home')}] | .//td[{clase('team-away')}]")
+
+def _parse_partidos_lxml(html, equipo_nombre):
+    bloques_liga = _XP_BLOQUES(parse_html(html))
+    if equipo_nombre is None:
+        conteo = Counter(texto(td) for bloque in bloques_liga for td in _XP_EQUIPOS(bloque))
+        equipo_nombre = conteo.most_common(1)[0][0] if conteo else "River Plate"
+
+    partidos = []
+    for bloque in bloques_liga:
+        titulo_tag = primero(bloque, _XP_TITULO)
+        if titulo_tag is None:
+            continue
+        nombre_competicion = texto(titulo_tag)
+
+        for fila in _XP_FILAS(bloque):
+            try:
+                fecha_raw = texto(primero(fila, _XP_TIME))
+                local = texto(primero(fila, _XP_HOME))
+                visitante = texto(primero(fila, _XP_AWAY))
+
+                marcador_tag = primero(fila, _XP_MARCADOR)
+                if marcador_tag is None:
+                    continue
+
+                partidos.append(_armar_partido(
+                    fecha_raw, nombre_competicion, local, visitante, texto(marcador_tag), equipo_nombre
+                ))
+            except Exception:
+                continue
+
+    return partidos
+
+_XP_LINK = xpath("./ancestor::a[1]/@href")
+
+def parse_links_partidos(html, equipo_nombre="River Plate"):
+    """
+    URLs de la página de detalle de cada partido jugado, desde las mismas
+    filas de los bloques div.liga que parse_partidos. Cada dict trae además
+    los campos de parse_partidos para enlazarlo con partidos_river por su
+    clave natural. Los partidos pendientes no tienen detalle todavía.
+    """
+    links = []
+    for bloque in _XP_BLOQUES(parse_html(html)):
+        titulo_tag = primero(bloque, _XP_TITULO)
+        if titulo_tag is None:
+            continue
+        for fila in _XP_FILAS(bloque):
+            marcador_tag = primero(fila, _XP_MARCADOR)
+            href = primero(marcador_tag, _XP_LINK) if marcador_tag is not None else None
+            if not href:
+                continue
+            try:
+                partido = _armar_partido(
+                    texto(primero(fila, _XP_TIME)), texto(titulo_tag), texto(primero(fila, _XP_HOME)),
+                    texto(primero(fila, _XP_AWAY)), texto(marcador_tag), equipo_nombre,
+                )
+            except Exception:
+                continue
+            if partido['resultado_final'] != 'Pendiente':
+                links.append({**partido, 'url': href if href.startswith('http') else URL_BASE + href})
+    return links
+
+def _armar_partido(fecha_raw, nombre_competicion, local, visitante, marcador_raw, equipo_nombre):
+    g_river = None
+    g_rival = None
+    horario = "00:00" # Por defecto
+    resultado = "Pendiente"
+
+    # Si el marcador tiene un guion, es un resultado final (ej: "1-0")
+    if '-' in marcador_raw:
+        goles = marcador_raw.split('-')
+        g1 = goles[0].strip()
+        g2 = goles[1].strip()
+        
+        if equipo_nombre in local:
+            g_river, g_rival = g1, g2
+        else:
+            g_rival, g_river = g1, g2
+        
+        # Determinar si ganó, perdió o empató
+        if g_river.isdigit() and g_rival.isdigit():
+            if int(g_river) > int(g_rival): 
+                resultado = "Ganó"
+            elif int(g_river) < int(g_rival): 
+                resultado = "Perdió"
+            else: 
+                resultado = "Empató"
+    else:
+        # Si no hay guion, el marcador suele ser la hora (ej: "21:00")
+        if ':' in marcador_raw:
+            horario = marcador_raw.strip()
+    return {
+        "fecha": fecha_raw,
+        "competicion": nombre_competicion,
+        "local": local,
+        "visitante": visitante,
+        "g_river": g_river,
+        "g_rival": g_rival,
+        "resultado_final": resultado,
+        "horario": horario  # <--- ESTA LÍNEA ES CLAVE
     }
+
+RAW_PATH = 'data/river_raw_data.json'
+
+def extract_river_scraping(equipo="ca-river-plate", temporada=2026, solo_si_cambio=False, checkpoint=False):
+    """
+    Scrapea la página de partidos (con caché condicional en disco) y devuelve
+    el DataFrame crudo. Con checkpoint=True además lo guarda en
+    data/river_raw_data.json. Con solo_si_cambio=True devuelve None sin
+    parsear si la página no cambió desde la última carga procesada.
+    """
+    print("🚀 Iniciando scraping de Resultados-Futbol...")
     
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        partidos = []
-        # Buscamos cada bloque de competición (Apertura, Copa Argentina, etc.)
-        bloques_liga = soup.select('div.liga')
-
-        for bloque in bloques_liga:
-            # Extraer nombre de la competición desde el título del bloque
-            titulo_tag = bloque.select_one('div.title a')
-            if not titulo_tag:
-                continue
-            nombre_competicion = titulo_tag.get_text(strip=True)
-
-            # Buscamos todas las filas de partidos dentro de este bloque
-            filas = bloque.select('table.tablemarcador tbody tr')
-
-            for fila in filas:
-                try:
-                    # 1. Extraer Fecha (ej: "24 Ene 26")
-                    fecha_raw = fila.select_one('td.time').get_text(strip=True)
-                    
-                    # 2. Extraer Equipos
-                    local = fila.select_one('td.team-home').get_text(strip=True)
-                    visitante = fila.select_one('td.team-away').get_text(strip=True)
-                    
-                    # 3. Extraer Marcador / Resultado
-                    marcador_tag = fila.select_one('div.marker_box')
-                    if not marcador_tag:
-                        continue
-                    marcador_raw = marcador_tag.get_text(strip=True)
-
-                    g_river = None
-                    g_rival = None
-                    horario = "00:00" # Por defecto
-                    resultado = "Pendiente"
-
-                    # Si el marcador tiene un guion, es un resultado final (ej: "1-0")
-                    if '-' in marcador_raw:
-                        goles = marcador_raw.split('-')
-                        g1 = goles[0].strip()
-                        g2 = goles[1].strip()
-                        
-                        if "River Plate" in local:
-                            g_river, g_rival = g1, g2
-                        else:
-                            g_rival, g_river = g1, g2
-                        
-                        # Determinar si ganó, perdió o empató
-                        if g_river.isdigit() and g_rival.isdigit():
-                            if int(g_river) > int(g_rival): 
-                                resultado = "Ganó"
-                            elif int(g_river) < int(g_rival): 
-                                resultado = "Perdió"
-                            else: 
-                                resultado = "Empató"
-                    else:
-                        # Si no hay guion, el marcador suele ser la hora (ej: "21:00")
-                        if ':' in marcador_raw:
-                            horario = marcador_raw.strip()
-                    partidos.append({
-                        "fecha": fecha_raw,
-                        "competicion": nombre_competicion,
-                        "local": local,
-                        "visitante": visitante,
-                        "g_river": g_river,
-                        "g_rival": g_rival,
-                        "resultado_final": resultado,
-                        "horario": horario  # <--- ESTA LÍNEA ES CLAVE
-                    })
-                except Exception:
-                    continue
+        with etapa('fetch partidos'):
+            html, cambio = fetch_cached(URL_PARTIDOS.format(equipo=equipo, temporada=temporada))
+        if solo_si_cambio and not cambio:
+            print("⏭️ La página de partidos no cambió, se omite el parseo.")
+            return None
+
+        with etapa('parse partidos') as medida:
+            partidos = parse_partidos(html)
+            medida['rows_out'] = len(partidos or [])
 
         # Crear DataFrame
         df_final = pd.DataFrame(partidos)
         
-        # --- PASO CRUCIAL PARA EL TRANSFORM ---
-        # Guardamos el archivo JSON que el script de transform.py va a buscar
-        os.makedirs('data', exist_ok=True)
-        df_final.to_json('data/river_raw_data.json', orient='records', force_ascii=False)
+        # Checkpoint opcional: el JSON que transform.py lee cuando se corre por separado
+        if checkpoint:
+            os.makedirs('data', exist_ok=True)
+            df_final.to_json(RAW_PATH, orient='records', force_ascii=False)
         
-        print(f"✅ Scraping finalizado. {len(df_final)} partidos guardados en JSON.")
+        print(f"✅ Scraping finalizado. {len(df_final)} partidos extraídos.")
         return df_final
 
     except Exception as e:
@@ -103,4 +238,4 @@ def extract_river_scraping():
         return pd.DataFrame()
 
 if __name__ == "__main__":
-    extract_river_scraping()
\ No newline at end of file
+    extract_river_scraping(checkpoint=True)
\ No newline at end of file
@@ -0,0 +1,335 @@
+import argparse
+import json
+import os
+import queue
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+from sqlalchemy import inspect, text
+
+# Add parent directory to path to allow importing 'database' and 'scripts'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import get_db_engine
+from scripts.etl_metrics import etapa
+from scripts.extract import URL_PARTIDOS, parse_links_partidos, parse_target
+from scripts.html_parsing import clase, parse_html, primero, texto, xpath
+from scripts.http_cache import fetch_cached
+from scripts.http_client import fetch
+from scripts.load import bulk_insert
+from scripts.migrate import apply_migrations
+from scripts.transform import procesar_fechas
+
+# Crawler del detalle de cada partido (alineaciones, goles y tarjetas): junta las
+# URLs de las filas div.liga de las páginas de partidos, las descarga con una cola
+# de trabajo sin repetidos y un número fijo de threads, y agrega cada partido
+# terminado a un checkpoint JSONL. Una corrida interrumpida retoma desde ahí sin
+# volver a pedir los partidos ya descargados. Las tablas de detalle se enlazan con
+# partidos_river por la clave del partido, no por su id (ver la migración 003).
+
+CRAWLER_DIR = os.getenv("CRAWLER_DIR", "data/crawler")
+CHECKPOINT_PATH = os.path.join(CRAWLER_DIR, "detalles.jsonl")
+CRAWLER_WORKERS = int(os.getenv("CRAWLER_WORKERS", "4"))
+
+# Se borran en este orden al reemplazar el detalle de un partido
+TABLAS_DETALLE = ('partidos_eventos', 'partidos_alineaciones', 'partidos_detalle')
+# Clave con la que las tablas de detalle se enlazan a partidos_river ('fecha' = día del partido)
+CLAVE_PARTIDO = ['fecha', 'competicion', 'local', 'visitante']
+
+# Página de un partido: eventos (goles / tarjetas) y alineaciones de cada lado
+_XP_EVENTOS = xpath(f"//div[@id='eventos']//div[{clase('evento')}]")
+_XP_MINUTO = xpath(f".//span[{clase('minuto')}]")
+_XP_JUGADOR = xpath(f".//a[{clase('jugador')}]")
+_XP_EQUIPOS = xpath(f"//div[@id='alineaciones']//div[{clase('equipo')}]")
+_XP_TITULARES = xpath(f".//ul[{clase('titulares')}]/li")
+_XP_SUPLENTES = xpath(f".//ul[{clase('suplentes')}]/li")
+_XP_DORSAL = xpath(f".//span[{clase('dorsal')}]")
+
+# Clase del evento -> tipo, en orden de prioridad (un gol de penal tiene 'gol' y 'penalti')
+TIPOS_EVENTO = [
+    ('penalti', 'gol_penal'), ('propia', 'gol_en_contra'), ('gol', 'gol'),
+    ('dobleamarilla', 'doble_amarilla'), ('amarilla', 'amarilla'), ('roja', 'roja'),
+]
+_PATRON_MINUTO = re.compile(r"(\d+)(?:\s*\+\s*(\d+))?")
+
+
+def _lado(el):
+    clases = set(el.get('class', '').split())
+    return clases, 'local' if 'local' in clases else 'visitante' if 'visitante' in clases else None
+
+
+def _minuto(valor):
+    # "45+2'" -> (45, 2); "77'" -> (77, None)
+    encontrado = _PATRON_MINUTO.search(valor or '')
+    if not encontrado:
+        return None, None
+    minuto, adicional = encontrado.groups()
+    return int(minuto), int(adicional) if adicional else None
+
+
+def parse_detalle(html, local=None, visitante=None):
+    """
+    Parsea la página de un partido. Devuelve {'eventos': [...], 'alineaciones':
+    [...]}: goles y tarjetas con equipo, jugador, minuto (y minutos
+    adicionados), y los titulares / suplentes de cada equipo con su dorsal.
+    'local' y 'visitante' son los nombres de la fila del fixture.
+    """
+    doc = parse_html(html)
+    equipos = {'local': local, 'visitante': visitante}
+
+    eventos = []
+    for evento in _XP_EVENTOS(doc):
+        clases, lado = _lado(evento)
+        tipo = next((t for c, t in TIPOS_EVENTO if c in clases), None)
+        if tipo is None:
+            continue
+        minuto_tag, jugador_tag = primero(evento, _XP_MINUTO), primero(evento, _XP_JUGADOR)
+        minuto, adicional = _minuto(texto(minuto_tag) if minuto_tag is not None else None)
+        eventos.append({
+            'tipo': tipo,
+            'equipo': equipos.get(lado),
+            'jugador': texto(jugador_tag) if jugador_tag is not None else None,
+            'minuto': minuto,
+            'adicional': adicional,
+        })
+
+    alineaciones = []
+    for bloque in _XP_EQUIPOS(doc):
+        _, lado = _lado(bloque)
+        for titular, consulta in ((True, _XP_TITULARES), (False, _XP_SUPLENTES)):
+            for fila in consulta(bloque):
+                jugador_tag = primero(fila, _XP_JUGADOR)
+                if jugador_tag is None:
+                    continue
+                dorsal_tag = primero(fila, _XP_DORSAL)
+                dorsal = texto(dorsal_tag) if dorsal_tag is not None else ''
+                alineaciones.append({
+                    'equipo': equipos.get(lado),
+                    'jugador': texto(jugador_tag),
+                    'dorsal': int(dorsal) if dorsal.isdigit() else None,
+                    'titular': titular,
+                })
+
+    return {'eventos': eventos, 'alineaciones': alineaciones}
+
+
+def leer_checkpoint(path=CHECKPOINT_PATH):
+    """
+    {url: registro} de los partidos ya descargados. Una línea cortada (la
+    corrida se interrumpió mientras escribía) se descarta.
+    """
+    registros = {}
+    if not os.path.exists(path):
+        return registros
+    with open(path, encoding='utf-8') as f:
+        for linea in f:
+            try:
+                registro = json.loads(linea)
+            except ValueError:
+                continue
+            registros[registro['url']] = registro
+    return registros
+
+
+def _abrir_checkpoint(path):
+    # Append binario; si la última línea quedó cortada se cierra antes de seguir escribiendo
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    salida = open(path, 'ab+')
+    salida.seek(0, os.SEEK_END)
+    if salida.tell() > 0:
+        salida.seek(-1, os.SEEK_END)
+        if salida.read(1) != b'\n':
+            salida.write(b'\n')
+    return salida
+
+
+def crawl(links, workers=CRAWLER_WORKERS, path=CHECKPOINT_PATH, refetch=False):
+    """
+    Descarga y parsea la página de detalle de cada partido de 'links' (ver
+    parse_links_partidos) con una cola de trabajo y 'workers' threads. Cada
+    URL se encola una sola vez (el mismo partido aparece en la página de los
+    dos equipos) y las que ya están en el checkpoint no se piden de nuevo,
+    salvo con refetch=True. Cada partido se agrega al checkpoint apenas se
+    parsea. El rate limit por host de http_client vale entre los threads.
+    Devuelve (descargados, fallidos).
+    """
+    hechos = set() if refetch else set(leer_checkpoint(path))
+    cola = queue.Queue()
+    encolados = set()
+    for link in links:
+        if link['url'] not in hechos and link['url'] not in encolados:
+            encolados.add(link['url'])
+            cola.put(link)
+
+    if not encolados:
+        print(f"⏭️ Detalle de partidos al día ({len(hechos)} en el checkpoint).")
+        return 0, 0
+
+    print(f"🚀 Descargando el detalle de {len(encolados)} partidos con {workers} workers "
+          f"({len(hechos)} ya estaban en el checkpoint)...")
+    lock = threading.Lock()
+    conteo = {'ok': 0, 'error': 0}
+
+    with _abrir_checkpoint(path) as salida:
+        def trabajar():
+            while True:
+                try:
+                    link = cola.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    detalle = parse_detalle(fetch(link['url']).text, link['local'], link['visitante'])
+                    registro = {
+                        **{k: link[k] for k in ('url', 'fecha', 'competicion', 'local', 'visitante', 'horario')},
+                        'fetched_at': datetime.now(timezone.utc).replace(tzinfo=None).isoformat(),
+                        **detalle,
+                    }
+                    linea = (json.dumps(registro, ensure_ascii=False) + '\n').encode('utf-8')
+                    with lock:
+                        salida.write(linea)
+                        salida.flush()
+                        conteo['ok'] += 1
+                        if conteo['ok'] % 50 == 0:
+                            print(f"📥 {conteo['ok']}/{len(encolados)} partidos descargados...")
+                except Exception as e:
+                    # No se guarda: se reintenta en la próxima corrida
+                    print(f"⚠️ Error con {link['url']}: {e}")
+                    with lock:
+                        conteo['error'] += 1
+
+        hilos = [threading.Thread(target=trabajar, name=f"crawler-{i}", daemon=True)
+                 for i in range(min(workers, len(encolados)))]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+
+    print(f"✅ Detalle descargado: {conteo['ok']} partidos, {conteo['error']} con error.")
+    return conteo['ok'], conteo['error']
+
+
+def _filas(registros, por_url, campo, columnas):
+    filas = [{**por_url[r['url']], **fila} for r in registros if r['url'] in por_url for fila in r.get(campo, [])]
+    return pd.DataFrame(filas, columns=[*CLAVE_PARTIDO, *columnas])
+
+
+def sin_cargar(registros, engine=None):
+    """
+    Los registros del checkpoint que todavía no están en partidos_detalle, o
+    que se descargaron de nuevo (--refetch) después de la última carga. Así
+    cada corrida escribe sólo lo nuevo y no todo el checkpoint.
+    """
+    engine = engine or get_db_engine()
+    with engine.connect() as conn:
+        if not inspect(conn).has_table('partidos_detalle'):
+            return list(registros)
+        cargados = pd.read_sql(text("SELECT url, fetched_at FROM partidos_detalle"), conn)
+    cargados = dict(zip(cargados['url'], pd.to_datetime(cargados['fetched_at'])))
+    return [r for r in registros
+            if r['url'] not in cargados or pd.Timestamp(r['fetched_at']) > cargados[r['url']]]
+
+
+def load_detalles(registros, engine=None):
+    """
+    Carga los registros del checkpoint en partidos_detalle,
+    partidos_alineaciones y partidos_eventos con la clave del partido (día,
+    competicion, local, visitante), la misma que enlaza con partidos_river.
+    El detalle de un partido que ya estaba cargado se reemplaza.
+    Devuelve los conteos {'partidos', 'alineaciones', 'eventos', 'sin_enlazar'}:
+    'sin_enlazar' son los partidos que todavía no están en partidos_river
+    (se enlazan solos cuando se cargue esa temporada).
+    """
+    conteos = {'partidos': 0, 'alineaciones': 0, 'eventos': 0, 'sin_enlazar': 0}
+    if not registros:
+        print("⏭️ Sin detalle nuevo para cargar.")
+        return conteos
+
+    detalle = pd.DataFrame([{k: r[k] for k in ('url', 'fecha', 'competicion', 'local', 'visitante',
+                                               'horario', 'fetched_at')} for r in registros])
+    # Misma conversión de fecha que transform_data, reducida al día (ver DAY_KEYS en load.py)
+    detalle['fecha'] = procesar_fechas(detalle).dt.date
+    detalle['fetched_at'] = pd.to_datetime(detalle['fetched_at'])
+    detalle = detalle.drop_duplicates(CLAVE_PARTIDO, keep='last')[[*CLAVE_PARTIDO, 'url', 'fetched_at']]
+    por_url = {fila['url']: {c: fila[c] for c in CLAVE_PARTIDO} for fila in detalle.to_dict('records')}
+
+    alineaciones = _filas(registros, por_url, 'alineaciones', ['equipo', 'jugador', 'dorsal', 'titular'])
+    eventos = _filas(registros, por_url, 'eventos', ['tipo', 'equipo', 'jugador', 'minuto', 'adicional'])
+    condicion = ' AND '.join(f"{c} = :{c}" for c in CLAVE_PARTIDO)
+
+    engine = engine or get_db_engine()
+    with engine.begin() as conn:
+        apply_migrations(conn)
+        claves = list(por_url.values())
+        for tabla in TABLAS_DETALLE:
+            conn.execute(text(f"DELETE FROM {tabla} WHERE {condicion}"), claves)
+        bulk_insert(detalle, 'partidos_detalle', conn)
+        bulk_insert(alineaciones.astype({'dorsal': 'Int16'}), 'partidos_alineaciones', conn)
+        bulk_insert(eventos.astype({'minuto': 'Int16', 'adicional': 'Int16'}), 'partidos_eventos', conn)
+
+        partidos = pd.read_sql(text("SELECT DISTINCT DATE(fecha) AS fecha, competicion, local, visitante "
+                                    "FROM partidos_river"), conn)
+    # DATE() devuelve date en PostgreSQL y texto 'YYYY-MM-DD' en SQLite
+    partidos['fecha'] = pd.to_datetime(partidos['fecha']).dt.date
+    enlazados = detalle.merge(partidos, on=CLAVE_PARTIDO)
+
+    conteos.update(partidos=len(detalle), alineaciones=len(alineaciones), eventos=len(eventos),
+                   sin_enlazar=len(detalle) - len(enlazados))
+    print(f"✅ Detalle cargado: {conteos['partidos']} partidos, {conteos['alineaciones']} jugadores en "
+          f"alineaciones, {conteos['eventos']} eventos ({conteos['sin_enlazar']} todavía sin partido en partidos_river).")
+    return conteos
+
+
+def crawl_temporadas(targets, workers=CRAWLER_WORKERS, refetch=False, cargar=True, path=CHECKPOINT_PATH):
+    """
+    Junta las URLs de detalle de las páginas de partidos de cada (equipo,
+    temporada), descarga las que faltan (crawl) y, con cargar=True, carga a
+    la base los partidos del checkpoint que todavía no están (load_detalles).
+    """
+    inicio = time.perf_counter()
+    links = []
+    with etapa('links detalles') as medida:
+        for equipo, temporada in targets:
+            try:
+                html, _ = fetch_cached(URL_PARTIDOS.format(equipo=equipo, temporada=temporada))
+            except Exception as e:
+                print(f"❌ Error descargando los partidos de {equipo} {temporada}: {e}")
+                continue
+            links += parse_links_partidos(html)
+        medida['rows_out'] = len(links)
+
+    with etapa('crawl detalles', rows_in=len(links)) as medida:
+        medida['rows_out'], _ = crawl(links, workers, path, refetch)
+
+    conteos = None
+    if cargar:
+        with etapa('load detalles') as medida:
+            registros = sin_cargar(leer_checkpoint(path).values())
+            medida['rows_in'] = len(registros)
+            conteos = load_detalles(registros)
+            medida['rows_out'] = conteos['partidos']
+
+    print(f"✅ Crawler de detalle terminado en {time.perf_counter() - inicio:.1f}s.")
+    return conteos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawler del detalle de partidos (alineaciones, goles y tarjetas)")
+    parser.add_argument('targets', nargs='*', type=parse_target, default=[('ca-river-plate', 2026)],
+                        help="Pares equipo:temporada, ej: ca-river-plate:2025 (default: ca-river-plate:2026)")
+    parser.add_argument('--workers', type=int, default=CRAWLER_WORKERS, help="Descargas concurrentes")
+    parser.add_argument('--refetch', action='store_true', help="Volver a descargar los partidos del checkpoint")
+    parser.add_argument('--sin-carga', action='store_true', help="Sólo descargar, sin cargar a la base")
+    args = parser.parse_args()
+
+    try:
+        crawl_temporadas(args.targets, args.workers, args.refetch, cargar=not args.sin_carga)
+    except KeyboardInterrupt:
+        print("⏹️ Crawler interrumpido: la próxima corrida retoma desde el checkpoint.")
+
+
+if __name__ == "__main__":
+    main()
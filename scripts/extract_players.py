@@ -1,107 +1,211 @@
 
 import pandas as pd
 from bs4 import BeautifulSoup
-import requests
 import os
+import sys
 
-def extract_river_players():
-    print("🚀 Iniciando scraping de Plantilla...")
-    url = "https://www.resultados-futbol.com/equipo/plantilla/ca-river-plate/2026"
+# Add parent directory to path to allow importing 'scripts'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.http_client import fetch
+from scripts.http_cache import fetch_cached
+from scripts.etl_metrics import etapa
+from scripts.html_parsing import PARSER_DEFAULT, clase, parse_html, primero, texto, validar_parser, xpath
+
+URL_PLANTILLA = "https://www.resultados-futbol.com/equipo/plantilla/{equipo}/{temporada}"
+
+def fetch_plantilla_html(equipo="ca-river-plate", temporada=2026):
+    url = URL_PLANTILLA.format(equipo=equipo, temporada=temporada)
+    # Sesión compartida: keep-alive, gzip, timeouts y reintentos con backoff
+    return fetch(url).text
+
+FLAG_DEFAULT = "https://cdn.resfu.com/media/img/flags/st3/small/ar.png"
+
+def parse_plantilla(html, parser=PARSER_DEFAULT):
+    """
+    Parsea la página de plantilla y devuelve una lista de dicts (un jugador
+    por fila), o None si la página no tiene la tabla de plantilla.
+    parser: 'lxml' (rápido, XPath solo sobre table.sdata_table) o
+    'html.parser' (BeautifulSoup puro Python, implementación original).
+    """
+    validar_parser(parser)
+    if parser == 'lxml':
+        return _parse_plantilla_lxml(html)
+
+    soup = BeautifulSoup(html, 'html.parser')
     
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    }
+    table = soup.select_one('table.sdata_table')
+    if not table:
+        return None
+
+    players = []
+    current_position = "Desconocido"
+
+    rows = table.select('tbody tr')
+
+    for row in rows:
+        # Check if it's a header row for position (e.g. "Portero", "Defensa")
+        header_th = row.select_one('th.axis')
+        if header_th:
+            current_position = header_th.get_text(strip=True)
+            continue
+
+        # Check if it's a player row
+        if not row.has_attr('itemprop'):
+            continue
+
+        try:
+            # 1. Number / Dorsal
+            dorsal_tag = row.select_one('td.num')
+            dorsal = dorsal_tag.get_text(strip=True) if dorsal_tag else "-"
+
+            # 2. Name
+            name_tag = row.select_one('th.sdata_player_name span[itemprop="name"]')
+            name = name_tag.get_text(strip=True) if name_tag else "Desconocido"
+
+            # 3. Image
+            img_tag = row.select_one('td.sdata_player_img img')
+            img_url = img_tag['src'] if img_tag else None
+
+            # 4. Age & Birthdate
+            age_tag = row.select_one('td.birthdate')
+            age = age_tag.get_text(strip=True) if age_tag else "-"
+            birthdate = age_tag['content'] if age_tag and 'content' in age_tag.attrs else None
+
+            # 5. Nationality & Flag
+            nat_tag = row.select_one('td.ori span[itemprop="name"]')
+            nationality = nat_tag['content'] if nat_tag and 'content' in nat_tag.attrs else "ar"
+
+            # Flag scraping
+            flag_tag = row.select_one('td.ori img')
+            flag_url = flag_tag['src'] if flag_tag else FLAG_DEFAULT
+
+            # 6. Stats (Height, Weight, Goals, Cards)
+            # The columns after nationality are: Height, Weight, Goals, Yellow, Red
+            # We iterate data cells
+            dat_cells = row.select('td.dat')
+            height = dat_cells[0].get_text(strip=True) if len(dat_cells) > 0 else "-"
+            weight = dat_cells[1].get_text(strip=True) if len(dat_cells) > 1 else "-"
+            goals = dat_cells[2].get_text(strip=True) if len(dat_cells) > 2 else "0"
+            # Corregido: Index 3 es Rojas, Index 4 es Amarillas (según reporte de usuario)
+            red_cards = dat_cells[3].get_text(strip=True) if len(dat_cells) > 3 else "0"
+            yellow_cards = dat_cells[4].get_text(strip=True) if len(dat_cells) > 4 else "0"
+
+            players.append({
+                "dorsal": dorsal,
+                "nombre": name,
+                "posicion": current_position,
+                "edad": age,
+                "nacimiento": birthdate,
+                "nacionalidad": nationality,
+                "bandera": flag_url,
+                "altura": height,
+                "peso": weight,
+                "goles": goals,
+                "amarillas": yellow_cards,
+                "rojas": red_cards,
+                "imagen": img_url
+            })
+
+        except Exception as e:
+            print(f"⚠️ Error procesando fila de jugador: {e}")
+            continue
+
+    return players
+
+_XP_TABLA = xpath(f"//table[{clase('sdata_table')}]")
+_XP_FILAS = xpath(".//tbody//tr")
+_XP_AXIS = xpath(f".//th[{clase('axis')}]")
+_XP_NUM = xpath(f".//td[{clase('num')}]")
+_XP_NOMBRE = xpath(f".//th[{clase('sdata_player_name')}]//span[@itemprop='name']")
+_XP_IMG = xpath(f".//td[{clase('sdata_player_img')}]//img")
+_XP_NACIMIENTO = xpath(f".//td[{clase('birthdate')}]")
+_XP_NACIONALIDAD = xpath(f".//td[{clase('ori')}]//span[@itemprop='name']")
+_XP_BANDERA = xpath(f".//td[{clase('ori')}]//img")
+_XP_DATOS = xpath(f".//td[{clase('dat')}]")
+
+def _parse_plantilla_lxml(html):
+    table = primero(parse_html(html), _XP_TABLA)
+    if table is None:
+        return None
+
+    players = []
+    current_position = "Desconocido"
+
+    for row in _XP_FILAS(table):
+        header_th = primero(row, _XP_AXIS)
+        if header_th is not None:
+            current_position = texto(header_th)
+            continue
+
+        if 'itemprop' not in row.attrib:
+            continue
+
+        try:
+            dorsal_tag = primero(row, _XP_NUM)
+            name_tag = primero(row, _XP_NOMBRE)
+            img_tag = primero(row, _XP_IMG)
+            age_tag = primero(row, _XP_NACIMIENTO)
+            nat_tag = primero(row, _XP_NACIONALIDAD)
+            flag_tag = primero(row, _XP_BANDERA)
+            datos = [texto(td) for td in _XP_DATOS(row)]
+
+            players.append({
+                "dorsal": texto(dorsal_tag) if dorsal_tag is not None else "-",
+                "nombre": texto(name_tag) if name_tag is not None else "Desconocido",
+                "posicion": current_position,
+                "edad": texto(age_tag) if age_tag is not None else "-",
+                "nacimiento": age_tag.attrib.get('content') if age_tag is not None else None,
+                "nacionalidad": nat_tag.attrib.get('content', "ar") if nat_tag is not None else "ar",
+                "bandera": flag_tag.attrib['src'] if flag_tag is not None else FLAG_DEFAULT,
+                "altura": datos[0] if len(datos) > 0 else "-",
+                "peso": datos[1] if len(datos) > 1 else "-",
+                "goles": datos[2] if len(datos) > 2 else "0",
+                # Index 3 es Rojas, Index 4 es Amarillas (igual que el parser original)
+                "amarillas": datos[4] if len(datos) > 4 else "0",
+                "rojas": datos[3] if len(datos) > 3 else "0",
+                "imagen": img_tag.attrib['src'] if img_tag is not None else None
+            })
+
+        except Exception as e:
+            print(f"⚠️ Error procesando fila de jugador: {e}")
+            continue
+
+    return players
+
+RAW_PATH = 'data/river_raw_players.json'
+
+def extract_river_players(equipo="ca-river-plate", temporada=2026, solo_si_cambio=False, checkpoint=False):
+    """
+    Scrapea la página de plantilla (con caché condicional en disco) y devuelve
+    el DataFrame crudo. Con checkpoint=True además lo guarda en
+    data/river_raw_players.json. Con solo_si_cambio=True devuelve None sin
+    parsear si la página no cambió desde la última carga procesada.
+    """
+    print("🚀 Iniciando scraping de Plantilla...")
     
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        table = soup.select_one('table.sdata_table')
-        if not table:
+        with etapa('fetch plantilla'):
+            html, cambio = fetch_cached(URL_PLANTILLA.format(equipo=equipo, temporada=temporada))
+        if solo_si_cambio and not cambio:
+            print("⏭️ La página de plantilla no cambió, se omite el parseo.")
+            return None
+
+        with etapa('parse plantilla') as medida:
+            players = parse_plantilla(html)
+            medida['rows_out'] = len(players or [])
+        if players is None:
             print("❌ No se encontró la tabla de plantilla.")
             return pd.DataFrame()
 
-        players = []
-        current_position = "Desconocido"
-        
-        rows = table.select('tbody tr')
-        
-        for row in rows:
-            # Check if it's a header row for position (e.g. "Portero", "Defensa")
-            header_th = row.select_one('th.axis')
-            if header_th:
-                current_position = header_th.get_text(strip=True)
-                continue
-            
-            # Check if it's a player row
-            if not row.has_attr('itemprop'):
-                continue
-                
-            try:
-                # 1. Number / Dorsal
-                dorsal_tag = row.select_one('td.num')
-                dorsal = dorsal_tag.get_text(strip=True) if dorsal_tag else "-"
-                
-                # 2. Name
-                name_tag = row.select_one('th.sdata_player_name span[itemprop="name"]')
-                name = name_tag.get_text(strip=True) if name_tag else "Desconocido"
-                
-                # 3. Image
-                img_tag = row.select_one('td.sdata_player_img img')
-                img_url = img_tag['src'] if img_tag else None
-                
-                # 4. Age & Birthdate
-                age_tag = row.select_one('td.birthdate')
-                age = age_tag.get_text(strip=True) if age_tag else "-"
-                birthdate = age_tag['content'] if age_tag and 'content' in age_tag.attrs else None
-                
-                # 5. Nationality & Flag
-                nat_tag = row.select_one('td.ori span[itemprop="name"]')
-                nationality = nat_tag['content'] if nat_tag and 'content' in nat_tag.attrs else "ar"
-                
-                # Flag scraping
-                flag_tag = row.select_one('td.ori img')
-                flag_url = flag_tag['src'] if flag_tag else "https://cdn.resfu.com/media/img/flags/st3/small/ar.png"
-
-                # 6. Stats (Height, Weight, Goals, Cards)
-                # The columns after nationality are: Height, Weight, Goals, Yellow, Red
-                # We iterate data cells
-                dat_cells = row.select('td.dat')
-                height = dat_cells[0].get_text(strip=True) if len(dat_cells) > 0 else "-"
-                weight = dat_cells[1].get_text(strip=True) if len(dat_cells) > 1 else "-"
-                goals = dat_cells[2].get_text(strip=True) if len(dat_cells) > 2 else "0"
-                # Corregido: Index 3 es Rojas, Index 4 es Amarillas (según reporte de usuario)
-                red_cards = dat_cells[3].get_text(strip=True) if len(dat_cells) > 3 else "0"
-                yellow_cards = dat_cells[4].get_text(strip=True) if len(dat_cells) > 4 else "0"
-                
-                players.append({
-                    "dorsal": dorsal,
-                    "nombre": name,
-                    "posicion": current_position,
-                    "edad": age,
-                    "nacimiento": birthdate,
-                    "nacionalidad": nationality,
-                    "bandera": flag_url,
-                    "altura": height,
-                    "peso": weight,
-                    "goles": goals,
-                    "amarillas": yellow_cards,
-                    "rojas": red_cards,
-                    "imagen": img_url
-                })
-                
-            except Exception as e:
-                print(f"⚠️ Error procesando fila de jugador: {e}")
-                continue
-
         df = pd.DataFrame(players)
         
-        # Guardar en raw_players.json
-        os.makedirs('data', exist_ok=True)
-        df.to_json('data/river_raw_players.json', orient='records', force_ascii=False)
+        # Checkpoint opcional: el JSON que transform_players.py lee cuando se corre por separado
+        if checkpoint:
+            os.makedirs('data', exist_ok=True)
+            df.to_json(RAW_PATH, orient='records', force_ascii=False)
         
-        print(f"✅ Scraping plantilla finalizado. {len(df)} jugadores guardados.")
+        print(f"✅ Scraping plantilla finalizado. {len(df)} jugadores extraídos.")
         return df
 
     except Exception as e:
@@ -109,4 +213,4 @@ def extract_river_players():
         return pd.DataFrame()
 
 if __name__ == "__main__":
-    extract_river_players()
+    extract_river_players(checkpoint=True)
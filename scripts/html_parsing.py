@@ -0,0 +1,39 @@
+import lxml.html
+from lxml import etree
+
+# Utilidades para el parseo rápido con lxml: consultas XPath compiladas una sola
+# vez (etree.XPath, al importar el módulo) en lugar de selectores CSS de
+# BeautifulSoup, con la misma semántica de texto.
+
+PARSERS = ('lxml', 'html.parser')
+PARSER_DEFAULT = 'lxml'
+
+
+def parse_html(html):
+    return lxml.html.fromstring(html)
+
+
+def xpath(expresion):
+    # Consulta compilada: se llama con el elemento, xpath(el), y devuelve la lista de resultados
+    return etree.XPath(expresion)
+
+
+def clase(nombre):
+    # Equivalente XPath del selector CSS ".nombre"
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {nombre} ')"
+
+
+def texto(el):
+    # Igual que BeautifulSoup.get_text(strip=True): une los textos no vacíos ya recortados
+    return ''.join(t.strip() for t in el.itertext())
+
+
+def primero(el, consulta):
+    # Equivalente de select_one: primer resultado (de una consulta de xpath()) o None
+    encontrados = consulta(el)
+    return encontrados[0] if encontrados else None
+
+
+def validar_parser(parser):
+    if parser not in PARSERS:
+        raise ValueError(f"Parser desconocido '{parser}', opciones: {', '.join(PARSERS)}")
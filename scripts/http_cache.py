@@ -0,0 +1,96 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+# Add parent directory to path to allow importing 'scripts'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.http_client import fetch
+
+# Caché persistente de páginas scrapeadas: un .html con el cuerpo y un .json con
+# ETag / Last-Modified / hash del contenido por URL.
+CACHE_DIR = os.getenv("HTTP_CACHE_DIR", "data/http_cache")
+
+# URLs cuyo contenido cambió en esta corrida y todavía no llegó a la base
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+def _paths(url):
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()[:24]
+    return os.path.join(CACHE_DIR, f"{key}.html"), os.path.join(CACHE_DIR, f"{key}.json")
+
+
+def _write_atomic(path, data, mode='w'):
+    tmp = f"{path}.tmp"
+    with open(tmp, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _read_meta(meta_path):
+    if not os.path.exists(meta_path):
+        return {}
+    with open(meta_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def fetch_cached(url):
+    """
+    Descarga 'url' con un request condicional (If-None-Match / If-Modified-Since)
+    usando la caché en disco. Devuelve (html, cambio): cambio es False si el
+    servidor respondió 304 o el contenido tiene el mismo hash que la última
+    versión ya procesada (ver mark_processed).
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    body_path, meta_path = _paths(url)
+    meta = _read_meta(meta_path)
+    tiene_body = os.path.exists(body_path)
+
+    headers = {}
+    if tiene_body:
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    response = fetch(url, headers=headers)
+
+    if response.status_code == 304:
+        with open(body_path, encoding='utf-8') as f:
+            html = f.read()
+    else:
+        html = response.text
+        meta['content_hash'] = hashlib.sha256(response.content).hexdigest()
+        meta['etag'] = response.headers.get('ETag')
+        meta['last_modified'] = response.headers.get('Last-Modified')
+        _write_atomic(body_path, html)
+
+    meta['url'] = url
+    meta['checked_at'] = time.time()
+    _write_atomic(meta_path, json.dumps(meta, indent=2))
+
+    cambio = meta.get('content_hash') != meta.get('processed_hash')
+    if cambio:
+        with _pending_lock:
+            _pending[url] = meta['content_hash']
+    return html, cambio
+
+
+def mark_processed(urls=None):
+    """
+    Marca como procesado el contenido actual de las URLs pendientes (todas
+    por defecto). Se llama después de una carga exitosa, así una corrida que
+    falla a mitad de camino vuelve a procesar la página la próxima vez.
+    """
+    with _pending_lock:
+        urls = list(_pending) if urls is None else [u for u in urls if u in _pending]
+        for url in urls:
+            _, meta_path = _paths(url)
+            meta = _read_meta(meta_path)
+            meta['processed_hash'] = _pending.pop(url)
+            _write_atomic(meta_path, json.dumps(meta, indent=2))
+    return urls
@@ -0,0 +1,184 @@
+import os
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import config
+
+# Cliente HTTP compartido por todos los scripts de ETL: una única Session con
+# keep-alive, compresión, timeouts, reintentos con backoff y rate limit por host.
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "20"))
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "4"))
+BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "1"))
+# Intervalo mínimo entre requests al mismo host (segundos)
+MIN_INTERVAL = float(os.getenv("HTTP_MIN_INTERVAL", "0.5"))
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+# Últimos requests que se guardan con detalle; los totales por host no tienen límite
+LOG_SIZE = int(os.getenv("HTTP_LOG_SIZE", "500"))
+
+_session = None
+_session_lock = threading.Lock()
+
+_rate_lock = threading.Lock()
+_next_slot = {}
+# Host del request en curso en cada thread (lo usan los reintentos de urllib3) y
+# tiempo esperado por el rate limit, que no cuenta como latencia
+_intento = threading.local()
+
+# Procesos largos (scheduler, jobs del dashboard, crawler): acumulados por host y
+# totales en lugar de una lista que crece con cada request
+_stats_lock = threading.Lock()
+_requests_log = deque(maxlen=LOG_SIZE)
+_por_host = {}
+_totales = {"requests": 0, "bytes": 0, "wire_bytes": 0}
+
+
+class _RetryConRateLimit(Retry):
+    # urllib3 reintenta dentro de HTTPAdapter.send: después del backoff (o del
+    # Retry-After), cada reintento también espera el turno del host
+    def sleep(self, response=None):
+        super().sleep(response)
+        _intento.espera += _wait_for_host(_intento.host)
+
+
+class _AdaptadorConRateLimit(HTTPAdapter):
+    # Rate limit por host en el adapter: vale para todo lo que use la sesión
+    def send(self, request, **kwargs):
+        _intento.host = urlparse(request.url).netloc
+        _intento.espera = getattr(_intento, "espera", 0.0) + _wait_for_host(_intento.host)
+        return super().send(request, **kwargs)
+
+
+def _build_session():
+    retry = _RetryConRateLimit(
+        total=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = _AdaptadorConRateLimit(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """
+    Returns the process-wide requests.Session (created on first use).
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def _wait_for_host(host):
+    # Reserva el próximo turno del host, duerme hasta que llegue y devuelve lo esperado
+    with _rate_lock:
+        now = time.monotonic()
+        slot = max(now, _next_slot.get(host, now))
+        _next_slot[host] = slot + MIN_INTERVAL
+    if slot > now:
+        time.sleep(slot - now)
+    return slot - now
+
+
+def fetch(url, timeout=None, **kwargs):
+    """
+    GET a través de la sesión compartida. Aplica rate limit por host
+    (también a cada reintento), timeouts (connect, read) y reintentos con
+    backoff exponencial en 429/5xx; lanza HTTPError si la respuesta final
+    no es 2xx/304.
+    Registra latencia y bytes de cada request (ver get_http_stats).
+    """
+    host = urlparse(url).netloc
+
+    _intento.espera = 0.0
+    inicio = time.perf_counter()
+    response = get_session().get(url, timeout=timeout or (CONNECT_TIMEOUT, READ_TIMEOUT), **kwargs)
+    elapsed = time.perf_counter() - inicio - _intento.espera
+
+    registro = {
+        "url": url,
+        "host": host,
+        "status": response.status_code,
+        "elapsed": elapsed,
+        # bytes: cuerpo descomprimido | wire_bytes: lo que viajó por la red (si el server lo informa)
+        "bytes": len(response.content),
+        "wire_bytes": int(response.headers.get("Content-Length", len(response.content))),
+        "retries": len(response.raw.retries.history) if getattr(response.raw, "retries", None) else 0,
+    }
+    with _stats_lock:
+        _requests_log.append(registro)
+        h = _por_host.setdefault(host, {
+            "requests": 0, "elapsed": 0.0, "max_elapsed": 0.0,
+            "bytes": 0, "wire_bytes": 0, "retries": 0, "errors": 0,
+        })
+        h["requests"] += 1
+        h["elapsed"] += elapsed
+        h["max_elapsed"] = max(h["max_elapsed"], elapsed)
+        h["bytes"] += registro["bytes"]
+        h["wire_bytes"] += registro["wire_bytes"]
+        h["retries"] += registro["retries"]
+        h["errors"] += registro["status"] >= 400
+        _totales["requests"] += 1
+        _totales["bytes"] += registro["bytes"]
+        _totales["wire_bytes"] += registro["wire_bytes"]
+
+    if response.status_code != 304:
+        response.raise_for_status()
+    return response
+
+
+def get_http_stats():
+    """
+    Resumen por host desde el arranque (o el último reset_http_stats):
+    requests, tiempo total/máximo, bytes y reintentos.
+    """
+    with _stats_lock:
+        return {host: dict(h) for host, h in _por_host.items()}
+
+
+def get_http_totals():
+    """
+    Contadores acumulados (requests, bytes, wire_bytes): para medir un
+    tramo se restan dos lecturas (ver etl_metrics.etapa).
+    """
+    with _stats_lock:
+        return dict(_totales)
+
+
+def get_requests_log():
+    """
+    Los últimos HTTP_LOG_SIZE requests con su detalle.
+    """
+    with _stats_lock:
+        return list(_requests_log)
+
+
+def reset_http_stats():
+    with _stats_lock:
+        _requests_log.clear()
+        _por_host.clear()
+        for clave in _totales:
+            _totales[clave] = 0
@@ -0,0 +1,108 @@
+import os
+import sys
+import threading
+import time
+import traceback
+import uuid
+from collections import deque
+
+# Add parent directory to path to allow importing 'scripts'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import config
+
+# Runner del ETL en segundo plano para el dashboard: un único job a la vez por
+# proceso, en un thread propio. Cualquier sesión puede consultar su estado;
+# los disparos mientras hay un job en curso se suman a ese job. El pipeline
+# (requests, BeautifulSoup, lxml, carga) se importa recién en la primera corrida,
+# así el dashboard arranca sin cargar el stack del ETL.
+
+_lock = threading.Lock()
+_jobs = {}
+# Últimos jobs terminados que se conservan para consultar su estado
+_historial = deque(maxlen=int(os.getenv("ETL_JOBS_HISTORY", "20")))
+_actual = None
+
+
+def _snapshot(job):
+    estado = dict(job)
+    fin = job['finished_at'] or time.time()
+    estado['elapsed'] = fin - job['started_at']
+    return estado
+
+
+def _actualizar(job_id, **campos):
+    with _lock:
+        _jobs[job_id].update(campos)
+
+
+def _ejecutar(job_id, kwargs):
+    global _actual
+
+    def progreso(etapa, filas):
+        _actualizar(job_id, stage=etapa, rows=filas)
+
+    try:
+        from scripts.pipeline import run_etl
+        resultados = run_etl(progreso=progreso, **kwargs)
+        if resultados is None:
+            _actualizar(job_id, status='skipped', stage='sin cambios')
+        else:
+            filas = sum(c['inserted'] + c['updated'] + c['unchanged'] for c in resultados.values())
+            _actualizar(job_id, status='done', stage='fin', rows=filas, result=resultados)
+    except Exception as e:
+        traceback.print_exc()
+        _actualizar(job_id, status='failed', error=str(e))
+    finally:
+        with _lock:
+            _jobs[job_id]['finished_at'] = time.time()
+            _historial.append(job_id)
+            # Se descartan los jobs que ya salieron del historial
+            for viejo in [j for j in _jobs if j not in _historial and j != job_id]:
+                del _jobs[viejo]
+            _actual = None
+
+
+def start_etl(**kwargs):
+    """
+    Lanza run_etl(**kwargs) en un thread de fondo y devuelve el id del job.
+    Si ya hay un job en curso no se lanza otro: se devuelve el id del que
+    está corriendo (los disparos duplicados se unen a esa corrida).
+    """
+    global _actual
+    with _lock:
+        if _actual is not None:
+            return _actual
+
+        job_id = uuid.uuid4().hex[:8]
+        _jobs[job_id] = {
+            'id': job_id,
+            'status': 'running',
+            'stage': 'en cola',
+            'rows': 0,
+            'started_at': time.time(),
+            'finished_at': None,
+            'result': None,
+            'error': None,
+        }
+        _actual = job_id
+
+    threading.Thread(target=_ejecutar, args=(job_id, kwargs), name=f"etl-{job_id}", daemon=True).start()
+    return job_id
+
+
+def get_job(job_id=None):
+    """
+    Estado de un job (por defecto, el que está corriendo o el último que
+    terminó): status ('running', 'done', 'skipped', 'failed'), stage, rows,
+    elapsed (segundos), result y error. None si no existe.
+    """
+    with _lock:
+        job_id = job_id or _actual or (_historial[-1] if _historial else None)
+        job = _jobs.get(job_id)
+        return _snapshot(job) if job else None
+
+
+def is_running():
+    with _lock:
+        return _actual is not None
@@ -0,0 +1,59 @@
+from sqlalchemy import text
+
+# KPIs del tab de análisis calculados en la base: vistas materializadas en
+# PostgreSQL (tablas materializadas en otros dialectos) que load_to_sql()
+# refresca una vez por carga. El dashboard lee solo estas pocas filas.
+
+_JUGADOS = "FROM partidos_river WHERE resultado_final <> 'Pendiente'"
+
+KPI_VIEWS = {
+    'kpi_puntos_competicion': f"""
+        SELECT competicion,
+               CAST(SUM(CASE resultado_final WHEN 'Ganó' THEN 3 WHEN 'Empató' THEN 1 ELSE 0 END) AS INTEGER) AS puntos,
+               COUNT(*) AS partidos
+        {_JUGADOS}
+        GROUP BY competicion
+    """,
+    'kpi_resultados_competicion': f"""
+        SELECT competicion, resultado_final, COUNT(*) AS cantidad
+        {_JUGADOS}
+        GROUP BY competicion, resultado_final
+    """,
+    'kpi_eficacia': f"""
+        SELECT competicion,
+               COUNT(*) AS partidos,
+               CAST(SUM(g_river) AS DOUBLE PRECISION) AS goles_river,
+               CAST(SUM(g_rival) AS DOUBLE PRECISION) AS goles_rival,
+               COUNT(g_river) AS partidos_con_goles,
+               CAST(SUM(CASE WHEN g_rival = 0 THEN 1 ELSE 0 END) AS INTEGER) AS vallas_invictas
+        {_JUGADOS}
+        GROUP BY competicion
+    """,
+}
+
+def drop_kpi_views(conn):
+    """
+    Elimina las vistas de KPIs. Necesario antes de recrear partidos_river,
+    porque PostgreSQL no deja borrar una tabla con vistas dependientes.
+    """
+    for nombre in KPI_VIEWS:
+        if conn.dialect.name == 'postgresql':
+            conn.execute(text(f"DROP MATERIALIZED VIEW IF EXISTS {nombre}"))
+        else:
+            conn.execute(text(f"DROP TABLE IF EXISTS {nombre}"))
+
+def refresh_kpi_views(conn, refresh=True):
+    """
+    Crea las vistas de KPIs si no existen y, con refresh=True, las recalcula.
+    Se ejecuta dentro de la transacción de la carga.
+    """
+    dialect = conn.dialect.name
+    for nombre, query in KPI_VIEWS.items():
+        if dialect == 'postgresql':
+            conn.execute(text(f"CREATE MATERIALIZED VIEW IF NOT EXISTS {nombre} AS {query}"))
+            if refresh:
+                conn.execute(text(f"REFRESH MATERIALIZED VIEW {nombre}"))
+        else:
+            if refresh:
+                conn.execute(text(f"DROP TABLE IF EXISTS {nombre}"))
+            conn.execute(text(f"CREATE TABLE IF NOT EXISTS {nombre} AS {query}"))
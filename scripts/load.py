@@ -1,38 +1,242 @@
 import pandas as pd
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
+import csv
+import io
 import sys
 import os
-from dotenv import load_dotenv
 
 # Add parent directory to path to allow importing 'database'
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-load_dotenv()
-
-# Configuración interna (solo variables que no son de DB si fueran necesarias)
 # DB connection now handled by database.py
 
 from database import get_db_engine
+from data_cache import bump_data_version
+from scripts.kpis import refresh_kpi_views
+from scripts.migrate import apply_migrations
+from schema import compact_partidos, compact_plantilla
+
+# Clave natural de cada tabla para el modo incremental (upsert)
+NATURAL_KEYS = {
+    'partidos_river': ['fecha', 'competicion', 'local', 'visitante'],
+    'plantilla_river': ['nombre', 'nacimiento'],
+}
+# Columnas de la clave que se comparan por día: mientras el partido está pendiente
+# 'fecha' trae la hora de inicio, pero ya jugado la página sólo muestra el marcador
+# y la hora queda en 00:00. Es el mismo partido: se actualiza (la fila conserva la
+# hora de inicio, que es parte de la clave) en lugar de insertar otro.
+DAY_KEYS = {
+    'partidos_river': ['fecha'],
+}
+
+def copy_insert(table, conn, keys, data_iter):
+    """
+    Método de inserción para DataFrame.to_sql que envía las filas con
+    COPY ... FROM STDIN (formato CSV) desde un buffer en memoria, en lugar
+    de un INSERT por fila. Solo para PostgreSQL (psycopg2).
+    """
+    q = conn.dialect.identifier_preparer.quote
+    table_name = f"{q(table.schema)}.{q(table.name)}" if table.schema else q(table.name)
+    columns = ', '.join(q(k) for k in keys)
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(data_iter)
+    buffer.seek(0)
+
+    with conn.connection.cursor() as cur:
+        cur.copy_expert(f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+def bulk_insert(df, table, conn, if_exists='append'):
+    """
+    DataFrame.to_sql con COPY en PostgreSQL; en otros dialectos usa el
+    to_sql estándar.
+    """
+    method = copy_insert if conn.dialect.name == 'postgresql' else None
+    df.to_sql(table, conn, if_exists=if_exists, index=False, method=method)
+
+def _distinct_ops(conn):
+    # SQLite no soporta IS [NOT] DISTINCT FROM, pero IS / IS NOT tienen la misma semántica con NULLs
+    if conn.dialect.name == 'sqlite':
+        return 'IS NOT', 'IS'
+    return 'IS DISTINCT FROM', 'IS NOT DISTINCT FROM'
+
+def _tipo_sql(serie):
+    # Tipo de una columna nueva según el dtype (los nombres valen en PostgreSQL y SQLite)
+    if pd.api.types.is_bool_dtype(serie):
+        return 'BOOLEAN'
+    if pd.api.types.is_integer_dtype(serie):
+        return 'BIGINT'
+    if pd.api.types.is_float_dtype(serie):
+        return 'DOUBLE PRECISION'
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return 'TIMESTAMP'
+    return 'TEXT'
+
+def _claves_por_dia(df, key_cols, day_cols):
+    claves = df[key_cols].copy()
+    for c in day_cols:
+        claves[c] = pd.to_datetime(claves[c]).dt.normalize()
+    return claves
+
+def upsert_dataframe(df, table, key_cols, conn, prune=False, day_cols=()):
+    """
+    Merge incremental de df sobre 'table' usando la clave natural key_cols.
+    Los datos se cargan en una tabla de staging con la misma estructura que
+    la tabla destino y luego:
+    - UPDATE solo de las filas cuya clave existe y algún valor cambió,
+    - INSERT de las claves nuevas,
+    - (opcional, prune=True) DELETE de las claves que ya no vienen en df.
+    Las columnas de 'day_cols' (timestamps) se comparan sólo por día.
+    Las columnas de df que no existen en la tabla se agregan con ALTER TABLE.
+    Debe ejecutarse dentro de una transacción (conn de engine.begin()).
+    Devuelve los conteos {'inserted', 'updated', 'unchanged', 'deleted'}.
+    """
+    inspector = inspect(conn)
+    if not inspector.has_table(table):
+        bulk_insert(df, table, conn)
+        return {'inserted': len(df), 'updated': 0, 'unchanged': 0, 'deleted': 0}
+
+    q = conn.dialect.identifier_preparer.quote
+    t = q(table)
+
+    target_cols = [c['name'] for c in inspector.get_columns(table)]
+    nuevas = [c for c in df.columns if c not in target_cols]
+    if nuevas:
+        # La tabla es de las migraciones (id, tipos, índices): se agregan las columnas, no se recrea
+        print(f"⚠️ Columnas nuevas en '{table}' ({', '.join(nuevas)}): se agregan a la tabla.")
+        for c in nuevas:
+            conn.execute(text(f"ALTER TABLE {t} ADD COLUMN {q(c)} {_tipo_sql(df[c])}"))
+
+    cols = list(df.columns)
+    df = df[~_claves_por_dia(df, key_cols, day_cols).duplicated(keep='last')]
+
+    distinct, not_distinct = _distinct_ops(conn)
+    staging = f"{table}_staging"
+    s = q(staging)
+    col_list = ', '.join(q(c) for c in cols)
+    value_cols = [c for c in cols if c not in key_cols]
+
+    def clave(alias, c):
+        # DATE(x) vale tanto en PostgreSQL como en SQLite
+        return f"DATE({alias}.{q(c)})" if c in day_cols else f"{alias}.{q(c)}"
+
+    def igual(c):
+        # '=' usa los índices de la clave (idx_partidos_dia) y permite hash joins; la
+        # comparación con NULLs sólo para las columnas de la clave que traen NULLs
+        op = not_distinct if df[c].isna().any() else '='
+        return f"{clave(t, c)} {op} {clave(s, c)}"
+
+    key_match = ' AND '.join(igual(c) for c in key_cols)
 
-def load_to_sql():
-    print("Cargando datos a PostgreSQL...")
-    
-    # Obtener conexión (dev o prod según .env)
+    # Staging con los mismos tipos que el destino para comparar valor a valor
+    conn.execute(text(f"DROP TABLE IF EXISTS {s}"))
+    conn.execute(text(f"CREATE TABLE {s} AS SELECT {col_list} FROM {t} WHERE 1 = 0"))
+    bulk_insert(df[cols], staging, conn)
+
+    updated = 0
+    if value_cols:
+        set_clause = ', '.join(f"{q(c)} = {s}.{q(c)}" for c in value_cols)
+        changed = ' OR '.join(f"{t}.{q(c)} {distinct} {s}.{q(c)}" for c in value_cols)
+        updated = conn.execute(text(
+            f"UPDATE {t} SET {set_clause} FROM {s} WHERE {key_match} AND ({changed})"
+        )).rowcount
+
+    inserted = conn.execute(text(
+        f"INSERT INTO {t} ({col_list}) SELECT {col_list} FROM {s} "
+        f"WHERE NOT EXISTS (SELECT 1 FROM {t} WHERE {key_match})"
+    )).rowcount
+
+    deleted = 0
+    if prune:
+        deleted = conn.execute(text(
+            f"DELETE FROM {t} WHERE NOT EXISTS (SELECT 1 FROM {s} WHERE {key_match})"
+        )).rowcount
+
+    conn.execute(text(f"DROP TABLE {s}"))
+
+    return {
+        'inserted': inserted,
+        'updated': updated,
+        'unchanged': len(df) - inserted - updated,
+        'deleted': deleted,
+    }
+
+def _load_table(df, table, conn, mode, prune):
+    if mode == 'replace':
+        # Se vacía y se vuelve a llenar la tabla (no DROP): conserva tipos, índices, permisos y vistas
+        if inspect(conn).has_table(table):
+            conn.execute(text(f"DELETE FROM {conn.dialect.identifier_preparer.quote(table)}"))
+        # Una fila por clave, como en el upsert (idx_partidos_dia es UNIQUE)
+        df = df[~_claves_por_dia(df, NATURAL_KEYS[table], DAY_KEYS.get(table, ())).duplicated(keep='last')]
+        bulk_insert(df, table, conn)
+        print(f"✅ Tabla '{table}' reemplazada ({len(df)} filas).")
+        return {'inserted': len(df), 'updated': 0, 'unchanged': 0, 'deleted': 0}
+
+    counts = upsert_dataframe(df, table, NATURAL_KEYS[table], conn, prune=prune,
+                              day_cols=DAY_KEYS.get(table, ()))
+    print(f"✅ Tabla '{table}' actualizada: {counts['inserted']} nuevas, "
+          f"{counts['updated']} modificadas, {counts['unchanged']} sin cambios"
+          + (f", {counts['deleted']} eliminadas." if prune else "."))
+    return counts
+
+CLEANED_PATHS = {
+    'partidos_river': 'data/river_cleaned.csv',
+    'plantilla_river': 'data/river_players_cleaned.csv',
+}
+
+# Tipos compactos al leer los CSV (el CSV no guarda dtypes)
+COMPACTORS = {
+    'partidos_river': compact_partidos,
+    'plantilla_river': compact_plantilla,
+}
+
+def load_to_sql(df_partidos=None, df_players=None, mode=None, prune=False):
+    """
+    Carga los DataFrames limpios a la base de datos en una única transacción.
+    Si no se pasa ningún DataFrame, lee los CSV de checkpoint de data/.
+    Antes de cargar aplica las migraciones pendientes de sql/migrations/.
+    mode: 'upsert' (incremental por clave natural, por defecto) o 'replace'
+    (reemplaza todas las filas). Se puede fijar con la variable LOAD_MODE.
+    Devuelve los conteos por tabla.
+    """
+    mode = (mode or os.getenv("LOAD_MODE", "upsert")).lower()
+
+    tablas = {'partidos_river': df_partidos, 'plantilla_river': df_players}
+    if df_partidos is None and df_players is None:
+        # Sin DataFrames en memoria: leer los CSV limpios
+        tablas = {
+            tabla: COMPACTORS[tabla](pd.read_csv(path))
+            for tabla, path in CLEANED_PATHS.items() if os.path.exists(path)
+        }
+
+    # Obtener conexión (dev, prod o local según .env)
     engine = get_db_engine()
-    
-    # Leer el CSV limpio
-    if os.path.exists('data/river_cleaned.csv'):
-        df = pd.read_csv('data/river_cleaned.csv')
-        df.to_sql('partidos_river', engine, if_exists='replace', index=False)
-        print("✅ Tabla 'partidos_river' actualizada.")
-    
-    # Cargar Plantilla
-    if os.path.exists('data/river_players_cleaned.csv'):
-        df_players = pd.read_csv('data/river_players_cleaned.csv')
-        df_players.to_sql('plantilla_river', engine, if_exists='replace', index=False)
-        print("✅ Tabla 'plantilla_river' actualizada.")
-
-    print("✅ Carga a base de datos exitosa.")
+    print(f"Cargando datos a {engine.dialect.name} (modo {mode})...")
+    resultados = {}
+
+    with engine.begin() as conn:
+        # Esquema tipado al día antes de escribir
+        apply_migrations(conn)
+
+        for tabla, df in tablas.items():
+            if df is not None:
+                resultados[tabla] = _load_table(df, tabla, conn, mode, prune)
+
+        # KPIs pre-agregados: se recalculan una sola vez por carga, solo si cambiaron los partidos
+        partidos = resultados.get('partidos_river')
+        if partidos is not None:
+            cambiaron = (partidos['inserted'] + partidos['updated'] + partidos['deleted']) > 0
+            refresh_kpi_views(conn, refresh=cambiaron)
+
+    cambios = sum(c['inserted'] + c['updated'] + c['deleted'] for c in resultados.values())
+    if cambios:
+        # Nueva versión de datos: invalida las lecturas cacheadas del dashboard
+        version = bump_data_version(engine)
+        print(f"✅ Carga a base de datos exitosa (versión de datos {version}).")
+    else:
+        print("✅ Carga a base de datos exitosa (sin cambios).")
+
+    return resultados
 
 if __name__ == "__main__":
-    load_to_sql()
\ No newline at end of file
+    load_to_sql()
@@ -0,0 +1,69 @@
+import glob
+import os
+import sys
+from sqlalchemy import text
+
+# Add parent directory to path to allow importing 'database'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import get_db_engine
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), '..', 'sql', 'migrations')
+# Migraciones por dialecto: las de PostgreSQL en sql/migrations/, las de SQLite
+# (mismo esquema y mismos números de versión) en sql/migrations/sqlite/
+MIGRATIONS_DIRS = {
+    'postgresql': MIGRATIONS_DIR,
+    'sqlite': os.path.join(MIGRATIONS_DIR, 'sqlite'),
+}
+
+# Clave del advisory lock: evita que dos cargas apliquen migraciones a la vez
+_LOCK_KEY = 20260001
+
+def _sentencias(sql):
+    # Parte un archivo de migración en sentencias: sin comentarios '--' y separadas por ';'
+    lineas = [linea.split('--', 1)[0] for linea in sql.splitlines()]
+    return [s.strip() for s in '\n'.join(lineas).split(';') if s.strip()]
+
+def apply_migrations(conn):
+    """
+    Aplica, en orden, los archivos de migración del dialecto (ver
+    MIGRATIONS_DIRS) que todavía no figuran en schema_migrations. Se ejecuta dentro de la transacción de la carga:
+    si algo falla, no queda ninguna migración a medias.
+    Devuelve la lista de migraciones aplicadas.
+    """
+    directorio = MIGRATIONS_DIRS.get(conn.dialect.name)
+    if directorio is None:
+        # Otros dialectos: las tablas las crea to_sql a partir de los DataFrames ya tipados
+        return []
+
+    if conn.dialect.name == 'postgresql':
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {'key': _LOCK_KEY})
+    # En SQLite la transacción de escritura (BEGIN IMMEDIATE, ver database.py) ya es exclusiva
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version TEXT PRIMARY KEY, applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+    ))
+    aplicadas = set(conn.execute(text("SELECT version FROM schema_migrations")).scalars())
+
+    nuevas = []
+    for path in sorted(glob.glob(os.path.join(directorio, '*.sql'))):
+        version = os.path.splitext(os.path.basename(path))[0]
+        if version in aplicadas:
+            continue
+        with open(path, encoding='utf-8') as f:
+            sql = f.read()
+        if conn.dialect.name == 'sqlite':
+            # sqlite3 ejecuta una sentencia por llamada (executescript haría COMMIT)
+            for sentencia in _sentencias(sql):
+                conn.exec_driver_sql(sentencia)
+        else:
+            conn.exec_driver_sql(sql)
+        conn.execute(text("INSERT INTO schema_migrations (version) VALUES (:v)"), {'v': version})
+        print(f"🛠️ Migración aplicada: {version}")
+        nuevas.append(version)
+    return nuevas
+
+if __name__ == "__main__":
+    with get_db_engine().begin() as conn:
+        aplicadas = apply_migrations(conn)
+    print(f"✅ Esquema al día ({len(aplicadas)} migraciones nuevas).")
@@ -0,0 +1,99 @@
+import argparse
+import os
+import sys
+
+# Add parent directory to path to allow importing 'scripts'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from scripts.extract import URL_PARTIDOS, extract_river_scraping
+from scripts.extract_players import URL_PLANTILLA, extract_river_players
+from scripts.transform import transform_data
+from scripts.transform_players import transform_players
+from scripts.load import load_to_sql
+from scripts.http_cache import mark_processed
+from scripts.assets import cache_assets, pedidos_plantilla
+from scripts.etl_metrics import etapa, etl_run
+from scripts.replica import refresh_al_salir
+from scripts.extract_detalles import crawl_temporadas
+
+def run_etl(force=False, checkpoint=False, equipo="ca-river-plate", temporada=2026, progreso=None, detalles=False):
+    """
+    Corre el ETL completo (partidos + plantilla) pasando DataFrames en memoria
+    de una etapa a la siguiente. Con checkpoint=True cada etapa además deja
+    su archivo en data/ (JSON crudo y CSV limpio).
+    Si ninguna de las páginas cambió desde la última carga (304 o mismo hash),
+    se omiten transform y load; con force=True se procesa todo igual.
+    progreso: callback opcional progreso(etapa, filas) que se llama al
+    empezar cada etapa (lo usa scripts/jobs.py para informar el estado).
+    Con detalles=True, si cambiaron los partidos, además se descarga y carga
+    el detalle de los partidos nuevos (ver scripts/extract_detalles.py).
+    Devuelve los conteos de load_to_sql, o None si no hubo nada para cargar.
+    """
+    progreso = progreso or (lambda nombre, filas: None)
+
+    etapas = [
+        ('partidos', URL_PARTIDOS, extract_river_scraping, transform_data),
+        ('plantilla', URL_PLANTILLA, extract_river_players, transform_players),
+    ]
+
+    # Cada etapa queda medida en etl_runs (ver scripts/etl_metrics.py). Al salir, ya
+    # guardada la corrida, se actualiza la réplica SQLite de lectura si hay una configurada
+    with refresh_al_salir(), etl_run(equipo, temporada) as run:
+        limpios = {}
+        urls_ok = []
+        for nombre, url, extract, transform in etapas:
+            progreso(f"extract {nombre}", 0)
+            df = extract(equipo, temporada, solo_si_cambio=not force, checkpoint=checkpoint)
+            if df is None:
+                continue
+            if df.empty:
+                # Error de scraping o página vacía: no pisar lo que ya está en la base
+                print(f"⚠️ Sin datos de {nombre}, no se carga esta tabla.")
+                continue
+            progreso(f"transform {nombre}", len(df))
+            with etapa(f"transform {nombre}", rows_in=len(df)) as medida:
+                limpios[nombre] = transform(df, checkpoint=checkpoint)
+                medida['rows_out'] = len(limpios[nombre])
+            urls_ok.append(url.format(equipo=equipo, temporada=temporada))
+
+        if not limpios:
+            print("✅ Sin cambios para cargar: se omiten transformación y carga.")
+            run['status'] = 'skipped'
+            return None
+
+        filas = sum(len(df) for df in limpios.values())
+        progreso("load", filas)
+        with etapa("load", rows_in=filas) as medida:
+            resultados = load_to_sql(limpios.get('partidos'), limpios.get('plantilla'))
+            medida['rows_out'] = run['rows_loaded'] = sum(
+                c['inserted'] + c['updated'] + c['deleted'] for c in resultados.values())
+
+        # Recién ahora el contenido descargado queda como "procesado"
+        mark_processed(urls_ok)
+
+        if 'plantilla' in limpios:
+            # Fotos y banderas a la caché local; un error acá no invalida la carga
+            pedidos = pedidos_plantilla(limpios['plantilla'])
+            progreso("assets plantilla", len(pedidos))
+            with etapa("assets plantilla", rows_in=len(pedidos)) as medida:
+                try:
+                    medida['rows_out'] = cache_assets(pedidos)
+                except Exception as e:
+                    print(f"⚠️ No se pudieron actualizar las imágenes: {e}")
+
+        if detalles and 'partidos' in limpios:
+            # Sólo se piden los partidos que no están en el checkpoint del crawler
+            progreso("detalles", len(limpios['partidos']))
+            try:
+                crawl_temporadas([(equipo, temporada)])
+            except Exception as e:
+                print(f"⚠️ No se pudo actualizar el detalle de los partidos: {e}")
+        return resultados
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="ETL de River Plate: extract → transform → load en memoria")
+    parser.add_argument('--force', action='store_true', help="Procesar aunque las páginas no hayan cambiado")
+    parser.add_argument('--checkpoint', action='store_true', help="Guardar también los JSON/CSV intermedios en data/")
+    parser.add_argument('--detalles', action='store_true', help="Descargar también el detalle de los partidos nuevos")
+    args = parser.parse_args()
+    run_etl(force=args.force, checkpoint=args.checkpoint, detalles=args.detalles)
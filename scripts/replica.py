@@ -0,0 +1,141 @@
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+from sqlalchemy import inspect, text
+
+# Add parent directory to path to allow importing 'database' and 'scripts'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import create_sqlite_engine, get_db_engine
+from data_cache import VERSION_TABLE
+from scripts.kpis import KPI_VIEWS
+from scripts.load import bulk_insert
+from scripts.migrate import apply_migrations
+
+# Réplica de lectura embebida: copia en un archivo SQLite local todo lo que lee
+# el dashboard (tablas, KPIs, versión de datos y últimas corridas del ETL). Con
+# DATABASE_READ_URL=sqlite:///<archivo> cada réplica del dashboard lee de su
+# copia en lugar de abrir conexiones contra PostgreSQL.
+
+REPLICA_PATH = os.getenv("SQLITE_REPLICA_PATH", "")
+# Corridas de etl_runs que se copian (el sidebar sólo muestra la última)
+REPLICA_RUNS = int(os.getenv("SQLITE_REPLICA_RUNS", "50"))
+
+TABLAS = {
+    'partidos_river': "SELECT * FROM partidos_river",
+    'plantilla_river': "SELECT * FROM plantilla_river",
+    **{nombre: f"SELECT * FROM {nombre}" for nombre in KPI_VIEWS},
+    'etl_runs': f"SELECT * FROM etl_runs ORDER BY started_at DESC LIMIT {REPLICA_RUNS}",
+    # La versión va última: el dashboard invalida su caché recién con todo copiado
+    VERSION_TABLE: f"SELECT * FROM {VERSION_TABLE}",
+}
+
+
+def _leer(engine):
+    datos = {}
+    with engine.connect() as conn:
+        inspector = inspect(conn)
+        existentes = set(inspector.get_table_names())
+        if conn.dialect.name == 'postgresql':
+            # Los KPIs son vistas materializadas en PostgreSQL
+            existentes |= set(inspector.get_materialized_view_names())
+        for tabla, query in TABLAS.items():
+            if tabla in existentes:
+                datos[tabla] = pd.read_sql(text(query), conn)
+    if 'etl_runs' in datos:
+        # JSONB llega como lista de dicts: en SQLite se guarda como texto
+        runs = datos['etl_runs']
+        datos['etl_runs'] = runs.assign(stages=runs['stages'].map(
+            lambda v: v if isinstance(v, str) else json.dumps(v)))
+    return datos
+
+
+def _version(engine):
+    # Versión de datos de la base (None si todavía no hay ninguna carga versionada)
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text(f"SELECT version FROM {VERSION_TABLE} WHERE id = 1")).scalar()
+    except Exception:
+        return None
+
+
+def _version_replica(path):
+    if not os.path.exists(path):
+        return None
+    engine = create_sqlite_engine(path, role="read")
+    try:
+        return _version(engine)
+    finally:
+        engine.dispose()
+
+
+def refresh_replica(path=None, source=None, force=False):
+    """
+    Copia las tablas del dashboard de la base principal ('source', por
+    defecto el engine de escritura) al SQLite 'path' (SQLITE_REPLICA_PATH).
+    Si la réplica ya tiene la misma versión de datos que la base (corridas
+    sin cambios o fallidas) no se copia nada, salvo con force=True.
+    Todo se reemplaza en una sola transacción: los lectores ven la copia
+    anterior o la nueva completa, nunca una mezcla. Un error acá no hace
+    fallar el ETL. Devuelve las filas copiadas (0 si ya estaba al día), o
+    None sin réplica.
+    """
+    path = path or REPLICA_PATH
+    if not path:
+        return None
+
+    inicio = time.perf_counter()
+    try:
+        source = source or get_db_engine()
+        if not force:
+            version = _version(source)
+            if version is not None and version == _version_replica(path):
+                print(f"⏭️ Réplica {path} al día (versión de datos {version}).")
+                return 0
+        datos = _leer(source)
+        destino = create_sqlite_engine(path)
+        try:
+            with destino.begin() as conn:
+                apply_migrations(conn)
+                existentes = set(inspect(conn).get_table_names())
+                for tabla, df in datos.items():
+                    if tabla in existentes:
+                        conn.execute(text(f'DELETE FROM "{tabla}"'))
+                    bulk_insert(df, tabla, conn)
+        finally:
+            destino.dispose()
+    except Exception as e:
+        print(f"⚠️ No se pudo actualizar la réplica {path}: {e}")
+        return None
+
+    filas = sum(len(df) for df in datos.values())
+    print(f"✅ Réplica {path} actualizada: {filas} filas en {time.perf_counter() - inicio:.2f}s.")
+    return filas
+
+
+@contextmanager
+def refresh_al_salir(path=None):
+    """
+    Actualiza la réplica al salir del bloque, termine como termine (sólo
+    copia si la carga cambió la versión de datos, ver refresh_replica).
+    """
+    try:
+        yield
+    finally:
+        refresh_replica(path)
+
+
+if __name__ == "__main__":
+    # Actualización manual (o desde cron en cada host con réplicas del dashboard);
+    # --force copia aunque la réplica ya tenga la versión de datos actual
+    argumentos = [a for a in sys.argv[1:] if a != '--force']
+    destino = argumentos[0] if argumentos else REPLICA_PATH
+    if not destino:
+        print("❌ Indicar el archivo de la réplica (argumento o SQLITE_REPLICA_PATH).")
+        sys.exit(1)
+    if refresh_replica(destino, force='--force' in sys.argv) is None:
+        sys.exit(1)
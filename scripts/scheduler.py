@@ -0,0 +1,112 @@
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import text
+
+# Add parent directory to path to allow importing 'database' and 'scripts'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from database import get_db_engine
+from scripts.pipeline import run_etl
+
+# Scheduler del ETL: corre el pipeline cada SCHEDULER_INTERVAL segundos y cada
+# SCHEDULER_MATCH_INTERVAL mientras un partido puede estar terminando. Las
+# páginas sin cambios (304 o mismo hash, ver http_cache.py) no se transforman
+# ni se cargan, así que las corridas del resto de la semana son baratas.
+
+BASE_INTERVAL = int(os.getenv("SCHEDULER_INTERVAL", str(6 * 3600)))
+MATCH_INTERVAL = int(os.getenv("SCHEDULER_MATCH_INTERVAL", "600"))
+# Ventana alrededor del kickoff en la que se usa MATCH_INTERVAL (minutos):
+# desde el entretiempo hasta bastante después del final, por alargues y penales
+WINDOW_START = timedelta(minutes=int(os.getenv("SCHEDULER_WINDOW_START", "45")))
+WINDOW_END = timedelta(minutes=int(os.getenv("SCHEDULER_WINDOW_END", "240")))
+# Las fechas de partidos_river están en hora local argentina (sin zona)
+TIMEZONE = ZoneInfo(os.getenv("SCHEDULER_TZ", "America/Argentina/Buenos_Aires"))
+
+
+def ventana(kickoff):
+    """
+    (inicio, fin) de la ventana de actualización frecuente de un partido.
+    Sin horario confirmado (00:00) se cubre el día completo.
+    """
+    if kickoff.hour == 0 and kickoff.minute == 0:
+        return kickoff, kickoff + timedelta(days=1)
+    return kickoff + WINDOW_START, kickoff + WINDOW_END
+
+
+def proximo_intervalo(ahora, kickoffs):
+    """
+    Segundos hasta la próxima corrida: MATCH_INTERVAL si 'ahora' cae en la
+    ventana de algún partido; si no, BASE_INTERVAL o lo que falte para que
+    empiece la próxima ventana, lo que ocurra primero.
+    """
+    espera = BASE_INTERVAL
+    for kickoff in kickoffs:
+        inicio, fin = ventana(kickoff)
+        if inicio <= ahora < fin:
+            return MATCH_INTERVAL
+        if ahora < inicio:
+            espera = min(espera, (inicio - ahora).total_seconds())
+    return max(espera, 1)
+
+
+def kickoffs_cercanos(ahora, engine=None):
+    """
+    Kickoffs de partidos_river entre el final de la ventana más larga hacia
+    atrás y BASE_INTERVAL hacia adelante.
+    """
+    engine = engine or get_db_engine()
+    desde = ahora - timedelta(days=1) - WINDOW_END
+    hasta = ahora + timedelta(seconds=BASE_INTERVAL)
+    try:
+        with engine.connect() as conn:
+            filas = conn.execute(
+                text("SELECT fecha FROM partidos_river WHERE fecha >= :desde AND fecha <= :hasta ORDER BY fecha"),
+                {'desde': desde, 'hasta': hasta},
+            ).scalars().all()
+    except Exception as e:
+        # Base vacía o inaccesible: se usa el intervalo base
+        print(f"⚠️ No se pudieron leer los próximos partidos: {e}")
+        return []
+    # SQLite devuelve texto: se normaliza a datetime
+    return [f if isinstance(f, datetime) else datetime.fromisoformat(str(f)) for f in filas]
+
+
+def run_scheduler(once=False, force=False):
+    """
+    Bucle del scheduler: corre el ETL, calcula la próxima espera según los
+    partidos cercanos y duerme. Un error en una corrida no detiene el bucle.
+    """
+    print(f"🚀 Scheduler del ETL iniciado (intervalo {BASE_INTERVAL}s, en partidos {MATCH_INTERVAL}s).")
+    while True:
+        inicio = time.perf_counter()
+        try:
+            resultados = run_etl(force=force)
+            estado = "sin cambios" if resultados is None else "datos cargados"
+            print(f"✅ Corrida del scheduler terminada ({estado}) en {time.perf_counter() - inicio:.1f}s.")
+        except Exception as e:
+            print(f"❌ Error en la corrida del scheduler: {e}")
+
+        if once:
+            return
+
+        ahora = datetime.now(TIMEZONE).replace(tzinfo=None)
+        espera = proximo_intervalo(ahora, kickoffs_cercanos(ahora))
+        proxima = ahora + timedelta(seconds=espera)
+        print(f"⏭️ Próxima corrida: {proxima:%d/%m %H:%M} (en {espera / 60:.0f} min).")
+        time.sleep(espera)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scheduler del ETL con intervalos más cortos en días de partido")
+    parser.add_argument('--once', action='store_true', help="Una sola corrida y salir (para cron)")
+    parser.add_argument('--force', action='store_true', help="Procesar aunque las páginas no hayan cambiado")
+    args = parser.parse_args()
+    try:
+        run_scheduler(once=args.once, force=args.force)
+    except KeyboardInterrupt:
+        print("⏹️ Scheduler detenido.")
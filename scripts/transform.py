@@ -1,65 +1,77 @@
 import pandas as pd
-import numpy as np
 import os
+import sys
 
-def transform_data():
-    print("🚀 Transformando datos con fechas y horarios...")
-    input_path = 'data/river_raw_data.json'
-    output_path = 'data/river_cleaned.csv'
+# Add parent directory to path to allow importing 'schema'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from schema import compact_partidos
+
+MESES = {
+    'Ene': '01', 'Feb': '02', 'Mar': '03', 'Abr': '04', 
+    'May': '05', 'Jun': '06', 'Jul': '07', 'Ago': '08', 
+    'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dic': '12'
+}
+_PATRON_MESES = '|'.join(MESES)
 
-    if not os.path.exists(input_path):
-        print("❌ No se encontró el archivo raw_data.json")
-        return
+def procesar_fechas(df):
+    """
+    Combina 'fecha' ("24 Ene 26") y 'horario' ("21:00") en un datetime,
+    de forma vectorizada: mapeo de meses con una sola regex, horarios
+    inválidos (marcadores "1-0", vacíos) a medianoche y un único to_datetime.
+    """
+    # Como el loop original, reemplaza todas las apariciones del mes (no sólo la primera)
+    fechas = df['fecha'].astype(str).str.replace(
+        _PATRON_MESES, lambda m: MESES[m.group(0)], regex=True
+    )
 
-    # Cargamos el JSON
-    df = pd.read_json(input_path)
+    if 'horario' in df.columns:
+        # Si la hora parece un marcador (tiene un '-') o no tiene ':', no es una hora válida
+        horas = df['horario'].astype(str)
+        invalidas = horas.str.contains('-', regex=False) | ~horas.str.contains(':', regex=False)
+        horas = horas.mask(invalidas, '00:00')
+    else:
+        horas = '00:00'
 
-    meses = {
-        'Ene': '01', 'Feb': '02', 'Mar': '03', 'Abr': '04', 
-        'May': '05', 'Jun': '06', 'Jul': '07', 'Ago': '08', 
-        'Sep': '09', 'Oct': '10', 'Nov': '11', 'Dic': '12'
-    }
-    
-    def procesar_fecha_completa(row):
-        f = str(row['fecha'])
-        h = str(row.get('horario', '00:00')) # Si no hay hora, ponemos medianoche
-        
-        # Si la hora parece un marcador (tiene un '-'), no es una hora válida
-        if '-' in h or not ':' in h:
-            h = "00:00"
+    # Combinamos fecha y hora: "24 01 26 21:00"
+    return pd.to_datetime(fechas + ' ' + horas, format='%d %m %y %H:%M', errors='coerce')
 
-        # Reemplazamos el nombre del mes por su número
-        for mes_txt, mes_num in meses.items():
-            if mes_txt in f:
-                f = f.replace(mes_txt, mes_num)
-                break
-        
-        # Combinamos fecha y hora: "24 01 26 21:00"
-        try:
-            string_final = f"{f} {h}"
-            return pd.to_datetime(string_final, format='%d %m %y %H:%M', errors='coerce')
-        except:
-            return pd.to_datetime(f, format='%d %m %y', errors='coerce')
+INPUT_PATH = 'data/river_raw_data.json'
+OUTPUT_PATH = 'data/river_cleaned.csv'
+
+def transform_data(df=None, checkpoint=False):
+    """
+    Limpia el DataFrame crudo de partidos y lo devuelve. Si no se pasa df,
+    lo lee del checkpoint data/river_raw_data.json; con checkpoint=True
+    guarda el resultado en data/river_cleaned.csv.
+    """
+    print("🚀 Transformando datos con fechas y horarios...")
 
-    # Aplicamos la transformación fila por fila
-    df['fecha'] = df.apply(procesar_fecha_completa, axis=1)
+    if df is None:
+        if not os.path.exists(INPUT_PATH):
+            print("❌ No se encontró el archivo raw_data.json")
+            return None
 
+        # Cargamos el JSON
+        df = pd.read_json(INPUT_PATH)
+    else:
+        df = df.copy()
 
+    # Parseo columna a columna (sin apply por fila)
+    df['fecha'] = procesar_fechas(df)
 
-    # Limpieza final de columnas
-    # Aseguramos que cualquier valor nulo, None o vacío se convierta en '-'
-    df['g_river'] = df['g_river'].replace([np.nan, None, 'None', ''], '-')
-    df['g_river'] = df['g_river'].fillna('-')
-    
-    df['g_rival'] = df['g_rival'].replace([np.nan, None, 'None', ''], '-')
-    df['g_rival'] = df['g_rival'].fillna('-')
+    # Limpieza final de columnas: tipos compactos (ver schema.py)
+    # Goles como Int16; los partidos pendientes (o sin marcador numérico) quedan en NULL
+    df = compact_partidos(df)
 
     # Ordenar cronológicamente
     df = df.sort_values('fecha', ascending=True)
 
-    # Exportar a CSV
-    df.to_csv(output_path, index=False)
+    # Exportar a CSV (checkpoint opcional)
+    if checkpoint:
+        df.to_csv(OUTPUT_PATH, index=False)
     print(f"✅ Transformación exitosa: {len(df)} partidos procesados con horarios.")
+    return df
 
 if __name__ == "__main__":
-    transform_data()
\ No newline at end of file
+    transform_data(checkpoint=True)
\ No newline at end of file
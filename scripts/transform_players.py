@@ -1,17 +1,32 @@
 
 import pandas as pd
 import os
+import sys
 
-def transform_players():
+# Add parent directory to path to allow importing 'schema'
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from schema import compact_plantilla
+
+INPUT_PATH = 'data/river_raw_players.json'
+OUTPUT_PATH = 'data/river_players_cleaned.csv'
+
+def transform_players(df=None, checkpoint=False):
+    """
+    Limpia el DataFrame crudo de plantilla y lo devuelve. Si no se pasa df,
+    lo lee del checkpoint data/river_raw_players.json; con checkpoint=True
+    guarda el resultado en data/river_players_cleaned.csv.
+    """
     print("🚀 Transformando datos de plantilla...")
-    input_path = 'data/river_raw_players.json'
-    output_path = 'data/river_players_cleaned.csv'
 
-    if not os.path.exists(input_path):
-        print("❌ No se encontró el archivo river_raw_players.json")
-        return
+    if df is None:
+        if not os.path.exists(INPUT_PATH):
+            print("❌ No se encontró el archivo river_raw_players.json")
+            return None
 
-    df = pd.read_json(input_path)
+        df = pd.read_json(INPUT_PATH)
+    else:
+        df = df.copy()
 
     # 1. Limpieza de Edad (extraer solo número si es necesario, o dejar como está si ya es limpio)
     # En el scraping ya lo sacamos limpio si era texto, pero por seguridad:
@@ -24,36 +39,35 @@ def transform_players():
         if not isinstance(val, str): return val
         return val.lower().replace('cm', '').replace('kg', '').strip()
 
-    df['altura'] = df['altura'].apply(clean_metric)
-    df['peso'] = df['peso'].apply(clean_metric)
-
-    # 3. Manejo de nulos (Dorsal a '-')
-    df['dorsal'] = df['dorsal'].replace([None, 'None', '', float('nan')], '-')
-    df['dorsal'] = df['dorsal'].fillna('-')
+    for col in ['altura', 'peso']:
+        df[col] = df[col].apply(clean_metric)
 
-    # 4. Asegurar que bandera exista, si no, poner placeholder
+    # 3. Asegurar que bandera exista, si no, poner placeholder
     if 'bandera' not in df.columns:
         df['bandera'] = "https://cdn.resfu.com/media/img/flags/st3/small/ar.png"
     
     df['bandera'] = df['bandera'].fillna("https://cdn.resfu.com/media/img/flags/st3/small/ar.png")
 
-    # 5. Limpieza de Goles y Tarjetas
+    # 4. Limpieza de Goles y Tarjetas
     cols_stats = ['goles', 'rojas', 'amarillas']
     for col in cols_stats:
         if col in df.columns:
             # Convertir a cero si hay guiones o nulos
             df[col] = df[col].astype(str).replace(['-', '', 'nan', 'None'], '0')
             # Extraer solo numeros
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
         else:
             df[col] = 0
 
-    # Manejo general de nulos
-    df = df.fillna('-')
+    # 5. Tipos compactos (ver schema.py): edad, dorsal, altura y peso sin dato ('-') quedan en NULL,
+    # nacimiento como fecha y posición/nacionalidad/bandera como category
+    df = compact_plantilla(df)
 
-    # Guardar
-    df.to_csv(output_path, index=False)
+    # Guardar (checkpoint opcional)
+    if checkpoint:
+        df.to_csv(OUTPUT_PATH, index=False)
     print(f"✅ Transformación de plantilla exitosa: {len(df)} jugadores procesados.")
+    return df
 
 if __name__ == "__main__":
-    transform_players()
+    transform_players(checkpoint=True)
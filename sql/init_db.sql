@@ -1,12 +1,116 @@
--- Borramos la tabla si existe para empezar de cero (ideal en desarrollo)
+-- Esquema completo de la base (equivalente a aplicar sql/migrations/ sobre una base vacía).
+-- Borramos las tablas si existen para empezar de cero (ideal en desarrollo)
+DROP MATERIALIZED VIEW IF EXISTS kpi_puntos_competicion;
+DROP MATERIALIZED VIEW IF EXISTS kpi_resultados_competicion;
+DROP MATERIALIZED VIEW IF EXISTS kpi_eficacia;
+DROP TABLE IF EXISTS partidos_eventos;
+DROP TABLE IF EXISTS partidos_alineaciones;
+DROP TABLE IF EXISTS partidos_detalle;
 DROP TABLE IF EXISTS partidos_river;
+DROP TABLE IF EXISTS plantilla_river;
+DROP TABLE IF EXISTS schema_migrations;
+DROP TABLE IF EXISTS etl_runs;
 
 CREATE TABLE partidos_river (
     id SERIAL PRIMARY KEY,
-    fecha DATE,
-    local VARCHAR(100),
-    visitante VARCHAR(100),
-    goles_river FLOAT, -- Usamos FLOAT por los NaNs que Pandas maneja así
-    goles_rival FLOAT,
-    resultado_final VARCHAR(20)
-);
\ No newline at end of file
+    fecha TIMESTAMP,
+    competicion TEXT,
+    local TEXT,
+    visitante TEXT,
+    g_river SMALLINT, -- NULL mientras el partido está pendiente
+    g_rival SMALLINT,
+    resultado_final TEXT,
+    horario TEXT
+);
+
+CREATE INDEX idx_partidos_clave ON partidos_river (fecha, competicion, local, visitante);
+CREATE INDEX idx_partidos_competicion ON partidos_river (competicion);
+-- Un partido por día: el upsert compara 'fecha' por día (ver DAY_KEYS en scripts/load.py)
+CREATE UNIQUE INDEX idx_partidos_dia ON partidos_river (DATE(fecha), competicion, local, visitante);
+
+CREATE TABLE plantilla_river (
+    id SERIAL PRIMARY KEY,
+    dorsal SMALLINT,
+    nombre TEXT,
+    posicion TEXT,
+    edad SMALLINT,
+    nacimiento DATE,
+    nacionalidad TEXT,
+    bandera TEXT,
+    altura SMALLINT, -- cm
+    peso SMALLINT,   -- kg
+    goles SMALLINT,
+    amarillas SMALLINT,
+    rojas SMALLINT,
+    imagen TEXT
+);
+
+CREATE INDEX idx_plantilla_clave ON plantilla_river (nombre, nacimiento);
+
+-- Historial de corridas del ETL (una fila por corrida, detalle por etapa en 'stages')
+CREATE TABLE etl_runs (
+    id BIGSERIAL PRIMARY KEY,
+    started_at TIMESTAMP NOT NULL, -- UTC
+    finished_at TIMESTAMP,
+    status TEXT NOT NULL,          -- ok | skipped | failed
+    equipo TEXT,
+    temporada INTEGER,
+    wall_seconds DOUBLE PRECISION,
+    cpu_seconds DOUBLE PRECISION,
+    rows_loaded INTEGER,
+    bytes_fetched BIGINT,
+    peak_rss_mb DOUBLE PRECISION,
+    error TEXT,
+    stages JSONB NOT NULL DEFAULT '[]'
+);
+
+CREATE INDEX idx_etl_runs_started ON etl_runs (started_at DESC);
+
+-- Detalle de cada partido (alineaciones, goles y tarjetas, ver scripts/extract_detalles.py),
+-- enlazado a partidos_river por la clave del partido: día, competicion, local y visitante
+CREATE TABLE partidos_detalle (
+    fecha DATE NOT NULL, -- día del partido
+    competicion TEXT NOT NULL,
+    local TEXT NOT NULL,
+    visitante TEXT NOT NULL,
+    url TEXT NOT NULL,
+    fetched_at TIMESTAMP, -- UTC
+    PRIMARY KEY (fecha, competicion, local, visitante)
+);
+
+CREATE TABLE partidos_alineaciones (
+    fecha DATE NOT NULL,
+    competicion TEXT NOT NULL,
+    local TEXT NOT NULL,
+    visitante TEXT NOT NULL,
+    equipo TEXT,
+    jugador TEXT NOT NULL,
+    dorsal SMALLINT,
+    titular BOOLEAN NOT NULL
+);
+
+CREATE INDEX idx_alineaciones_partido ON partidos_alineaciones (fecha, competicion, local, visitante);
+CREATE INDEX idx_alineaciones_jugador ON partidos_alineaciones (jugador);
+
+CREATE TABLE partidos_eventos (
+    fecha DATE NOT NULL,
+    competicion TEXT NOT NULL,
+    local TEXT NOT NULL,
+    visitante TEXT NOT NULL,
+    tipo TEXT NOT NULL, -- gol | gol_penal | gol_en_contra | amarilla | doble_amarilla | roja
+    equipo TEXT,
+    jugador TEXT,
+    minuto SMALLINT,
+    adicional SMALLINT  -- minutos adicionados ("45+2'")
+);
+
+CREATE INDEX idx_eventos_partido ON partidos_eventos (fecha, competicion, local, visitante);
+CREATE INDEX idx_eventos_jugador ON partidos_eventos (jugador, tipo);
+
+-- Registro de migraciones: la base queda al día con sql/migrations/
+CREATE TABLE schema_migrations (
+    version TEXT PRIMARY KEY,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+INSERT INTO schema_migrations (version) VALUES ('001_typed_schema'), ('002_etl_runs'), ('003_partidos_detalle'),
+    ('004_partidos_clave_dia');
@@ -0,0 +1,82 @@
+-- 001: esquema tipado para partidos_river y plantilla_river.
+-- Convierte las tablas que creaba pandas (todo TEXT, '-' en lugar de NULL)
+-- a columnas enteras / fecha / timestamp con NULLs, y agrega índices.
+-- Si las tablas no existen, las crea directamente con el esquema final.
+
+-- Las vistas de KPIs dependen de estas columnas: load_to_sql() las vuelve a crear.
+DROP MATERIALIZED VIEW IF EXISTS kpi_puntos_competicion;
+DROP MATERIALIZED VIEW IF EXISTS kpi_resultados_competicion;
+DROP MATERIALIZED VIEW IF EXISTS kpi_eficacia;
+
+-- ===================== PARTIDOS =====================
+CREATE TABLE IF NOT EXISTS partidos_river (
+    id SERIAL PRIMARY KEY,
+    fecha TIMESTAMP,
+    competicion TEXT,
+    local TEXT,
+    visitante TEXT,
+    g_river SMALLINT,
+    g_rival SMALLINT,
+    resultado_final TEXT,
+    horario TEXT
+);
+
+ALTER TABLE partidos_river ADD COLUMN IF NOT EXISTS id SERIAL PRIMARY KEY;
+ALTER TABLE partidos_river ADD COLUMN IF NOT EXISTS competicion TEXT;
+ALTER TABLE partidos_river ADD COLUMN IF NOT EXISTS g_river SMALLINT;
+ALTER TABLE partidos_river ADD COLUMN IF NOT EXISTS g_rival SMALLINT;
+ALTER TABLE partidos_river ADD COLUMN IF NOT EXISTS horario TEXT;
+
+ALTER TABLE partidos_river
+    ALTER COLUMN fecha TYPE TIMESTAMP
+        USING CAST(NULLIF(CAST(fecha AS TEXT), '') AS TIMESTAMP),
+    ALTER COLUMN g_river TYPE SMALLINT
+        USING CASE WHEN CAST(g_river AS TEXT) ~ '^[0-9]+(\.0+)?$' THEN CAST(CAST(g_river AS TEXT) AS NUMERIC) END,
+    ALTER COLUMN g_rival TYPE SMALLINT
+        USING CASE WHEN CAST(g_rival AS TEXT) ~ '^[0-9]+(\.0+)?$' THEN CAST(CAST(g_rival AS TEXT) AS NUMERIC) END;
+
+-- El índice por clave natural empieza por fecha: sirve también para filtrar y ordenar por fecha
+CREATE INDEX IF NOT EXISTS idx_partidos_clave ON partidos_river (fecha, competicion, local, visitante);
+CREATE INDEX IF NOT EXISTS idx_partidos_competicion ON partidos_river (competicion);
+
+-- ===================== PLANTILLA =====================
+CREATE TABLE IF NOT EXISTS plantilla_river (
+    id SERIAL PRIMARY KEY,
+    dorsal SMALLINT,
+    nombre TEXT,
+    posicion TEXT,
+    edad SMALLINT,
+    nacimiento DATE,
+    nacionalidad TEXT,
+    bandera TEXT,
+    altura SMALLINT,
+    peso SMALLINT,
+    goles SMALLINT,
+    amarillas SMALLINT,
+    rojas SMALLINT,
+    imagen TEXT
+);
+
+ALTER TABLE plantilla_river ADD COLUMN IF NOT EXISTS id SERIAL PRIMARY KEY;
+
+ALTER TABLE plantilla_river
+    ALTER COLUMN dorsal TYPE SMALLINT
+        USING CASE WHEN CAST(dorsal AS TEXT) ~ '^[0-9]+(\.0+)?$' THEN CAST(CAST(dorsal AS TEXT) AS NUMERIC) END,
+    ALTER COLUMN edad TYPE SMALLINT
+        USING CASE WHEN CAST(edad AS TEXT) ~ '^[0-9]+(\.0+)?$' THEN CAST(CAST(edad AS TEXT) AS NUMERIC) END,
+    ALTER COLUMN nacimiento TYPE DATE
+        USING CASE WHEN CAST(nacimiento AS TEXT) ~ '^[0-9]{4}-[0-9]{2}-[0-9]{2}' THEN CAST(LEFT(CAST(nacimiento AS TEXT), 10) AS DATE) END,
+    ALTER COLUMN altura TYPE SMALLINT
+        USING CASE WHEN CAST(altura AS TEXT) ~ '^[0-9]+(\.0+)?$' THEN CAST(CAST(altura AS TEXT) AS NUMERIC) END,
+    ALTER COLUMN peso TYPE SMALLINT
+        USING CASE WHEN CAST(peso AS TEXT) ~ '^[0-9]+(\.0+)?$' THEN CAST(CAST(peso AS TEXT) AS NUMERIC) END,
+    ALTER COLUMN goles TYPE SMALLINT
+        USING CASE WHEN CAST(goles AS TEXT) ~ '^[0-9]+(\.0+)?$' THEN CAST(CAST(goles AS TEXT) AS NUMERIC) END,
+    ALTER COLUMN amarillas TYPE SMALLINT
+        USING CASE WHEN CAST(amarillas AS TEXT) ~ '^[0-9]+(\.0+)?$' THEN CAST(CAST(amarillas AS TEXT) AS NUMERIC) END,
+    ALTER COLUMN rojas TYPE SMALLINT
+        USING CASE WHEN CAST(rojas AS TEXT) ~ '^[0-9]+(\.0+)?$' THEN CAST(CAST(rojas AS TEXT) AS NUMERIC) END,
+    ALTER COLUMN imagen TYPE TEXT USING NULLIF(CAST(imagen AS TEXT), '-'),
+    ALTER COLUMN bandera TYPE TEXT USING NULLIF(CAST(bandera AS TEXT), '-');
+
+CREATE INDEX IF NOT EXISTS idx_plantilla_clave ON plantilla_river (nombre, nacimiento);
@@ -0,0 +1,20 @@
+-- 002: historial de corridas del ETL (una fila por corrida, ver scripts/etl_metrics.py).
+-- 'stages' guarda el detalle por etapa: tiempo, CPU, filas, bytes y memoria.
+
+CREATE TABLE IF NOT EXISTS etl_runs (
+    id BIGSERIAL PRIMARY KEY,
+    started_at TIMESTAMP NOT NULL, -- UTC
+    finished_at TIMESTAMP,
+    status TEXT NOT NULL,          -- ok | skipped | failed
+    equipo TEXT,
+    temporada INTEGER,
+    wall_seconds DOUBLE PRECISION,
+    cpu_seconds DOUBLE PRECISION,
+    rows_loaded INTEGER,
+    bytes_fetched BIGINT,
+    peak_rss_mb DOUBLE PRECISION,
+    error TEXT,
+    stages JSONB NOT NULL DEFAULT '[]'
+);
+
+CREATE INDEX IF NOT EXISTS idx_etl_runs_started ON etl_runs (started_at DESC);
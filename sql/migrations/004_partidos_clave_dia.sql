@@ -0,0 +1,17 @@
+-- 004: un partido por día (ver DAY_KEYS en scripts/load.py). Con la fecha y hora en la
+-- clave, un partido cargado pendiente (21:30) y después jugado (00:00) quedaba en dos
+-- filas: se borra la más vieja de cada grupo, la nueva trae el resultado.
+
+DELETE FROM partidos_river
+WHERE id IN (
+    SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (
+            PARTITION BY DATE(fecha), competicion, local, visitante ORDER BY id DESC
+        ) AS n
+        FROM partidos_river
+    ) repetidos
+    WHERE n > 1
+);
+
+-- UNIQUE: la base también exige la clave por día
+CREATE UNIQUE INDEX IF NOT EXISTS idx_partidos_dia ON partidos_river (DATE(fecha), competicion, local, visitante);
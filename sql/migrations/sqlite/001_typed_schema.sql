@@ -0,0 +1,88 @@
+-- 001 (SQLite): mismo esquema tipado que sql/migrations/001_typed_schema.sql.
+-- SQLite no puede agregar una PRIMARY KEY a una tabla existente: las tablas que
+-- creaba pandas (sin id) se reconstruyen copiando las filas en orden.
+
+-- Los KPIs son tablas en SQLite: load_to_sql() las vuelve a crear.
+DROP TABLE IF EXISTS kpi_puntos_competicion;
+DROP TABLE IF EXISTS kpi_resultados_competicion;
+DROP TABLE IF EXISTS kpi_eficacia;
+
+-- ===================== PARTIDOS =====================
+CREATE TABLE IF NOT EXISTS partidos_river (
+    fecha TIMESTAMP,
+    competicion TEXT,
+    local TEXT,
+    visitante TEXT,
+    g_river SMALLINT,
+    g_rival SMALLINT,
+    resultado_final TEXT,
+    horario TEXT
+);
+
+CREATE TABLE partidos_river_nueva (
+    id INTEGER PRIMARY KEY,
+    fecha TIMESTAMP,
+    competicion TEXT,
+    local TEXT,
+    visitante TEXT,
+    g_river SMALLINT,
+    g_rival SMALLINT,
+    resultado_final TEXT,
+    horario TEXT
+);
+
+INSERT INTO partidos_river_nueva (fecha, competicion, local, visitante, g_river, g_rival, resultado_final, horario)
+SELECT fecha, competicion, local, visitante, g_river, g_rival, resultado_final, horario
+FROM partidos_river ORDER BY fecha;
+
+DROP TABLE partidos_river;
+ALTER TABLE partidos_river_nueva RENAME TO partidos_river;
+
+-- El índice por clave natural empieza por fecha: sirve también para filtrar y ordenar por fecha
+CREATE INDEX IF NOT EXISTS idx_partidos_clave ON partidos_river (fecha, competicion, local, visitante);
+CREATE INDEX IF NOT EXISTS idx_partidos_competicion ON partidos_river (competicion);
+
+-- ===================== PLANTILLA =====================
+CREATE TABLE IF NOT EXISTS plantilla_river (
+    dorsal SMALLINT,
+    nombre TEXT,
+    posicion TEXT,
+    edad SMALLINT,
+    nacimiento DATE,
+    nacionalidad TEXT,
+    bandera TEXT,
+    altura SMALLINT,
+    peso SMALLINT,
+    goles SMALLINT,
+    amarillas SMALLINT,
+    rojas SMALLINT,
+    imagen TEXT
+);
+
+CREATE TABLE plantilla_river_nueva (
+    id INTEGER PRIMARY KEY,
+    dorsal SMALLINT,
+    nombre TEXT,
+    posicion TEXT,
+    edad SMALLINT,
+    nacimiento DATE,
+    nacionalidad TEXT,
+    bandera TEXT,
+    altura SMALLINT,
+    peso SMALLINT,
+    goles SMALLINT,
+    amarillas SMALLINT,
+    rojas SMALLINT,
+    imagen TEXT
+);
+
+INSERT INTO plantilla_river_nueva (dorsal, nombre, posicion, edad, nacimiento, nacionalidad, bandera,
+                                   altura, peso, goles, amarillas, rojas, imagen)
+SELECT dorsal, nombre, posicion, edad, nacimiento, nacionalidad, bandera,
+       altura, peso, goles, amarillas, rojas, imagen
+FROM plantilla_river ORDER BY dorsal;
+
+DROP TABLE plantilla_river;
+ALTER TABLE plantilla_river_nueva RENAME TO plantilla_river;
+
+CREATE INDEX IF NOT EXISTS idx_plantilla_clave ON plantilla_river (nombre, nacimiento);
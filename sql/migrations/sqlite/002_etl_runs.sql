@@ -0,0 +1,20 @@
+-- 002 (SQLite): historial de corridas del ETL, como sql/migrations/002_etl_runs.sql.
+-- 'stages' guarda el detalle por etapa como texto JSON.
+
+CREATE TABLE IF NOT EXISTS etl_runs (
+    id INTEGER PRIMARY KEY,
+    started_at TIMESTAMP NOT NULL, -- UTC
+    finished_at TIMESTAMP,
+    status TEXT NOT NULL,          -- ok | skipped | failed
+    equipo TEXT,
+    temporada INTEGER,
+    wall_seconds DOUBLE PRECISION,
+    cpu_seconds DOUBLE PRECISION,
+    rows_loaded INTEGER,
+    bytes_fetched BIGINT,
+    peak_rss_mb DOUBLE PRECISION,
+    error TEXT,
+    stages TEXT NOT NULL DEFAULT '[]'
+);
+
+CREATE INDEX IF NOT EXISTS idx_etl_runs_started ON etl_runs (started_at DESC);
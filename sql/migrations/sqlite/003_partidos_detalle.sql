@@ -0,0 +1,41 @@
+-- 003 (SQLite): detalle de cada partido, como sql/migrations/003_partidos_detalle.sql.
+-- 'fecha' se guarda como texto 'YYYY-MM-DD', el mismo formato que devuelve DATE().
+
+CREATE TABLE IF NOT EXISTS partidos_detalle (
+    fecha DATE NOT NULL, -- día del partido
+    competicion TEXT NOT NULL,
+    local TEXT NOT NULL,
+    visitante TEXT NOT NULL,
+    url TEXT NOT NULL,
+    fetched_at TIMESTAMP, -- UTC
+    PRIMARY KEY (fecha, competicion, local, visitante)
+);
+
+CREATE TABLE IF NOT EXISTS partidos_alineaciones (
+    fecha DATE NOT NULL,
+    competicion TEXT NOT NULL,
+    local TEXT NOT NULL,
+    visitante TEXT NOT NULL,
+    equipo TEXT,
+    jugador TEXT NOT NULL,
+    dorsal SMALLINT,
+    titular BOOLEAN NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_alineaciones_partido ON partidos_alineaciones (fecha, competicion, local, visitante);
+CREATE INDEX IF NOT EXISTS idx_alineaciones_jugador ON partidos_alineaciones (jugador);
+
+CREATE TABLE IF NOT EXISTS partidos_eventos (
+    fecha DATE NOT NULL,
+    competicion TEXT NOT NULL,
+    local TEXT NOT NULL,
+    visitante TEXT NOT NULL,
+    tipo TEXT NOT NULL, -- gol | gol_penal | gol_en_contra | amarilla | doble_amarilla | roja
+    equipo TEXT,
+    jugador TEXT,
+    minuto SMALLINT,
+    adicional SMALLINT  -- minutos adicionados ("45+2'")
+);
+
+CREATE INDEX IF NOT EXISTS idx_eventos_partido ON partidos_eventos (fecha, competicion, local, visitante);
+CREATE INDEX IF NOT EXISTS idx_eventos_jugador ON partidos_eventos (jugador, tipo);
@@ -0,0 +1,14 @@
+-- 004 (SQLite): un partido por día, como sql/migrations/004_partidos_clave_dia.sql.
+
+DELETE FROM partidos_river
+WHERE id IN (
+    SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (
+            PARTITION BY DATE(fecha), competicion, local, visitante ORDER BY id DESC
+        ) AS n
+        FROM partidos_river
+    ) repetidos
+    WHERE n > 1
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_partidos_dia ON partidos_river (DATE(fecha), competicion, local, visitante);